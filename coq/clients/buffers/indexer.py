@@ -0,0 +1,150 @@
+from asyncio import get_running_loop, sleep
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+from functools import partial
+from itertools import islice
+from multiprocessing import get_all_start_methods, get_context
+from os import walk
+from os.path import join, normcase
+from pathlib import Path, PurePath
+from subprocess import CalledProcessError
+from time import perf_counter
+from typing import AbstractSet, Iterator, Mapping, Sequence, Tuple
+
+from pynvim_pp.lib import decode
+from std2.asyncio import to_thread
+from std2.asyncio.subprocess import call
+from std2.itertools import chunk
+
+from ...databases.bank.database import BankFile, WBDB
+from ...shared.parse import coalesce
+
+# Only the head of very large files is banked
+_MAX_CHARS = 2 ** 20
+# Files read, tokenized and written per round trip
+_BATCH = 32
+# Fraction of wall time spent indexing, the rest is slept off between batches
+_DUTY = 0.2
+
+
+def new_pool() -> Executor:
+    """
+    One process, so indexing takes at most one core, and never holds the GIL
+
+    Never `fork`, the child would inherit locks held by the host's other threads
+
+    Children import `read` by module, `multiprocessing` never re-runs `coq.__main__`
+    """
+
+    method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=1, mp_context=get_context(method))
+
+
+def read(
+    tokenization_limit: int,
+    unifying_chars: AbstractSet[str],
+    include_syms: bool,
+    banked: Mapping[str, float],
+    files: Sequence[Tuple[str, str]],
+) -> Mapping[str, BankFile]:
+    """
+    `(filename, filetype)` modified since they were last banked
+
+    Runs in `new_pool()`, only word counts are sent back
+    """
+
+    def cont() -> Iterator[Tuple[str, BankFile]]:
+        for filename, filetype in files:
+            path = Path(filename)
+            with suppress(OSError):
+                mtime = path.stat().st_mtime
+                if mtime > banked.get(normcase(filename), 0):
+                    with path.open(encoding="UTF-8", errors="ignore") as fd:
+                        text = fd.read(_MAX_CHARS)
+                    # Same heuristic as `git`, binaries contain NUL
+                    words = (
+                        iter(())
+                        if "\0" in text
+                        else coalesce(
+                            text,
+                            unifying_chars=unifying_chars,
+                            include_syms=include_syms,
+                        )
+                    )
+                    counts = Counter(islice(words, tokenization_limit))
+                    file = BankFile(filetype=filetype, mtime=mtime, words=counts)
+                    yield filename, file
+
+    return {filename: file for filename, file in cont()}
+
+
+def _walk(cwd: PurePath) -> Iterator[str]:
+    for root, dirs, files in walk(cwd):
+        dirs[:] = (d for d in dirs if not d.startswith("."))
+        for file in files:
+            yield join(root, file)
+
+
+async def _ls(cwd: PurePath) -> Sequence[str]:
+    """
+    Respects `.gitignore` if `cwd` is in a `git` repo, else skips hidden directories
+    """
+
+    try:
+        proc = await call(
+            "git",
+            "ls-files",
+            "-z",
+            "--cached",
+            "--others",
+            "--exclude-standard",
+            cwd=cwd,
+        )
+    except (OSError, CalledProcessError):
+        return await to_thread(lambda: tuple(_walk(cwd)))
+    else:
+        names = decode(proc.stdout).split("\0")
+        return tuple(join(cwd, name) for name in names if name)
+
+
+async def index(
+    pool: Executor,
+    bank: WBDB,
+    tokenization_limit: int,
+    unifying_chars: AbstractSet[str],
+    include_syms: bool,
+) -> None:
+    """
+    Bank every file under `bank.cwd`, in throttled batches
+
+    Abandoned once `bank` is swapped to another directory
+    """
+
+    loop = get_running_loop()
+    cwd = bank.cwd
+    banked = await bank.paths()
+
+    for batch in chunk(await _ls(cwd), n=_BATCH):
+        if bank.cwd != cwd:
+            break
+
+        t1 = perf_counter()
+        files = await loop.run_in_executor(
+            pool,
+            partial(
+                read,
+                tokenization_limit=tokenization_limit,
+                unifying_chars=unifying_chars,
+                include_syms=include_syms,
+                banked={
+                    key: banked[key] for key in map(normcase, batch) if key in banked
+                },
+                files=tuple((filename, "") for filename in batch),
+            ),
+        )
+        if files and bank.cwd == cwd:
+            await bank.reconciliate(files)
+
+        elapsed = perf_counter() - t1
+        await sleep(elapsed * (1 / _DUTY - 1))
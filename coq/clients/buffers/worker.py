@@ -1,8 +1,18 @@
+from asyncio import Condition, get_running_loop
 from contextlib import suppress
 from dataclasses import dataclass
+from functools import partial
 from os import linesep
 from pathlib import PurePath
-from typing import AsyncIterator, Iterator, Mapping, Optional, Sequence, Tuple
+from typing import (
+    AsyncIterator,
+    Iterator,
+    Mapping,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from pynvim.api import Buffer, Nvim
 from pynvim.api.common import NvimError
@@ -19,12 +29,16 @@ from pynvim_pp.api import (
 from pynvim_pp.lib import async_call, go
 from pynvim_pp.logging import with_suppress
 
+from ...databases.bank.database import WBDB
 from ...databases.buffers.database import BDB, BufferWord
 from ...paths.show import fmt_path
 from ...shared.runtime import Supervisor
-from ...shared.runtime import Worker as BaseWorker
-from ...shared.settings import BuffersClient
+from ...shared.runtime import NarrowingWorker as BaseWorker
+from ...shared.settings import BuffersClient, MatchOptions
+from ...shared.shadow import Shadows
+from ...shared.timeit import timeit
 from ...shared.types import Completion, Context, Doc, Edit
+from .indexer import index, new_pool, read
 
 
 @dataclass(frozen=True)
@@ -37,13 +51,18 @@ class _Info:
     buffers: Mapping[Buffer, int]
 
 
-def _info(nvim: Nvim) -> Optional[_Info]:
+def _info(nvim: Nvim, shadows: Shadows) -> Optional[_Info]:
     try:
         win = cur_win(nvim)
         height: int = nvim.api.win_get_height(win)
         buf = win_get_buf(nvim, win=win)
         bufs = list_bufs(nvim, listed=True)
-        buffers = {buf: buf_line_count(nvim, buf=buf) for buf in bufs}
+        buffers = {
+            buf: count
+            if (count := shadows.line_count(buf.number)) is not None
+            else buf_line_count(nvim, buf=buf)
+            for buf in bufs
+        }
         if (current_lines := buffers.get(buf)) is None:
             return None
         else:
@@ -66,6 +85,19 @@ def _info(nvim: Nvim) -> Optional[_Info]:
         return None
 
 
+def _listed(nvim: Nvim) -> Mapping[str, str]:
+    """
+    `filename -> filetype` of listed buffers
+    """
+
+    def cont() -> Iterator[Tuple[str, str]]:
+        for buf in list_bufs(nvim, listed=True):
+            with suppress(NvimError):
+                yield buf_name(nvim, buf=buf), buf_filetype(nvim, buf=buf)
+
+    return {filename: filetype for filename, filetype in cont() if filename}
+
+
 def _doc(client: BuffersClient, context: Context, word: BufferWord) -> Doc:
     def cont() -> Iterator[str]:
         if not client.same_filetype and word.filetype:
@@ -82,17 +114,27 @@ def _doc(client: BuffersClient, context: Context, word: BufferWord) -> Doc:
 
 class Worker(BaseWorker[BuffersClient, BDB]):
     def __init__(
-        self, supervisor: Supervisor, options: BuffersClient, misc: BDB
+        self,
+        supervisor: Supervisor,
+        options: BuffersClient,
+        misc: Tuple[BDB, Optional[WBDB]],
     ) -> None:
-        super().__init__(supervisor, options=options, misc=misc)
+        db, self._bank = misc
+        super().__init__(supervisor, options=options, misc=db)
+        self._pool = new_pool() if self._bank else supervisor.pool
+        self._swapped = Condition()
         go(supervisor.nvim, aw=self._poll())
+        if self._bank and options.index_project:
+            go(supervisor.nvim, aw=self._index(self._bank))
 
     async def _poll(self) -> None:
         nvim = self._supervisor.nvim
 
         while True:
             with with_suppress():
-                if info := await async_call(nvim, _info, nvim):
+                if info := await async_call(
+                    nvim, _info, nvim, self._supervisor.shadows
+                ):
                     lo, hi = info.range
                     buf_line_counts = {
                         buf.number: line_count
@@ -118,9 +160,56 @@ class Worker(BaseWorker[BuffersClient, BDB]):
 
                     await async_call(nvim, rm_dead)
 
+                if self._bank:
+                    await self._bank_listed(self._bank)
+
                 async with self._supervisor.idling:
                     await self._supervisor.idling.wait()
 
+    async def _bank_listed(self, bank: WBDB) -> None:
+        nvim = self._supervisor.nvim
+        everything = await async_call(nvim, _listed, nvim)
+        listed = {
+            filename: filetype
+            for filename, filetype in everything.items()
+            if bank.cwd in PurePath(filename).parents
+        }
+        banked = await bank.mtimes(listed.keys())
+        files = await get_running_loop().run_in_executor(
+            self._pool,
+            partial(
+                read,
+                tokenization_limit=self._supervisor.limits.tokenization_limit,
+                unifying_chars=self._supervisor.match.unifying_chars,
+                include_syms=self._options.match_syms,
+                banked=banked,
+                files=tuple(listed.items()),
+            ),
+        )
+        if files:
+            await bank.reconciliate(files)
+
+    async def _index(self, bank: WBDB) -> None:
+        while True:
+            with with_suppress():
+                with timeit("INDEX :: BUFFERS"):
+                    await index(
+                        self._pool,
+                        bank=bank,
+                        tokenization_limit=self._supervisor.limits.tokenization_limit,
+                        unifying_chars=self._supervisor.match.unifying_chars,
+                        include_syms=self._options.match_syms,
+                    )
+
+            async with self._swapped:
+                await self._swapped.wait()
+
+    async def swap(self, cwd: PurePath) -> None:
+        if self._bank:
+            await self._bank.swap(cwd)
+            async with self._swapped:
+                self._swapped.notify_all()
+
     async def buf_update(self, buf_id: int, filetype: str, filename: str) -> None:
         await self._misc.buf_update(buf_id, filetype=filetype, filename=filename)
 
@@ -142,17 +231,21 @@ class Worker(BaseWorker[BuffersClient, BDB]):
             lines=lines,
         )
 
-    async def work(self, context: Context) -> AsyncIterator[Completion]:
+    async def _work(
+        self, context: Context, match: MatchOptions, limitless: bool
+    ) -> AsyncIterator[Completion]:
         async with self._work_lock:
             filetype = context.filetype if self._options.same_filetype else None
             words = await self._misc.words(
-                self._supervisor.match,
+                match,
                 filetype=filetype,
                 word=context.words,
                 sym=context.syms if self._options.match_syms else "",
-                limitless=context.manual,
+                limitless=limitless,
             )
+            seen: MutableSet[str] = set()
             for word in words:
+                seen.add(word.text)
                 edit = Edit(new_text=word.text)
                 cmp = Completion(
                     source=self._options.short_name,
@@ -166,3 +259,36 @@ class Worker(BaseWorker[BuffersClient, BDB]):
                     icon_match="Text",
                 )
                 yield cmp
+
+            if self._bank:
+                banked = await self._bank.words(
+                    match,
+                    filetype=filetype,
+                    word=context.words,
+                    sym=context.syms if self._options.match_syms else "",
+                    limitless=limitless,
+                )
+                for text in banked:
+                    if text not in seen:
+                        edit = Edit(new_text=text)
+                        cmp = Completion(
+                            source=self._options.short_name,
+                            always_on_top=self._options.always_on_top,
+                            weight_adjust=self._options.weight_adjust,
+                            label=edit.new_text,
+                            sort_by=text,
+                            primary_edit=edit,
+                            adjust_indent=False,
+                            icon_match="Text",
+                        )
+                        yield cmp
+
+    def work(self, context: Context) -> AsyncIterator[Completion]:
+        return self._work(
+            context, match=self._supervisor.match, limitless=context.manual
+        )
+
+    def widened(
+        self, context: Context, match: MatchOptions
+    ) -> AsyncIterator[Completion]:
+        return self._work(context, match=match, limitless=True)
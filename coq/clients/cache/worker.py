@@ -70,17 +70,17 @@ class CacheWorker:
             syms_before="",
         )
         self._clients: MutableSet[str] = set()
-        self._cached: MutableMapping[bytes, Completion] = {}
+        self._cached: MutableMapping[int, Completion] = {}
 
     async def set_cache(
         self,
         items: Mapping[Optional[str], Iterable[Completion]],
     ) -> None:
         new_comps = {
-            comp.uid.bytes: comp for comp in chain.from_iterable(items.values())
+            comp.uid: comp for comp in chain.from_iterable(items.values())
         }
 
-        def cont() -> Iterator[Tuple[bytes, str]]:
+        def cont() -> Iterator[Tuple[int, str]]:
             for key, val in new_comps.items():
                 if self._supervisor.comp.smart:
                     for word in coalesce(
@@ -1,14 +1,19 @@
 from asyncio import Task, as_completed, sleep
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum, auto
+from functools import partial
+from itertools import chain
 from typing import (
     AbstractSet,
     AsyncIterator,
+    Callable,
+    Iterable,
     Iterator,
     MutableMapping,
     MutableSequence,
     Optional,
     Tuple,
+    Union,
     cast,
 )
 
@@ -19,7 +24,7 @@ from std2.asyncio import cancel
 from std2.itertools import chunk
 
 from ...lsp.requests.completion import comp_lsp
-from ...lsp.types import LSPcomp
+from ...lsp.types import LazyComp, LSPcomp
 from ...shared.context import cword_before
 from ...shared.fuzzy import multi_set_ratio
 from ...shared.parse import lower
@@ -62,14 +67,42 @@ def _use_comp(match: MatchOptions, context: Context, sort_by: str, edit: Edit) -
         return False
 
 
+def _decode(item: Union[Completion, LazyComp]) -> Optional[Completion]:
+    return item.parse() if isinstance(item, LazyComp) else item
+
+
+def _decoded(items: Iterable[Union[Completion, LazyComp]]) -> Iterator[Completion]:
+    for item in items:
+        if comp := _decode(item):
+            yield comp
+
+
+def _parse_cached(
+    parse: Callable[[], Optional[Completion]]
+) -> Optional[Completion]:
+    comp = parse()
+    return sanitize_cached(comp, sort_by=None) if comp else None
+
+
+def _sanitize_cached(item: Union[Completion, LazyComp]) -> Union[Completion, LazyComp]:
+    if isinstance(item, LazyComp):
+        return replace(
+            item,
+            primary_edit=item.cached_edit,
+            parse=partial(_parse_cached, item.parse),
+        )
+    else:
+        return sanitize_cached(item, sort_by=None)
+
+
 @dataclass(frozen=True)
 class _LocalCache:
-    pre: MutableMapping[Optional[str], Tuple[Iterator[Completion], int]] = field(
-        default_factory=dict
-    )
-    post: MutableMapping[Optional[str], MutableSequence[Completion]] = field(
-        default_factory=dict
-    )
+    pre: MutableMapping[
+        Optional[str], Tuple[Iterator[Union[Completion, LazyComp]], int]
+    ] = field(default_factory=dict)
+    post: MutableMapping[
+        Optional[str], MutableSequence[Union[Completion, LazyComp]]
+    ] = field(default_factory=dict)
 
 
 class Worker(BaseWorker[LSPClient, None]):
@@ -93,12 +126,23 @@ class Worker(BaseWorker[LSPClient, None]):
 
     async def _poll(self) -> None:
         with with_suppress(), timeit("LSP CACHE"):
-            acc = {**self._local_cached.post}
+            post = self._local_cached.post.items()
+            acc = {
+                client: [item for item in items if isinstance(item, Completion)]
+                for client, items in post
+            }
             await self._cache.set_cache(acc)
             await sleep(_CACHE_PERIOD)
 
-            for client, (comps, _) in self._local_cached.pre.items():
-                for chunked in chunk(comps, n=_CACHE_CHUNK):
+            rejected = (
+                (client, (item for item in items if isinstance(item, LazyComp)))
+                for client, items in post
+            )
+            pending = (
+                (client, comps) for client, (comps, _) in self._local_cached.pre.items()
+            )
+            for client, comps in chain(rejected, pending):
+                for chunked in chunk(_decoded(comps), n=_CACHE_CHUNK):
                     await self._cache.set_cache({client: chunked})
                     await sleep(_CACHE_PERIOD)
 
@@ -138,9 +182,7 @@ class Worker(BaseWorker[LSPClient, None]):
                 self._local_cached.pre.clear()
 
                 for client, (cached_items, length) in acc.items():
-                    items = (
-                        sanitize_cached(item, sort_by=None) for item in cached_items
-                    )
+                    items = map(_sanitize_cached, cached_items)
                     yield _Src.from_stored, LSPcomp(
                         client=client, local_cache=True, items=items, length=length
                     )
@@ -167,19 +209,21 @@ class Worker(BaseWorker[LSPClient, None]):
                             lsp_comps.length,
                         )
 
-                    for comp in lsp_comps.items:
+                    for item in lsp_comps.items:
                         if src is _Src.from_db:
+                            if comp := _decode(item):
+                                seen += 1
+                                yield comp
+                        elif _use_comp(
+                            self._supervisor.match,
+                            context=context,
+                            sort_by=item.sort_by,
+                            edit=item.primary_edit,
+                        ) and (comp := _decode(item)):
+                            acc.append(comp)
                             seen += 1
                             yield comp
                         else:
-                            acc.append(comp)
-                            if _use_comp(
-                                self._supervisor.match,
-                                context=context,
-                                sort_by=comp.sort_by,
-                                edit=comp.primary_edit,
-                            ):
-                                seen += 1
-                                yield comp
+                            acc.append(item)
             finally:
                 self._poll_task = cast(Task, go(self._supervisor.nvim, aw=self._poll()))
@@ -23,8 +23,8 @@ from std2.asyncio import to_thread
 from ...databases.tags.database import CTDB
 from ...paths.show import fmt_path
 from ...shared.runtime import Supervisor
-from ...shared.runtime import Worker as BaseWorker
-from ...shared.settings import TagsClient
+from ...shared.runtime import NarrowingWorker as BaseWorker
+from ...shared.settings import MatchOptions, TagsClient
 from ...shared.timeit import timeit
 from ...shared.types import Completion, Context, Doc, Edit
 from ...tags.parse import parse, run
@@ -159,16 +159,18 @@ class Worker(BaseWorker[TagsClient, CTDB]):
     async def swap(self, cwd: PurePath) -> None:
         await self._misc.swap(cwd)
 
-    async def work(self, context: Context) -> AsyncIterator[Completion]:
+    async def _work(
+        self, context: Context, match: MatchOptions, limitless: bool
+    ) -> AsyncIterator[Completion]:
         async with self._work_lock:
             row, _ = context.position
             tags = await self._misc.select(
-                self._supervisor.match,
+                match,
                 filename=context.filename,
                 line_num=row,
                 word=context.words,
                 sym=context.syms,
-                limitless=context.manual,
+                limitless=limitless,
             )
 
             seen: MutableSet[str] = set()
@@ -191,3 +193,13 @@ class Worker(BaseWorker[TagsClient, CTDB]):
                         icon_match=kind,
                     )
                     yield cmp
+
+    def work(self, context: Context) -> AsyncIterator[Completion]:
+        return self._work(
+            context, match=self._supervisor.match, limitless=context.manual
+        )
+
+    def widened(
+        self, context: Context, match: MatchOptions
+    ) -> AsyncIterator[Completion]:
+        return self._work(context, match=match, limitless=True)
@@ -7,8 +7,8 @@ from pynvim_pp.logging import with_suppress
 
 from ...databases.tmux.database import TMDB, TmuxWord
 from ...shared.runtime import Supervisor
-from ...shared.runtime import Worker as BaseWorker
-from ...shared.settings import TmuxClient
+from ...shared.runtime import NarrowingWorker as BaseWorker
+from ...shared.settings import MatchOptions, TmuxClient
 from ...shared.timeit import timeit
 from ...shared.types import Completion, Context, Doc, Edit
 from ...tmux.parse import snapshot
@@ -47,13 +47,15 @@ class Worker(BaseWorker[TmuxClient, TMDB]):
         )
         await self._misc.periodical(current, panes=panes)
 
-    async def work(self, context: Context) -> AsyncIterator[Completion]:
+    async def _work(
+        self, context: Context, match: MatchOptions, limitless: bool
+    ) -> AsyncIterator[Completion]:
         async with self._work_lock:
             words = await self._misc.select(
-                self._supervisor.match,
+                match,
                 word=context.words,
                 sym=(context.syms if self._options.match_syms else ""),
-                limitless=context.manual,
+                limitless=limitless,
             )
 
             for word in words:
@@ -70,3 +72,13 @@ class Worker(BaseWorker[TmuxClient, TMDB]):
                     icon_match="Text",
                 )
                 yield cmp
+
+    def work(self, context: Context) -> AsyncIterator[Completion]:
+        return self._work(
+            context, match=self._supervisor.match, limitless=context.manual
+        )
+
+    def widened(
+        self, context: Context, match: MatchOptions
+    ) -> AsyncIterator[Completion]:
+        return self._work(context, match=match, limitless=True)
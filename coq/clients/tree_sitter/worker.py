@@ -10,8 +10,8 @@ from pynvim_pp.logging import with_suppress
 from ...databases.treesitter.database import TDB
 from ...paths.show import fmt_path
 from ...shared.runtime import Supervisor
-from ...shared.runtime import Worker as BaseWorker
-from ...shared.settings import TSClient
+from ...shared.runtime import NarrowingWorker as BaseWorker
+from ...shared.settings import MatchOptions, TSClient
 from ...shared.types import Completion, Context, Doc, Edit
 from ...treesitter.request import async_request
 from ...treesitter.types import Payload
@@ -119,15 +119,27 @@ class Worker(BaseWorker[TSClient, TDB]):
         else:
             return None
 
-    async def work(self, context: Context) -> AsyncIterator[Completion]:
+    async def _work(
+        self, context: Context, match: MatchOptions, limitless: bool
+    ) -> AsyncIterator[Completion]:
         async with self._work_lock:
             payloads = await self._misc.select(
-                self._supervisor.match,
+                match,
                 filetype=context.filetype,
                 word=context.words,
                 sym=context.syms,
-                limitless=context.manual,
+                limitless=limitless,
             )
 
             for payload in payloads:
                 yield _trans(self._options, context=context, payload=payload)
+
+    def work(self, context: Context) -> AsyncIterator[Completion]:
+        return self._work(
+            context, match=self._supervisor.match, limitless=context.manual
+        )
+
+    def widened(
+        self, context: Context, match: MatchOptions
+    ) -> AsyncIterator[Completion]:
+        return self._work(context, match=match, limitless=True)
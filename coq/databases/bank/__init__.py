@@ -0,0 +1,3 @@
+"""
+This file defines bank as a submodule of databases/coq.
+"""
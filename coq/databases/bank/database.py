@@ -0,0 +1,189 @@
+from asyncio import CancelledError
+from concurrent.futures import Executor
+from contextlib import suppress
+from dataclasses import dataclass
+from hashlib import md5
+from os.path import normcase
+from pathlib import Path, PurePath
+from sqlite3 import Connection, OperationalError
+from time import time
+from typing import (
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+)
+
+from pynvim_pp.lib import encode
+from std2.itertools import chunk
+from std2.sqlite3 import with_transaction
+
+from ...shared.executor import Priority, SingleThreadExecutor
+from ...shared.settings import MatchOptions
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
+from .sql import sql
+
+_SCHEMA = "v2"
+
+# Frequencies halve every week, and are dropped once decayed below `_MIN_FREQ`
+_HALF_LIFE = 60 * 60 * 24 * 7
+_MIN_FREQ = 0.1
+
+# Files written per transaction
+_BATCH = 99
+
+
+@dataclass(frozen=True)
+class BankFile:
+    filetype: str
+    mtime: float
+    words: Mapping[str, int]
+
+
+def _decay(elapsed: float) -> float:
+    return float(0.5 ** (max(0, elapsed) / _HALF_LIFE))
+
+
+def _init(db_dir: Path, cwd: PurePath) -> Connection:
+    ncwd = normcase(cwd)
+    name = f"{md5(encode(ncwd)).hexdigest()}-{_SCHEMA}"
+    db = (db_dir / name).with_suffix(".sqlite3")
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = Connection(str(db), isolation_level=None)
+    init_db(conn)
+    conn.create_function("X_DECAY", narg=1, func=_decay, deterministic=True)
+    conn.executescript(sql("create", "pragma"))
+    conn.executescript(sql("create", "tables"))
+    with suppress(OperationalError):
+        conn.execute(sql("delete", "stale"), {"now": time(), "min_freq": _MIN_FREQ})
+    return conn
+
+
+class WBDB:
+    """
+    Persistent, per project word bank
+
+    Outlives the buffers it was read from, as well as the Neovim session
+    """
+
+    def __init__(self, pool: Executor, vars_dir: Path, cwd: PurePath) -> None:
+        self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
+        self._vars_dir = vars_dir / "clients" / "bank"
+        self._cwd = cwd
+        self._conn: Connection = self._ex.submit(lambda: _init(self._vars_dir, cwd=cwd))
+
+    @property
+    def cwd(self) -> PurePath:
+        return self._cwd
+
+    async def swap(self, cwd: PurePath) -> None:
+        def cont() -> None:
+            self._conn.close()
+            self._conn = _init(self._vars_dir, cwd=cwd)
+            self._cwd = cwd
+
+        await self._ex.asubmit(cont)
+
+    async def paths(self) -> Mapping[str, float]:
+        def cont() -> Mapping[str, float]:
+            with with_transaction(self._conn.cursor()) as cursor:
+                cursor.execute(sql("select", "files"), ())
+                files = {row["filename"]: row["mtime"] for row in cursor.fetchall()}
+                return files
+
+        return await self._ex.asubmit(cont)
+
+    async def mtimes(self, filenames: Iterable[str]) -> Mapping[str, float]:
+        """
+        `paths()`, but only of `filenames`
+        """
+
+        def cont() -> Mapping[str, float]:
+            with with_transaction(self._conn.cursor()) as cursor:
+                files: MutableMapping[str, float] = {}
+                for filename in filenames:
+                    cursor.execute(sql("select", "file"), {"filename": filename})
+                    for row in cursor.fetchall():
+                        files[row["filename"]] = row["mtime"]
+                return files
+
+        return await self._ex.asubmit(cont, priority=Priority.read)
+
+    async def reconciliate(self, files: Mapping[str, BankFile]) -> None:
+        """
+        Every re-read of a file adds to the frequencies of its words
+        """
+
+        def m1(batch: Sequence[BankFile], now: float) -> Iterator[Mapping]:
+            for file in batch:
+                for word, freq in file.words.items():
+                    yield {
+                        "filetype": file.filetype,
+                        "word": word,
+                        "freq": freq,
+                        "now": now,
+                    }
+
+        def steps() -> Iterator[None]:
+            with suppress(OperationalError):
+                # Committed per batch, so queries can run in between
+                for batch in chunk(files.items(), n=_BATCH):
+                    with with_transaction(self._conn.cursor()) as cursor:
+                        cursor.executemany(
+                            sql("insert", "file"),
+                            (
+                                {"filename": filename, "mtime": file.mtime}
+                                for filename, file in batch
+                            ),
+                        )
+                        cursor.executemany(
+                            sql("insert", "word"),
+                            m1([file for _, file in batch], now=time()),
+                        )
+                    yield
+
+                with with_transaction(self._conn.cursor()) as cursor:
+                    cursor.execute("PRAGMA optimize", ())
+
+        await self._ex.asubmit_steps(steps())
+
+    async def words(
+        self,
+        opts: MatchOptions,
+        filetype: Optional[str],
+        word: str,
+        sym: str,
+        limitless: int,
+    ) -> Sequence[str]:
+        def cont(ticket: object) -> Sequence[str]:
+            try:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
+                    cursor.execute(
+                        sql("select", "words"),
+                        {
+                            "cut_off": opts.fuzzy_cutoff,
+                            "look_ahead": opts.look_ahead,
+                            "limit": BIGGEST_INT if limitless else opts.max_results,
+                            "filetype": filetype,
+                            "now": time(),
+                            "word": word,
+                            "sym": sym,
+                            "like_word": like_esc(word[: opts.exact_matches]),
+                            "like_sym": like_esc(sym[: opts.exact_matches]),
+                            **mask_params("word", word),
+                            **mask_params("sym", sym),
+                        },
+                    )
+                    return tuple(row["word"] for row in cursor.fetchall())
+            except OperationalError:
+                return ()
+
+        ticket = self._guard.begin()
+        try:
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
+        except CancelledError:
+            self._guard.cancel(ticket)
+            raise
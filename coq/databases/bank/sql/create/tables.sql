@@ -0,0 +1,25 @@
+BEGIN;
+
+
+CREATE TABLE IF NOT EXISTS files (
+  filename TEXT NOT NULL PRIMARY KEY,
+  mtime    REAL NOT NULL
+) WITHOUT ROWID;
+
+
+-- `freq` is as of `touched`, decayed on read and on every upsert
+CREATE TABLE IF NOT EXISTS words (
+  filetype TEXT    NOT NULL,
+  word     TEXT    NOT NULL,
+  lword    TEXT    NOT NULL,
+  mask     INTEGER NOT NULL,
+  len      INTEGER NOT NULL,
+  freq     REAL    NOT NULL,
+  touched  REAL    NOT NULL,
+  PRIMARY KEY (filetype, word)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_word  ON words (word);
+CREATE INDEX IF NOT EXISTS words_lword ON words (lword);
+
+
+END;
@@ -0,0 +1,3 @@
+DELETE FROM words
+WHERE
+  freq * X_DECAY(:now - touched) < :min_freq
@@ -0,0 +1,2 @@
+INSERT OR REPLACE INTO files (filename,                mtime)
+VALUES                       (X_NORM_CASE(:filename), :mtime)
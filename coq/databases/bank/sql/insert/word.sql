@@ -0,0 +1,6 @@
+INSERT INTO words (filetype,  word,  lword,        mask,               len,           freq,  touched)
+VALUES            (:filetype, :word, LOWER(:word), X_CHAR_MASK(:word), LENGTH(:word), :freq, :now)
+ON CONFLICT (filetype, word) DO UPDATE
+SET
+  freq    = words.freq * X_DECAY(excluded.touched - words.touched) + excluded.freq,
+  touched = excluded.touched
@@ -0,0 +1,6 @@
+SELECT
+  filename,
+  mtime
+FROM files
+WHERE
+  filename = X_NORM_CASE(:filename)
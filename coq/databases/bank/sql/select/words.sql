@@ -0,0 +1,58 @@
+SELECT
+  word
+FROM words
+WHERE
+  (:filetype IS NULL OR filetype = :filetype OR filetype = '')
+  AND
+  (
+    (
+      :word <> ''
+      AND
+      lword LIKE :like_word ESCAPE '!'
+      AND
+      len + :look_ahead >= :word_len
+      AND
+      word <> SUBSTR(:word, 1, len)
+      AND
+      :word_len - :word_n
+      + ((mask >> :word_0) & 1)
+      + ((mask >> :word_1) & 1)
+      + ((mask >> :word_2) & 1)
+      + ((mask >> :word_3) & 1)
+      + ((mask >> :word_4) & 1)
+      + ((mask >> :word_5) & 1)
+      + ((mask >> :word_6) & 1)
+      + ((mask >> :word_7) & 1)
+      > :cut_off * MIN(:word_len, len)
+      AND
+      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+    )
+    OR
+    (
+      :sym <> ''
+      AND
+      lword LIKE :like_sym ESCAPE '!'
+      AND
+      len + :look_ahead >= :sym_len
+      AND
+      word <> SUBSTR(:sym, 1, len)
+      AND
+      :sym_len - :sym_n
+      + ((mask >> :sym_0) & 1)
+      + ((mask >> :sym_1) & 1)
+      + ((mask >> :sym_2) & 1)
+      + ((mask >> :sym_3) & 1)
+      + ((mask >> :sym_4) & 1)
+      + ((mask >> :sym_5) & 1)
+      + ((mask >> :sym_6) & 1)
+      + ((mask >> :sym_7) & 1)
+      > :cut_off * MIN(:sym_len, len)
+      AND
+      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
+    )
+  )
+GROUP BY
+  word
+ORDER BY
+  SUM(freq * X_DECAY(:now - touched)) DESC
+LIMIT :limit
@@ -1,26 +1,43 @@
-from asyncio import CancelledError
+from asyncio import CancelledError, shield
+from collections import deque
 from concurrent.futures import Executor
-from dataclasses import dataclass
-from itertools import islice
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from hashlib import blake2b
+from itertools import chain, islice
 from random import shuffle
 from sqlite3 import Connection, OperationalError
 from sqlite3.dbapi2 import Cursor
 from threading import Lock
-from typing import AbstractSet, Iterator, Mapping, Optional, Sequence, Tuple
+from typing import (
+    AbstractSet,
+    Awaitable,
+    Deque,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import uuid4
 
 from pynvim_pp.lib import recode
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
 from ...consts import BUFFER_DB, DEBUG
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
+from ...shared.index import PrefixIndex
 from ...shared.parse import coalesce
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db
 from .sql import sql
 
+# Fuzzy score at most this many index candidates per `max_results`
+_CANDIDATE_FACTOR = 9
+
 
 @dataclass(frozen=True)
 class BufferWord:
@@ -30,6 +47,55 @@ class BufferWord:
     line_num: int
 
 
+@dataclass(frozen=True)
+class _Line:
+    rowid: bytes
+    line_num: int
+    line: str
+    line_hash: bytes
+
+
+@dataclass(frozen=True)
+class _Update:
+    buf_id: int
+    filetype: str
+    filename: str
+    lo: int
+    hi: int
+    lines: Sequence[str]
+
+
+def _merge(prev: _Update, update: _Update) -> Optional[_Update]:
+    """
+    `update` is relative to the buffer after `prev`, merged only if they touch
+
+    Otherwise the lines between them would be unknown
+    """
+
+    n = len(prev.lines)
+    if update.lo <= prev.lo + n and update.hi >= prev.lo:
+        lines = [
+            *prev.lines[: max(0, update.lo - prev.lo)],
+            *update.lines,
+            *prev.lines[max(0, update.hi - prev.lo) :],
+        ]
+        hi = max(prev.lo + n, update.hi) - n + (prev.hi - prev.lo)
+        return replace(update, lo=min(prev.lo, update.lo), hi=hi, lines=lines)
+    else:
+        return None
+
+
+def _enqueue(queue: MutableSequence[_Update], update: _Update) -> None:
+    if queue and (merged := _merge(queue[-1], update=update)):
+        queue[-1] = merged
+    else:
+        queue.append(update)
+
+
+def _hash(line: str) -> bytes:
+    return blake2b(line.encode("UTF-8"), digest_size=8).digest()
+
+
 def _ensure_buffer(cursor: Cursor, buf_id: int, filetype: str, filename: str) -> None:
     cursor.execute(sql("select", "buffer_by_id"), {"rowid": buf_id})
     row = {
@@ -43,6 +109,18 @@ def _ensure_buffer(cursor: Cursor, buf_id: int, filetype: str, filename: str) ->
         cursor.execute(sql("insert", "buffer"), row)
 
 
+def _row_words(cursor: Cursor, rowid: bytes) -> Sequence[str]:
+    cursor.execute(sql("select", "row_words"), {"line_id": rowid})
+    return [row["word"] for row in cursor.fetchall()]
+
+
+def _line_words(cursor: Cursor, buf_id: int, lo: int, hi: int) -> Sequence[str]:
+    cursor.execute(
+        sql("select", "line_words"), {"buffer_id": buf_id, "lo": lo, "hi": hi}
+    )
+    return [row["word"] for row in cursor.fetchall()]
+
+
 def _init() -> Connection:
     conn = Connection(BUFFER_DB, isolation_level=None)
     init_db(conn)
@@ -59,45 +137,57 @@ class BDB:
         unifying_chars: AbstractSet[str],
         include_syms: bool,
     ) -> None:
-        self._lock = Lock()
+        self._pending_lock = Lock()
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
+        self._pending: MutableMapping[int, MutableSequence[_Update]] = {}
+        self._flushing: Optional[Awaitable[None]] = None
         self._tokenization_limit = tokenization_limit
         self._unifying_chars = unifying_chars
         self._include_syms = include_syms
+        self._index = PrefixIndex()
         self._conn: Connection = self._ex.submit(_init)
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
-
     async def vacuum(self, live_bufs: Mapping[int, int]) -> AbstractSet[int]:
-        def cont() -> AbstractSet[int]:
-            try:
+        dead: MutableSet[int] = set()
+
+        def steps() -> Iterator[None]:
+            with suppress(OperationalError):
                 with with_transaction(self._conn.cursor()) as cursor:
                     cursor.execute(sql("select", "buffers"), ())
                     existing = {row["rowid"] for row in cursor.fetchall()}
-                    dead = existing - live_bufs.keys()
-                    cursor.executemany(
-                        sql("delete", "buffer"),
-                        ({"buffer_id": buf_id} for buf_id in dead),
-                    )
-                    cursor.executemany(
-                        sql("delete", "lines"),
-                        (
-                            {"buffer_id": buf_id, "lo": line_count, "hi": -1}
-                            for buf_id, line_count in live_bufs.items()
-                        ),
-                    )
+                yield
+
+                # Committed per buffer, so queries can run in between
+                for buf_id in existing - live_bufs.keys():
+                    with with_transaction(self._conn.cursor()) as cursor:
+                        removed = _line_words(cursor, buf_id=buf_id, lo=0, hi=-1)
+                        cursor.execute(sql("delete", "buffer"), {"buffer_id": buf_id})
+                    self._index.remove(removed)
+                    dead.add(buf_id)
+                    yield
+
+                for buf_id, line_count in live_bufs.items():
+                    with with_transaction(self._conn.cursor()) as cursor:
+                        removed = _line_words(
+                            cursor, buf_id=buf_id, lo=line_count, hi=-1
+                        )
+                        cursor.execute(
+                            sql("delete", "lines"),
+                            {"buffer_id": buf_id, "lo": line_count, "hi": -1},
+                        )
+                    self._index.remove(removed)
+                    yield
+
+                with with_transaction(self._conn.cursor()) as cursor:
                     cursor.execute("PRAGMA optimize", ())
-                    return dead
-            except OperationalError:
-                return set()
 
-        return await self._ex.asubmit(cont)
+        await self._ex.asubmit_steps(steps())
+        return dead
 
     async def buf_update(self, buf_id: int, filetype: str, filename: str) -> None:
         def cont() -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+            with with_transaction(self._conn.cursor()) as cursor:
                 _ensure_buffer(
                     cursor,
                     buf_id=buf_id,
@@ -107,77 +197,161 @@ class BDB:
 
         await self._ex.asubmit(cont)
 
-    async def set_lines(
-        self,
-        buf_id: int,
-        filetype: str,
-        filename: str,
-        lo: int,
-        hi: int,
-        lines: Sequence[str],
-    ) -> None:
+    def _apply(
+        self, cursor: Cursor, update: _Update
+    ) -> Tuple[Sequence[str], Sequence[str]]:
+        """
+        Words `(removed, added)`
+        """
+
+        buf_id, lo, hi, lines = update.buf_id, update.lo, update.hi, update.lines
+
         def m0() -> Iterator[Tuple[int, str, bytes]]:
             for line_num, line in enumerate(lines, start=lo):
-                line_id = uuid4().bytes
-                yield line_num, recode(line), line_id
-
-        line_info = [*m0()]
-        shuffle(line_info)
+                recoded = recode(line)
+                yield line_num, recoded, _hash(recoded)
 
-        def m1() -> Iterator[Mapping]:
-            for line_num, line, line_id in line_info:
+        def m1(fresh: Sequence[_Line]) -> Iterator[Mapping]:
+            for line in fresh:
                 yield {
-                    "rowid": line_id,
+                    "rowid": line.rowid,
                     "buffer_id": buf_id,
-                    "line_num": line_num,
-                    "line": line if DEBUG else "",
+                    "line_num": line.line_num,
+                    "line": line.line if DEBUG else "",
+                    "line_hash": line.line_hash,
                 }
 
-        def m2() -> Iterator[Mapping]:
-            for line_num, line, line_id in line_info:
+        def m2(fresh: Sequence[_Line]) -> Iterator[Tuple[int, Mapping]]:
+            for idx, line in enumerate(fresh):
+                # Mirror `UNIQUE(line_id, word)`, the index counts each row once
+                seen: MutableSet[str] = set()
                 for word in coalesce(
-                    line,
+                    line.line,
                     unifying_chars=self._unifying_chars,
                     include_syms=self._include_syms,
                 ):
-                    yield {"line_id": line_id, "word": word, "line_num": line_num}
+                    if word not in seen:
+                        seen.add(word)
+                        yield idx, {"line_id": line.rowid, "word": word}
 
-        def cont() -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
-                _ensure_buffer(
-                    cursor,
-                    buf_id=buf_id,
-                    filetype=filetype,
-                    filename=filename,
-                )
-                cursor.execute(
-                    sql("delete", "lines"),
-                    {"buffer_id": buf_id, "lo": lo, "hi": hi},
-                )
-                shift = len(lines) - (hi - lo)
-                cursor.execute(
-                    sql("update", "lines_shift_1"),
-                    {"buffer_id": buf_id, "lo": lo, "shift": shift},
-                )
-                cursor.execute(sql("update", "lines_shift_2"), {"buffer_id": buf_id})
-                cursor.executemany(sql("insert", "line"), m1())
-                cursor.executemany(
-                    sql("insert", "word"), islice(m2(), self._tokenization_limit)
-                )
-                cursor.execute(sql("select", "line_count"), {"buffer_id": buf_id})
-                count = cursor.fetchone()["line_count"]
-                if not count:
-                    cursor.execute(
-                        sql("insert", "line"),
-                        {
-                            "rowid": uuid4().bytes,
-                            "line": "",
-                            "buffer_id": buf_id,
-                            "line_num": 0,
-                        },
+        _ensure_buffer(
+            cursor,
+            buf_id=buf_id,
+            filetype=update.filetype,
+            filename=update.filename,
+        )
+
+        # Diff against stored rows, only lines with new content are tokenized
+        cursor.execute(
+            sql("select", "line_hashes"),
+            {"buffer_id": buf_id, "lo": lo, "hi": hi},
+        )
+        existing: MutableMapping[bytes, Deque[Tuple[bytes, int]]] = {}
+        for row in cursor.fetchall():
+            existing.setdefault(row["line_hash"], deque()).append(
+                (row["rowid"], row["line_num"])
+            )
+
+        moved: MutableSequence[Mapping] = []
+        fresh: MutableSequence[_Line] = []
+        for line_num, line, line_hash in m0():
+            if rows := existing.get(line_hash):
+                rowid, prev_num = rows.popleft()
+                if prev_num != line_num:
+                    moved.append({"rowid": rowid, "line_num": line_num})
+            else:
+                fresh.append(
+                    _Line(
+                        rowid=uuid4().bytes,
+                        line_num=line_num,
+                        line=line,
+                        line_hash=line_hash,
                     )
+                )
 
-        await self._ex.asubmit(cont)
+        dead = tuple(rowid for rows in existing.values() for rowid, _ in rows)
+        removed = [word for rowid in dead for word in _row_words(cursor, rowid=rowid)]
+        cursor.executemany(sql("delete", "line"), ({"rowid": rowid} for rowid in dead))
+
+        shift = len(lines) - (hi - lo)
+        if shift:
+            cursor.execute(
+                sql("update", "lines_shift_1"),
+                {"buffer_id": buf_id, "hi": hi, "shift": shift},
+            )
+        cursor.executemany(sql("update", "line_num"), moved)
+        if shift or moved:
+            cursor.execute(sql("update", "lines_shift_2"), {"buffer_id": buf_id})
+
+        shuffle(fresh)
+        tokenized = [*islice(m2(fresh), self._tokenization_limit)]
+        words = [row for _, row in tokenized]
+        if tokenized and len(tokenized) >= self._tokenization_limit:
+            # Never matched, so truncated lines are re-tokenized next time
+            last, _ = tokenized[-1]
+            fresh[last:] = [replace(line, line_hash=b"") for line in fresh[last:]]
+        cursor.executemany(sql("insert", "line"), m1(fresh))
+        cursor.executemany(sql("insert", "word"), words)
+        cursor.execute(sql("select", "line_count"), {"buffer_id": buf_id})
+        count = cursor.fetchone()["line_count"]
+        if not count:
+            cursor.execute(
+                sql("insert", "line"),
+                {
+                    "rowid": uuid4().bytes,
+                    "line": "",
+                    "buffer_id": buf_id,
+                    "line_num": 0,
+                    "line_hash": _hash(""),
+                },
+            )
+
+        return removed, [row["word"] for row in words]
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._flushing = None
+
+        with with_transaction(self._conn.cursor()) as cursor:
+            changes = [
+                self._apply(cursor, update=update)
+                for updates in pending.values()
+                for update in updates
+            ]
+
+        for removed, added in changes:
+            self._index.remove(removed)
+            self._index.add(added)
+
+    async def set_lines(
+        self,
+        buf_id: int,
+        filetype: str,
+        filename: str,
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+    ) -> None:
+        """
+        Queued updates to a buffer are merged, then written out together
+        """
+
+        update = _Update(
+            buf_id=buf_id,
+            filetype=filetype,
+            filename=filename,
+            lo=lo,
+            hi=hi,
+            lines=lines,
+        )
+        with self._pending_lock:
+            _enqueue(self._pending.setdefault(buf_id, []), update=update)
+            if not (flushing := self._flushing):
+                flushing = self._flushing = self._ex.asubmit(self._flush)
+
+        # Shared by every update merged into this flush
+        await shield(flushing)
 
     async def words(
         self,
@@ -187,21 +361,32 @@ class BDB:
         sym: str,
         limitless: int,
     ) -> Iterator[BufferWord]:
-        def cont() -> Iterator[BufferWord]:
+        limit = BIGGEST_INT if limitless else opts.max_results
+        cap = BIGGEST_INT if limitless else opts.max_results * _CANDIDATE_FACTOR
+
+        def cont(ticket: object) -> Iterator[BufferWord]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
+                    cursor.execute(sql("delete", "candidates"), ())
+                    cursor.executemany(
+                        sql("insert", "candidate"),
+                        (
+                            {"word": match}
+                            for match in chain(
+                                islice(
+                                    self._index.search(opts, word=word, limit=cap),
+                                    limit,
+                                ),
+                                islice(
+                                    self._index.search(opts, word=sym, limit=cap),
+                                    limit,
+                                ),
+                            )
+                        ),
+                    )
                     cursor.execute(
                         sql("select", "words"),
-                        {
-                            "cut_off": opts.fuzzy_cutoff,
-                            "look_ahead": opts.look_ahead,
-                            "limit": BIGGEST_INT if limitless else opts.max_results,
-                            "filetype": filetype,
-                            "word": word,
-                            "sym": sym,
-                            "like_word": like_esc(word[: opts.exact_matches]),
-                            "like_sym": like_esc(sym[: opts.exact_matches]),
-                        },
+                        {"limit": limit, "filetype": filetype},
                     )
                     rows = cursor.fetchall()
                     return (
@@ -216,10 +401,9 @@ class BDB:
             except OperationalError:
                 return iter(())
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! BUFFERS"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
@@ -14,6 +14,7 @@ CREATE TABLE IF NOT EXISTS lines (
   buffer_id INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
   line_num  INTEGER NOT NULL,
   line      TEXT    NOT NULL,
+  line_hash BLOB    NOT NULL,
   UNIQUE(buffer_id, line_num)
 ) WITHOUT ROWID;
 CREATE INDEX IF NOT EXISTS lines_buffer_id ON lines (buffer_id);
@@ -31,22 +32,10 @@ CREATE INDEX IF NOT EXISTS words_word    ON words (word);
 CREATE INDEX IF NOT EXISTS words_lword   ON words (lword);
 
 
-CREATE VIEW IF NOT EXISTS words_view AS
-SELECT
-  words.word,
-  words.lword,
-  buffers.filetype,
-  buffers.filename,
-  lines.line_num
-FROM buffers
-JOIN lines
-  ON lines.buffer_id = buffers.rowid
-JOIN words
-  ON words.line_id = lines.rowid
-GROUP BY
-  words.word
-HAVING
-  words.word <> '';
+-- Populated from the in-process `PrefixIndex`, per query
+CREATE TEMP TABLE IF NOT EXISTS candidates (
+  word TEXT NOT NULL PRIMARY KEY
+) WITHOUT ROWID;
 
 
 END;
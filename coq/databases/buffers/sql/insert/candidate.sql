@@ -0,0 +1,2 @@
+INSERT OR IGNORE INTO candidates ( word)
+VALUES                           (:word)
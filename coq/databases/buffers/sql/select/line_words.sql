@@ -0,0 +1,14 @@
+SELECT
+  words.word
+FROM lines
+JOIN words
+  ON words.line_id = lines.rowid
+WHERE
+  lines.buffer_id = :buffer_id
+  AND
+  lines.line_num >= :lo
+  AND
+  CASE
+    WHEN :hi >= 0 THEN lines.line_num < :hi
+    ELSE 1
+  END
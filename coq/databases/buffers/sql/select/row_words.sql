@@ -0,0 +1,5 @@
+SELECT
+  word
+FROM words
+WHERE
+  line_id = :line_id
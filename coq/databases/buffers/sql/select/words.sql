@@ -1,38 +1,20 @@
 SELECT
-  word,
-  filetype,
-  filename,
-  line_num
-FROM words_view
+  words.word,
+  buffers.filetype,
+  buffers.filename,
+  lines.line_num
+FROM candidates
+CROSS JOIN words
+  ON words.word = candidates.word
+JOIN lines
+  ON lines.rowid = words.line_id
+JOIN buffers
+  ON buffers.rowid = lines.buffer_id
 WHERE
   CASE
-    WHEN :filetype <> NULL THEN filetype = :filetype
+    WHEN :filetype <> NULL THEN buffers.filetype = :filetype
     ELSE 1
   END
-  AND
-  (
-    (
-      :word <> ''
-      AND 
-      lword LIKE :like_word ESCAPE '!'
-      AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:word)
-      AND
-      word <> SUBSTR(:word, 1, LENGTH(word))
-      AND
-      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
-    )
-    OR
-    (
-      :sym <> ''
-      AND 
-      lword LIKE :like_sym ESCAPE '!'
-      AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:sym)
-      AND
-      word <> SUBSTR(:sym, 1, LENGTH(word))
-      AND
-      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
-    )
-  )
+GROUP BY
+  words.word
 LIMIT :limit
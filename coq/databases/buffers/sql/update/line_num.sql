@@ -0,0 +1,6 @@
+-- Negated, see `lines_shift_2`
+UPDATE lines
+SET
+  line_num = -(:line_num + 1)
+WHERE
+  rowid = :rowid
@@ -1,7 +1,7 @@
 UPDATE lines
 SET
-  line_num = -(line_num + :shift)
+  line_num = -(line_num + :shift + 1)
 WHERE
   buffer_id = :buffer_id
   AND
-  line_num >= :lo
+  line_num >= :hi
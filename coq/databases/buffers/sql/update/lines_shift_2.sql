@@ -1,6 +1,6 @@
 UPDATE lines
 SET
-  line_num = -line_num
+  line_num = -line_num - 1
 WHERE
   buffer_id = :buffer_id
   AND
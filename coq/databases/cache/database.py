@@ -2,16 +2,13 @@ from asyncio import CancelledError
 from concurrent.futures import Executor
 from contextlib import suppress
 from sqlite3 import Connection, OperationalError
-from threading import Lock
 from typing import Iterable, Iterator, Mapping, Tuple
 
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
 from .sql import sql
 
 
@@ -25,15 +22,11 @@ def _init() -> Connection:
 
 class Database:
     def __init__(self, pool: Executor) -> None:
-        self._lock = Lock()
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
         self._conn: Connection = self._ex.submit(_init)
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
-
-    async def insert(self, keys: Iterable[Tuple[bytes, str]]) -> None:
+    async def insert(self, keys: Iterable[Tuple[int, str]]) -> None:
         def m1() -> Iterator[Mapping]:
             for key, word in keys:
                 yield {"key": key, "word": word}
@@ -47,15 +40,15 @@ class Database:
 
     async def select(
         self, clear: bool, opts: MatchOptions, word: str, sym: str, limitless: int
-    ) -> Tuple[Iterator[Tuple[bytes, str]], int]:
-        def cont() -> Tuple[Iterator[Tuple[bytes, str]], int]:
+    ) -> Tuple[Iterator[Tuple[int, str]], int]:
+        def cont(ticket: object) -> Tuple[Iterator[Tuple[int, str]], int]:
             if clear:
-                with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(self._conn.cursor()) as cursor:
                     cursor.execute(sql("delete", "words"))
                     return iter(()), 0
             else:
                 try:
-                    with with_transaction(self._conn.cursor()) as cursor:
+                    with self._guard.transaction(self._conn, ticket=ticket) as cursor:
                         limit = BIGGEST_INT if limitless else opts.max_results
                         cursor.execute(
                             sql("select", "words"),
@@ -68,6 +61,8 @@ class Database:
                                 "sym": sym,
                                 "like_word": like_esc(word[: opts.exact_matches]),
                                 "like_sym": like_esc(sym[: opts.exact_matches]),
+                                **mask_params("word", word),
+                                **mask_params("sym", sym),
                             },
                         )
                         rows = cursor.fetchall()
@@ -75,10 +70,9 @@ class Database:
                 except OperationalError:
                     return iter(()), 0
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! CACHE"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
@@ -2,9 +2,11 @@ BEGIN;
 
 
 CREATE TABLE IF NOT EXISTS words (
-  key   BLOB NOT NULL,
+  key   INTEGER NOT NULL,
   word  TEXT NOT NULL,
   lword TEXT NOT NULL,
+  mask  INTEGER NOT NULL,
+  len   INTEGER NOT NULL,
   UNIQUE (key, word)
 );
 CREATE INDEX IF NOT EXISTS words_lword ON words (lword);
@@ -1,2 +1,2 @@
-INSERT OR REPLACE INTO words (key,  word,  lword)
-VALUES                       (:key, :word, LOWER(:word))
+INSERT OR REPLACE INTO words (key,  word,  lword,        mask,               len)
+VALUES                       (:key, :word, LOWER(:word), X_CHAR_MASK(:word), LENGTH(:word))
@@ -9,9 +9,20 @@ WHERE
     (
       lword LIKE :like_word ESCAPE '!'
       AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:word)
+      len + :look_ahead >= :word_len
       AND
-      word <> SUBSTR(:word, 1, LENGTH(word))
+      word <> SUBSTR(:word, 1, len)
+      AND
+      :word_len - :word_n
+      + ((mask >> :word_0) & 1)
+      + ((mask >> :word_1) & 1)
+      + ((mask >> :word_2) & 1)
+      + ((mask >> :word_3) & 1)
+      + ((mask >> :word_4) & 1)
+      + ((mask >> :word_5) & 1)
+      + ((mask >> :word_6) & 1)
+      + ((mask >> :word_7) & 1)
+      > :cut_off * MIN(:word_len, len)
       AND
       X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
     )
@@ -19,9 +30,20 @@ WHERE
     (
       lword LIKE :like_sym ESCAPE '!'
       AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:sym)
+      len + :look_ahead >= :sym_len
+      AND
+      word <> SUBSTR(:sym, 1, len)
       AND
-      word <> SUBSTR(:sym, 1, LENGTH(word))
+      :sym_len - :sym_n
+      + ((mask >> :sym_0) & 1)
+      + ((mask >> :sym_1) & 1)
+      + ((mask >> :sym_2) & 1)
+      + ((mask >> :sym_3) & 1)
+      + ((mask >> :sym_4) & 1)
+      + ((mask >> :sym_5) & 1)
+      + ((mask >> :sym_6) & 1)
+      + ((mask >> :sym_7) & 1)
+      > :cut_off * MIN(:sym_len, len)
       AND
       X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
     )
@@ -1,20 +1,29 @@
-from asyncio.exceptions import CancelledError
 from concurrent.futures import Executor
+from contextlib import suppress
 from dataclasses import dataclass
 from json import loads
-from sqlite3 import Connection, OperationalError
+from pathlib import Path
+from sqlite3 import Connection, Cursor, OperationalError
 from threading import Lock
-from typing import Iterator, Mapping, Optional
+from typing import Iterator, Mapping, MutableSequence, Optional, Sequence
 
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
 from ...consts import INSERT_DB
 from ...shared.executor import SingleThreadExecutor
+from ...shared.recency import Recency
 from ...shared.sql import init_db
-from ...shared.timeit import timeit
 from .sql import sql
 
+_SCHEMA = "v1"
+
+# Telemetry rows held back before being written out, short of an idle
+_BUFFER = 999
+
+# Insertions for recency to halve, and words remembered
+_HALF_LIFE = 333
+_SIZE = 9999
+
 
 @dataclass(frozen=True)
 class Statistics:
@@ -33,23 +42,83 @@ class Statistics:
     q99_items: int
 
 
-def _init() -> Connection:
+@dataclass(frozen=True)
+class Timing:
+    source: str
+    samples: int
+    q95_duration: float
+    instances: int
+    inserted: int
+
+
+def _init(db_dir: Optional[Path]) -> Connection:
     conn = Connection(INSERT_DB, isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
+    if db_dir:
+        db = (db_dir / f"recency-{_SCHEMA}").with_suffix(".sqlite3")
+        db.parent.mkdir(parents=True, exist_ok=True)
+        conn.execute(sql("create", "attach"), {"path": str(db)})
+        conn.executescript(sql("create", "recency"))
     return conn
 
 
 class IDB:
-    def __init__(self, pool: Executor) -> None:
-        self._lock = Lock()
+    """
+    Session telemetry, and recency of insertions, persisted under `vars_dir` if given
+    """
+
+    def __init__(self, pool: Executor, vars_dir: Optional[Path]) -> None:
+        self._lock, self._buf_lock = Lock(), Lock()
         self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init)
+        self._persist = vars_dir is not None
+        self._recency = Recency(half_life=_HALF_LIFE, size=_SIZE)
+        self._conn: Connection = self._ex.submit(
+            lambda: _init(vars_dir / "insertions" if vars_dir else None)
+        )
+        if self._persist:
+            self._ex.submit(self._load)
+        self._batches: MutableSequence[Mapping] = []
+        self._instances: MutableSequence[Mapping] = []
+        self._stats: MutableSequence[Mapping] = []
+
+    def _buffer(self, rows: MutableSequence[Mapping], row: Mapping) -> None:
+        with self._buf_lock:
+            rows.append(row)
+            full = len(self._batches) + len(self._instances) + len(self._stats)
+
+        if full >= _BUFFER:
+            self._ex.asubmit(self._flush)
+
+    def _drain(self, cursor: Cursor) -> None:
+        """
+        Runs on the DB thread, ahead of anything that reads the telemetry
+        """
+
+        with self._buf_lock:
+            batches, self._batches = self._batches, []
+            instances, self._instances = self._instances, []
+            stats, self._stats = self._stats, []
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        try:
+            cursor.executemany(sql("insert", "batch"), batches)
+            cursor.executemany(sql("insert", "instance"), instances)
+            cursor.executemany(sql("insert", "instance_stat"), stats)
+        except OperationalError:
+            with self._buf_lock:
+                self._batches[:0] = batches
+                self._instances[:0] = instances
+                self._stats[:0] = stats
+            raise
+
+    def _flush(self) -> None:
+        with suppress(OperationalError):
+            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                self._drain(cursor)
+
+    async def flush(self) -> None:
+        await self._ex.asubmit(self._flush)
 
     def new_source(self, source: str) -> None:
         def cont() -> None:
@@ -58,73 +127,102 @@ class IDB:
 
         self._ex.submit(cont)
 
-    async def new_batch(self, batch_id: bytes) -> None:
-        def cont() -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
-                cursor.execute(sql("insert", "batch"), {"rowid": batch_id})
-
-        await self._ex.asubmit(cont)
+    def new_batch(self, batch_id: bytes) -> None:
+        self._buffer(self._batches, {"rowid": batch_id})
 
-    async def new_instance(self, instance: bytes, source: str, batch_id: bytes) -> None:
-        def cont(_: None = None) -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
-                cursor.execute(
-                    sql("insert", "instance"),
-                    {"rowid": instance, "source_id": source, "batch_id": batch_id},
-                )
+    def new_instance(self, instance: bytes, source: str, batch_id: bytes) -> None:
+        self._buffer(
+            self._instances,
+            {"rowid": instance, "source_id": source, "batch_id": batch_id},
+        )
 
-        await self._ex.asubmit(cont)
-
-    async def new_stat(
+    def new_stat(
         self, instance: bytes, interrupted: bool, duration: float, items: int
     ) -> None:
-        def cont() -> None:
+        self._buffer(
+            self._stats,
+            {
+                "instance_id": instance,
+                "interrupted": interrupted,
+                "duration": duration,
+                "items": items,
+            },
+        )
+
+    def _load(self) -> None:
+        """
+        Compacted on the way in, only what `Recency` kept is written back
+        """
+
+        with suppress(OperationalError):
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
-                cursor.execute(
-                    sql("insert", "instance_stat"),
-                    {
-                        "instance_id": instance,
-                        "interrupted": interrupted,
-                        "duration": duration,
-                        "items": items,
-                    },
+                cursor.execute(sql("select", "recency"), ())
+                self._recency.load(
+                    (row["word"], row["score"], row["clock"])
+                    for row in cursor.fetchall()
+                )
+                cursor.execute(sql("delete", "recency"), ())
+                cursor.executemany(
+                    sql("insert", "recency"),
+                    (
+                        {"word": word, "score": score, "clock": clock}
+                        for word, score, clock in self._recency.dump()
+                    ),
                 )
 
-        await self._ex.asubmit(cont)
-
-    async def insertion_order(self, n_rows: int) -> Mapping[str, int]:
-        def cont() -> Mapping[str, int]:
-            try:
-                with with_transaction(self._conn.cursor()) as cursor:
-                    cursor.execute(sql("select", "inserted"), {"limit": n_rows})
-                    order = {
-                        row["sort_by"]: row["insert_order"] for row in cursor.fetchall()
-                    }
-                    return order
-            except OperationalError:
-                return {}
-
-        await to_thread(self._interrupt)
-        try:
-            return await self._ex.asubmit(cont)
-        except CancelledError:
-            with timeit("INTERRUPT !! INSERTED"):
-                await to_thread(self._interrupt)
-            raise
+    def recency(self) -> Mapping[str, float]:
+        return self._recency.weights()
 
     def inserted(self, instance_id: bytes, sort_by: str) -> None:
+        score, clock = self._recency.insert(sort_by)
+
         def cont() -> None:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                self._drain(cursor)
                 cursor.execute(
                     sql("insert", "inserted"),
                     {"instance_id": instance_id, "sort_by": sort_by},
                 )
+                if self._persist:
+                    with suppress(OperationalError):
+                        cursor.execute(
+                            sql("insert", "recency"),
+                            {"word": sort_by, "score": score, "clock": clock},
+                        )
 
         self._ex.submit(cont)
 
+    async def timings(self, window: int) -> Sequence[Timing]:
+        """
+        Durations over the last `window` requests, insertions over the session
+        """
+
+        def cont() -> Sequence[Timing]:
+            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                self._drain(cursor)
+                cursor.execute(sql("select", "timings"), {"window": window})
+                rows = cursor.fetchall()
+
+            def c1() -> Iterator[Timing]:
+                for row in rows:
+                    q_duration: Mapping[str, Optional[float]] = loads(row["q_duration"])
+                    timing = Timing(
+                        source=row["source"],
+                        samples=row["samples"],
+                        q95_duration=q_duration.get("q95") or 0,
+                        instances=row["instances"],
+                        inserted=row["inserted"],
+                    )
+                    yield timing
+
+            return tuple(c1())
+
+        return await self._ex.asubmit(cont)
+
     def stats(self) -> Iterator[Statistics]:
         def cont() -> Iterator[Statistics]:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                self._drain(cursor)
                 cursor.execute(sql("select", "stats"), ())
                 rows = cursor.fetchall()
 
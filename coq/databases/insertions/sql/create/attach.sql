@@ -0,0 +1 @@
+ATTACH DATABASE :path AS recency
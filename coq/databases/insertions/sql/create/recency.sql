@@ -0,0 +1,11 @@
+BEGIN;
+
+
+CREATE TABLE IF NOT EXISTS recency.words (
+  word  TEXT    NOT NULL PRIMARY KEY,
+  score REAL    NOT NULL,
+  clock INTEGER NOT NULL
+) WITHOUT ROWID;
+
+
+END;
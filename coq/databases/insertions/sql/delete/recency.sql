@@ -0,0 +1 @@
+DELETE FROM recency.words
@@ -0,0 +1,6 @@
+INSERT INTO recency.words ( word,  score,  clock)
+VALUES                    (:word, :score, :clock)
+ON CONFLICT (word) DO UPDATE
+SET
+  score = excluded.score,
+  clock = excluded.clock
@@ -0,0 +1,5 @@
+SELECT
+  word,
+  score,
+  clock
+FROM recency.words
@@ -0,0 +1,53 @@
+WITH recent AS (
+  SELECT
+    instances.source_id     AS source,
+    instance_stats.duration AS duration
+  FROM instance_stats
+  JOIN instances
+  ON
+    instances.rowid = instance_stats.instance_id
+  ORDER BY
+    instance_stats.rowid DESC
+  LIMIT :window
+),
+recent_view AS (
+  SELECT
+    source                                      AS source,
+    COUNT(*)                                    AS samples,
+    COALESCE(X_QUANTILES(duration, 0.95), '{}') AS q_duration
+  FROM recent
+  GROUP BY
+    source
+),
+instances_view AS (
+  SELECT
+    source_id AS source,
+    COUNT(*)  AS instances
+  FROM instances
+  GROUP BY
+    source_id
+),
+inserted_view AS (
+  SELECT
+    instances.source_id AS source,
+    COUNT(*)            AS inserted
+  FROM inserted
+  JOIN instances
+  ON
+    instances.rowid = inserted.instance_id
+  GROUP BY
+    instances.source_id
+)
+SELECT
+  sources.name                           AS source,
+  COALESCE(recent_view.samples, 0)       AS samples,
+  COALESCE(recent_view.q_duration, '{}') AS q_duration,
+  COALESCE(instances_view.instances, 0)  AS instances,
+  COALESCE(inserted_view.inserted, 0)    AS inserted
+FROM sources
+LEFT JOIN recent_view
+ON recent_view.source = sources.name
+LEFT JOIN instances_view
+ON instances_view.source = sources.name
+LEFT JOIN inserted_view
+ON inserted_view.source = sources.name
@@ -3,21 +3,18 @@ from concurrent.futures import Executor
 from os.path import normcase
 from pathlib import Path, PurePath
 from sqlite3 import Connection, OperationalError
-from threading import Lock
 from typing import AbstractSet, Iterator, Mapping, TypedDict, cast
 from uuid import uuid4
 
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
 from ...snippets.types import LoadedSnips
 from .sql import sql
 
-_SCHEMA = "v4"
+_SCHEMA = "v5"
 
 
 class _Snip(TypedDict):
@@ -41,17 +38,13 @@ def _init(db_dir: Path) -> Connection:
 class SDB:
     def __init__(self, pool: Executor, vars_dir: Path) -> None:
         db_dir = vars_dir / "clients" / "snippets"
-        self._lock = Lock()
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
         self._conn: Connection = self._ex.submit(lambda: _init(db_dir))
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
-
     async def clean(self, paths: AbstractSet[PurePath]) -> None:
         def cont() -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+            with with_transaction(self._conn.cursor()) as cursor:
                 cursor.executemany(
                     sql("delete", "source"),
                     ({"filename": normcase(path)} for path in paths),
@@ -61,7 +54,7 @@ class SDB:
 
     async def mtimes(self) -> Mapping[PurePath, float]:
         def cont() -> Mapping[PurePath, float]:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+            with with_transaction(self._conn.cursor()) as cursor:
                 cursor.execute(sql("select", "sources"), ())
                 return {
                     PurePath(row["filename"]): row["mtime"] for row in cursor.fetchall()
@@ -71,7 +64,7 @@ class SDB:
 
     async def populate(self, path: PurePath, mtime: float, loaded: LoadedSnips) -> None:
         def cont() -> None:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+            with with_transaction(self._conn.cursor()) as cursor:
                 filename, source_id = normcase(path), uuid4().bytes
                 cursor.execute(sql("delete", "source"), {"filename": filename})
                 cursor.execute(
@@ -119,9 +112,9 @@ class SDB:
     async def select(
         self, opts: MatchOptions, filetype: str, word: str, sym: str, limitless: int
     ) -> Iterator[_Snip]:
-        def cont() -> Iterator[_Snip]:
+        def cont(ticket: object) -> Iterator[_Snip]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
                     cursor.execute(
                         sql("select", "snippets"),
                         {
@@ -133,6 +126,8 @@ class SDB:
                             "sym": sym,
                             "like_word": like_esc(word[: opts.exact_matches]),
                             "like_sym": like_esc(sym[: opts.exact_matches]),
+                            **mask_params("word", word),
+                            **mask_params("sym", sym),
                         },
                     )
                     rows = cursor.fetchall()
@@ -140,10 +135,9 @@ class SDB:
             except OperationalError:
                 return iter(())
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! SNIPPETS"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
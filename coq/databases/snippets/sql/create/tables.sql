@@ -42,8 +42,10 @@ CREATE INDEX IF NOT EXISTS snippets_filetype  ON snippets (filetype);
 
 CREATE TABLE IF NOT EXISTS matches (
   snippet_id BLOB NOT NULL REFERENCES snippets (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
-  word       TEXT NOT NULL,
-  lword      TEXT NOT NULL,
+  word       TEXT    NOT NULL,
+  lword      TEXT    NOT NULL,
+  mask       INTEGER NOT NULL,
+  len        INTEGER NOT NULL,
   UNIQUE(snippet_id, word)
 );
 CREATE INDEX IF NOT EXISTS matches_snippet_id ON matches (snippet_id);
@@ -97,6 +99,8 @@ SELECT
   snippets.grammar     AS grammar,
   matches.word         AS word,
   matches.lword        AS lword,
+  matches.mask         AS mask,
+  matches.len          AS len,
   snippets.content     AS snippet,
   snippets.label       AS label,
   snippets.doc         AS doc,
@@ -1,2 +1,2 @@
-INSERT OR IGNORE INTO matches (snippet_id,  word,  lword)
-VALUES                        (:snippet_id, :word, LOWER(:word))
+INSERT OR IGNORE INTO matches (snippet_id,  word,  lword,        mask,               len)
+VALUES                        (:snippet_id, :word, LOWER(:word), X_CHAR_MASK(:word), LENGTH(:word))
@@ -5,21 +5,22 @@ from hashlib import md5
 from os.path import normcase
 from pathlib import Path, PurePath
 from sqlite3 import Connection, OperationalError
-from threading import Lock
-from typing import AbstractSet, Iterator, Mapping, cast
+from typing import AbstractSet, Iterator, Mapping, Sequence, cast
 
 from pynvim_pp.lib import encode
 from std2.asyncio import to_thread
+from std2.itertools import chunk
 from std2.sqlite3 import with_transaction
 
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
 from ...tags.types import Tag, Tags
 from .sql import sql
 
-_SCHEMA = "v5"
+_SCHEMA = "v6"
+# Files written per transaction
+_BATCH = 99
 
 _NIL_TAG = Tag(
     language="",
@@ -49,26 +50,21 @@ def _init(db_dir: Path, cwd: PurePath) -> Connection:
 
 class CTDB:
     def __init__(self, pool: Executor, vars_dir: Path, cwd: PurePath) -> None:
-        self._lock = Lock()
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
         self._vars_dir = vars_dir / "clients" / "tags"
         self._conn: Connection = self._ex.submit(lambda: _init(self._vars_dir, cwd=cwd))
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
-
     async def swap(self, cwd: PurePath) -> None:
         def cont() -> None:
-            with self._lock:
-                self._conn.close()
-                self._conn = _init(self._vars_dir, cwd=cwd)
+            self._conn.close()
+            self._conn = _init(self._vars_dir, cwd=cwd)
 
         await self._ex.asubmit(cont)
 
     async def paths(self) -> Mapping[str, float]:
         def cont() -> Mapping[str, float]:
-            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+            with with_transaction(self._conn.cursor()) as cursor:
                 cursor.execute(sql("select", "files"), ())
                 files = {row["filename"]: row["mtime"] for row in cursor.fetchall()}
                 return files
@@ -79,32 +75,43 @@ class CTDB:
         return await to_thread(step)
 
     async def reconciliate(self, dead: AbstractSet[str], new: Tags) -> None:
-        def cont() -> None:
+        def m1(batch: Sequence[str]) -> Iterator[Mapping]:
+            for filename in batch:
+                lang, mtime, _ = new[filename]
+                yield {
+                    "filename": filename,
+                    "filetype": lang,
+                    "mtime": mtime,
+                }
+
+        def m2(batch: Sequence[str]) -> Iterator[Mapping]:
+            for filename in batch:
+                _, _, tags = new[filename]
+                for tag in tags:
+                    yield {**_NIL_TAG, **tag}
+
+        def steps() -> Iterator[None]:
             with suppress(OperationalError):
                 with with_transaction(self._conn.cursor()) as cursor:
-
-                    def m1() -> Iterator[Mapping]:
-                        for filename, (lang, mtime, _) in new.items():
-                            yield {
-                                "filename": filename,
-                                "filetype": lang,
-                                "mtime": mtime,
-                            }
-
-                    def m2() -> Iterator[Mapping]:
-                        for _, _, tags in new.values():
-                            for tag in tags:
-                                yield {**_NIL_TAG, **tag}
-
                     cursor.executemany(
-                        sql("delete", "file"),
-                        ({"filename": f} for f in dead | new.keys()),
+                        sql("delete", "file"), ({"filename": f} for f in dead)
                     )
-                    cursor.executemany(sql("insert", "file"), m1())
-                    cursor.executemany(sql("insert", "tag"), m2())
+                yield
+
+                # Committed per batch, so queries can run in between
+                for batch in chunk(new.keys(), n=_BATCH):
+                    with with_transaction(self._conn.cursor()) as cursor:
+                        cursor.executemany(
+                            sql("delete", "file"), ({"filename": f} for f in batch)
+                        )
+                        cursor.executemany(sql("insert", "file"), m1(batch))
+                        cursor.executemany(sql("insert", "tag"), m2(batch))
+                    yield
+
+                with with_transaction(self._conn.cursor()) as cursor:
                     cursor.execute("PRAGMA optimize", ())
 
-        await self._ex.asubmit(cont)
+        await self._ex.asubmit_steps(steps())
 
     async def select(
         self,
@@ -115,9 +122,9 @@ class CTDB:
         sym: str,
         limitless: int,
     ) -> Iterator[Tag]:
-        def cont() -> Iterator[Tag]:
+        def cont(ticket: object) -> Iterator[Tag]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
                     cursor.execute(
                         sql("select", "tags"),
                         {
@@ -130,6 +137,8 @@ class CTDB:
                             "sym": sym,
                             "like_word": like_esc(word[: opts.exact_matches]),
                             "like_sym": like_esc(sym[: opts.exact_matches]),
+                            **mask_params("word", word),
+                            **mask_params("sym", sym),
                         },
                     )
                     rows = cursor.fetchall()
@@ -137,10 +146,9 @@ class CTDB:
             except OperationalError:
                 return iter(())
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! TAGS"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
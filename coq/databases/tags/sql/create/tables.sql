@@ -17,6 +17,8 @@ CREATE TABLE IF NOT EXISTS tags (
   kind       TEXT    NOT NULL,
   name       TEXT    NOT NULL,
   lname      TEXT    NOT NULL,
+  mask       INTEGER NOT NULL,
+  len        INTEGER NOT NULL,
   pattern    TEXT,
   typeref    TEXT,
   scope      TEXT,
@@ -1,3 +1,3 @@
-REPLACE INTO tags (`path`,             line,  name,  lname,        pattern,  kind,  typeref,  scope,  scopeKind,  `access`)
-VALUES            (X_NORM_CASE(:path), :line, :name, LOWER(:name), :pattern, :kind, :typeref, :scope, :scopeKind, :access)
+REPLACE INTO tags (`path`,             line,  name,  lname,        mask,               len,           pattern,  kind,  typeref,  scope,  scopeKind,  `access`)
+VALUES            (X_NORM_CASE(:path), :line, :name, LOWER(:name), X_CHAR_MASK(:name), LENGTH(:name), :pattern, :kind, :typeref, :scope, :scopeKind, :access)
 
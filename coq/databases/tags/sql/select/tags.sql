@@ -32,9 +32,20 @@ WHERE
       AND 
       tags.lname LIKE :like_word ESCAPE '!'
       AND 
-      LENGTH(tags.name) + :look_ahead >= LENGTH(:word)
+      tags.len + :look_ahead >= :word_len
       AND
-      tags.name <> SUBSTR(:word, 1, LENGTH(tags.name))
+      tags.name <> SUBSTR(:word, 1, tags.len)
+      AND
+      :word_len - :word_n
+      + ((tags.mask >> :word_0) & 1)
+      + ((tags.mask >> :word_1) & 1)
+      + ((tags.mask >> :word_2) & 1)
+      + ((tags.mask >> :word_3) & 1)
+      + ((tags.mask >> :word_4) & 1)
+      + ((tags.mask >> :word_5) & 1)
+      + ((tags.mask >> :word_6) & 1)
+      + ((tags.mask >> :word_7) & 1)
+      > :cut_off * MIN(:word_len, tags.len)
       AND
       X_SIMILARITY(LOWER(:word), tags.lname, :look_ahead) > :cut_off
     )
@@ -44,9 +55,20 @@ WHERE
       AND 
       tags.lname LIKE :like_sym ESCAPE '!'
       AND 
-      LENGTH(tags.name) + :look_ahead >= LENGTH(:sym)
+      tags.len + :look_ahead >= :sym_len
+      AND
+      tags.name <> SUBSTR(:sym, 1, tags.len)
       AND
-      tags.name <> SUBSTR(:sym, 1, LENGTH(tags.name))
+      :sym_len - :sym_n
+      + ((tags.mask >> :sym_0) & 1)
+      + ((tags.mask >> :sym_1) & 1)
+      + ((tags.mask >> :sym_2) & 1)
+      + ((tags.mask >> :sym_3) & 1)
+      + ((tags.mask >> :sym_4) & 1)
+      + ((tags.mask >> :sym_5) & 1)
+      + ((tags.mask >> :sym_6) & 1)
+      + ((tags.mask >> :sym_7) & 1)
+      > :cut_off * MIN(:sym_len, tags.len)
       AND
       X_SIMILARITY(LOWER(:sym), tags.lname, :look_ahead) > :cut_off
     )
@@ -6,15 +6,13 @@ from itertools import islice
 from sqlite3 import Connection, OperationalError
 from typing import AbstractSet, Iterator, Mapping, MutableMapping, Optional
 
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
 from ...consts import TMUX_DB
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
 from ...shared.parse import coalesce
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
 from ...tmux.parse import Pane
 from .sql import sql
 
@@ -56,6 +54,7 @@ class TMDB:
         include_syms: bool,
     ) -> None:
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
         self._current: Optional[Pane] = None
         self._tokenization_limit = tokenization_limit
         self._unifying_chars = unifying_chars
@@ -63,9 +62,6 @@ class TMDB:
         self._cache: MutableMapping[str, str] = {}
         self._conn: Connection = self._ex.submit(_init)
 
-    def _interrupt(self) -> None:
-        self._conn.interrupt()
-
     async def periodical(
         self, current: Optional[Pane], panes: Mapping[Pane, str]
     ) -> None:
@@ -127,9 +123,9 @@ class TMDB:
     async def select(
         self, opts: MatchOptions, word: str, sym: str, limitless: int
     ) -> Iterator[TmuxWord]:
-        def cont() -> Iterator[TmuxWord]:
+        def cont(ticket: object) -> Iterator[TmuxWord]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
                     cursor.execute(
                         sql("select", "words"),
                         {
@@ -141,6 +137,8 @@ class TMDB:
                             "sym": sym,
                             "like_word": like_esc(word[: opts.exact_matches]),
                             "like_sym": like_esc(sym[: opts.exact_matches]),
+                            **mask_params("word", word),
+                            **mask_params("sym", sym),
                         },
                     )
                     rows = cursor.fetchall()
@@ -158,10 +156,9 @@ class TMDB:
             except OperationalError:
                 return iter(())
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! TMUX"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
@@ -4,14 +4,12 @@ from contextlib import suppress
 from sqlite3 import Connection, Cursor, OperationalError
 from typing import Iterable, Iterator, Mapping
 
-from std2.asyncio import to_thread
 from std2.sqlite3 import with_transaction
 
 from ...consts import TREESITTER_DB
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Priority, SingleThreadExecutor
 from ...shared.settings import MatchOptions
-from ...shared.sql import BIGGEST_INT, init_db, like_esc
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, QueryGuard, init_db, like_esc, mask_params
 from ...treesitter.types import Payload, SimplePayload
 from .sql import sql
 
@@ -40,11 +38,9 @@ def _ensure_buffer(cursor: Cursor, buf_id: int, filetype: str, filename: str) ->
 class TDB:
     def __init__(self, pool: Executor) -> None:
         self._ex = SingleThreadExecutor(pool)
+        self._guard = QueryGuard()
         self._conn: Connection = self._ex.submit(_init)
 
-    def _interrupt(self) -> None:
-        self._conn.interrupt()
-
     async def vacuum(self, live_bufs: Mapping[int, int]) -> None:
         def cont() -> None:
             with suppress(OperationalError):
@@ -113,9 +109,9 @@ class TDB:
         sym: str,
         limitless: int,
     ) -> Iterator[Payload]:
-        def cont() -> Iterator[Payload]:
+        def cont(ticket: object) -> Iterator[Payload]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with self._guard.transaction(self._conn, ticket=ticket) as cursor:
                     cursor.execute(
                         sql("select", "words"),
                         {
@@ -127,6 +123,8 @@ class TDB:
                             "sym": sym,
                             "like_word": like_esc(word[: opts.exact_matches]),
                             "like_sym": like_esc(sym[: opts.exact_matches]),
+                            **mask_params("word", word),
+                            **mask_params("sym", sym),
                         },
                     )
                     rows = cursor.fetchall()
@@ -157,10 +155,9 @@ class TDB:
             except OperationalError:
                 return iter(())
 
-        await to_thread(self._interrupt)
+        ticket = self._guard.begin()
         try:
-            return await self._ex.asubmit(cont)
+            return await self._ex.asubmit(cont, ticket, priority=Priority.read)
         except CancelledError:
-            with timeit("INTERRUPT !! TREESITTER"):
-                await to_thread(self._interrupt)
+            self._guard.cancel(ticket)
             raise
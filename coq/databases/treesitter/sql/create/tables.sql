@@ -29,27 +29,46 @@ CREATE INDEX IF NOT EXISTS words_buffer_lo ON words (buffer_id, lo);
 CREATE INDEX IF NOT EXISTS words_buffer_hi ON words (buffer_id, hi);
 
 
-CREATE VIEW IF NOT EXISTS words_view AS
-SELECT
-  buffers.filetype,
-  buffers.filename,
-  words.word,
-  words.lword,
-  words.lo + 1 AS lo,
-  words.hi + 1 AS hi,
-  words.kind,
-  words.pword,
-  words.pkind,
-  words.gpword,
-  words.gpkind
-FROM buffers
-JOIN words 
-ON
-  words.buffer_id = buffers.rowid
-GROUP BY
-  words.word
-HAVING
-  words.word <> '';
+-- Distinct words, reference counted by the triggers below
+CREATE TABLE IF NOT EXISTS uniq_words (
+  word  TEXT    NOT NULL PRIMARY KEY,
+  lword TEXT    NOT NULL,
+  mask  INTEGER NOT NULL,
+  len   INTEGER NOT NULL,
+  refs  INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS uniq_words_lword ON uniq_words (lword);
+
+
+CREATE TRIGGER IF NOT EXISTS words_insert AFTER INSERT ON words
+WHEN
+  NEW.word <> ''
+BEGIN
+  INSERT OR IGNORE INTO uniq_words (word, lword, mask, len, refs)
+  VALUES (NEW.word, NEW.lword, X_CHAR_MASK(NEW.word), LENGTH(NEW.word), 0);
+  UPDATE uniq_words
+  SET
+    refs = refs + 1
+  WHERE
+    word = NEW.word;
+END;
+
+
+CREATE TRIGGER IF NOT EXISTS words_delete AFTER DELETE ON words
+WHEN
+  OLD.word <> ''
+BEGIN
+  UPDATE uniq_words
+  SET
+    refs = refs - 1
+  WHERE
+    word = OLD.word;
+  DELETE FROM uniq_words
+  WHERE
+    word = OLD.word
+    AND
+    refs <= 0;
+END;
 
 
 END;
@@ -1,40 +1,73 @@
-SELECT DISTINCT
-  word,
-  lo,
-  hi,
-  kind,
-  pword,
-  pkind,
-  gpword,
-  gpkind,
-  filename
-FROM words_view
+SELECT
+  words.word,
+  words.lo + 1 AS lo,
+  words.hi + 1 AS hi,
+  words.kind,
+  words.pword,
+  words.pkind,
+  words.gpword,
+  words.gpkind,
+  buffers.filename
+FROM uniq_words
+JOIN words
+  ON words.rowid = (
+    SELECT
+      words.rowid
+    FROM words
+    JOIN buffers
+      ON buffers.rowid = words.buffer_id
+    WHERE
+      words.word = uniq_words.word
+      AND
+      buffers.filetype = :filetype
+    LIMIT 1
+  )
+JOIN buffers
+  ON buffers.rowid = words.buffer_id
 WHERE
-  filetype = :filetype
-  AND
   (
-    (
-      :word <> ''
-      AND 
-      lword LIKE :like_word ESCAPE '!'
-      AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:word)
-      AND
-      word <> SUBSTR(:word, 1, LENGTH(word))
-      AND
-      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
-    )
-    OR
-    (
-      :sym <> ''
-      AND 
-      lword LIKE :like_sym ESCAPE '!'
-      AND 
-      LENGTH(word) + :look_ahead >= LENGTH(:sym)
-      AND
-      word <> SUBSTR(:sym, 1, LENGTH(word))
-      AND
-      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
-    )
+    :word <> ''
+    AND 
+    uniq_words.lword LIKE :like_word ESCAPE '!'
+    AND 
+    uniq_words.len + :look_ahead >= :word_len
+    AND
+    uniq_words.word <> SUBSTR(:word, 1, uniq_words.len)
+    AND
+    :word_len - :word_n
+    + ((uniq_words.mask >> :word_0) & 1)
+    + ((uniq_words.mask >> :word_1) & 1)
+    + ((uniq_words.mask >> :word_2) & 1)
+    + ((uniq_words.mask >> :word_3) & 1)
+    + ((uniq_words.mask >> :word_4) & 1)
+    + ((uniq_words.mask >> :word_5) & 1)
+    + ((uniq_words.mask >> :word_6) & 1)
+    + ((uniq_words.mask >> :word_7) & 1)
+    > :cut_off * MIN(:word_len, uniq_words.len)
+    AND
+    X_SIMILARITY(LOWER(:word), uniq_words.lword, :look_ahead) > :cut_off
+  )
+  OR
+  (
+    :sym <> ''
+    AND 
+    uniq_words.lword LIKE :like_sym ESCAPE '!'
+    AND 
+    uniq_words.len + :look_ahead >= :sym_len
+    AND
+    uniq_words.word <> SUBSTR(:sym, 1, uniq_words.len)
+    AND
+    :sym_len - :sym_n
+    + ((uniq_words.mask >> :sym_0) & 1)
+    + ((uniq_words.mask >> :sym_1) & 1)
+    + ((uniq_words.mask >> :sym_2) & 1)
+    + ((uniq_words.mask >> :sym_3) & 1)
+    + ((uniq_words.mask >> :sym_4) & 1)
+    + ((uniq_words.mask >> :sym_5) & 1)
+    + ((uniq_words.mask >> :sym_6) & 1)
+    + ((uniq_words.mask >> :sym_7) & 1)
+    > :cut_off * MIN(:sym_len, uniq_words.len)
+    AND
+    X_SIMILARITY(LOWER(:sym), uniq_words.lword, :look_ahead) > :cut_off
   )
 LIMIT :limit
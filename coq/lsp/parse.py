@@ -1,12 +1,15 @@
 from dataclasses import asdict
+from functools import lru_cache, partial
 from random import shuffle
 from typing import (
     AbstractSet,
     Any,
+    Iterator,
     Mapping,
     MutableMapping,
     MutableSequence,
     Optional,
+    Tuple,
     Type,
     Union,
 )
@@ -32,6 +35,7 @@ from .types import (
     CompletionResponse,
     InsertReplaceEdit,
     ItemDefaults,
+    LazyComp,
     LSPcomp,
     MarkupContent,
     TextEdit,
@@ -177,6 +181,96 @@ def parse_item(
             return comp
 
 
+def _peek(item: Any) -> Optional[Tuple[str, Edit, Edit]]:
+    """
+    `sort_by` and stand ins for `primary_edit`, read without decoding `item`
+
+    Mirrors `_primary`, `sanitize`, and the `sort_by` of `parse_item`
+    """
+
+    if not isinstance(item, Mapping):
+        return None
+    else:
+        label = item.get("label")
+        filter_text = item.get("filterText")
+        insert_text = item.get("insertText")
+        text_edit = item.get("textEdit")
+        new_text = (
+            text_edit.get("newText") if isinstance(text_edit, Mapping) else None
+        )
+
+        if not isinstance(label, str):
+            return None
+        elif not isinstance(filter_text, (str, type(None))):
+            return None
+        elif not isinstance(insert_text, (str, type(None))):
+            return None
+        elif not isinstance(new_text, (str, type(None))):
+            return None
+        else:
+            fallback = insert_text or label
+            fmt = PROTOCOL.InsertTextFormat.get(item.get("insertTextFormat"))
+            if fmt == "Snippet":
+                edit: Edit = SnippetEdit(
+                    grammar=SnippetGrammar.lsp, new_text=new_text or fallback
+                )
+                cached = (
+                    Edit(new_text=insert_text)
+                    if new_text is not None
+                    and insert_text
+                    and insert_text != new_text
+                    else edit
+                )
+                return filter_text or label, edit, cached
+            else:
+                edit = Edit(new_text=fallback if new_text is None else new_text)
+                cached = Edit(new_text=fallback)
+                return filter_text or edit.new_text, edit, cached
+
+
+def _lazy(
+    extern_type: Union[Type[ExternLSP], Type[ExternLUA]],
+    always_on_top: Optional[AbstractSet[Optional[str]]],
+    client: Optional[str],
+    short_name: str,
+    weight_adjust: float,
+    defaults: ItemDefaults,
+    items: MutableSequence[Any],
+) -> Iterator[Union[Completion, LazyComp]]:
+    """
+    Items are only decoded by `LazyComp.parse`, once they survive filtering
+
+    `LazyComp.parse` is memoized, so items keep their `uid`s across cache polls
+
+    Items that cannot be peeked at are decoded eagerly, to log why
+    """
+
+    for item in items:
+        if item:
+            item = _with_defaults(defaults, item=item)
+            decode = lru_cache(maxsize=None)(
+                partial(
+                    parse_item,
+                    extern_type,
+                    always_on_top=always_on_top,
+                    client=client,
+                    short_name=short_name,
+                    weight_adjust=weight_adjust,
+                    item=item,
+                )
+            )
+            if peeked := _peek(item):
+                sort_by, edit, cached = peeked
+                yield LazyComp(
+                    sort_by=sort_by,
+                    primary_edit=edit,
+                    cached_edit=cached,
+                    parse=decode,
+                )
+            elif comp := decode():
+                yield comp
+
+
 def parse(
     extern_type: Union[Type[ExternLSP], Type[ExternLUA]],
     always_on_top: Optional[AbstractSet[Optional[str]]],
@@ -201,19 +295,14 @@ def parse(
             defaults = _defaults_parser(resp.get("itemDefaults")) or ItemDefaults()
             shuffle(items)
             length = len(items)
-            comps = (
-                co1
-                for item in items
-                if (
-                    co1 := parse_item(
-                        extern_type,
-                        client=client,
-                        always_on_top=always_on_top,
-                        short_name=short_name,
-                        weight_adjust=weight_adjust,
-                        item=_with_defaults(defaults, item=item),
-                    )
-                )
+            comps = _lazy(
+                extern_type,
+                always_on_top=always_on_top,
+                client=client,
+                short_name=short_name,
+                weight_adjust=weight_adjust,
+                defaults=defaults,
+                items=items,
             )
 
             return LSPcomp(
@@ -224,19 +313,14 @@ def parse(
         defaults = ItemDefaults()
         shuffle(resp)
         length = len(resp)
-        comps = (
-            co2
-            for item in resp
-            if (
-                co2 := parse_item(
-                    extern_type,
-                    always_on_top=always_on_top,
-                    client=client,
-                    short_name=short_name,
-                    weight_adjust=weight_adjust,
-                    item=_with_defaults(defaults, item=item),
-                )
-            )
+        comps = _lazy(
+            extern_type,
+            always_on_top=always_on_top,
+            client=client,
+            short_name=short_name,
+            weight_adjust=weight_adjust,
+            defaults=defaults,
+            items=resp,
         )
 
         return LSPcomp(client=client, local_cache=True, items=comps, length=length)
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import (
     AbstractSet,
     Any,
+    Callable,
     Iterator,
     Literal,
     Optional,
@@ -10,7 +11,7 @@ from typing import (
     Union,
 )
 
-from ..shared.types import Completion
+from ..shared.types import Completion, Edit
 
 # https://microsoft.github.io/language-server-protocol/specification
 
@@ -120,9 +121,25 @@ CompletionResponse = Union[
 ]
 
 
+@dataclass(frozen=True)
+class LazyComp:
+    """
+    Enough of an undecoded item to prefilter it
+
+    The edits stand in for its `primary_edit`, before and after `sanitize`
+
+    Only their types and `new_text` are meaningful
+    """
+
+    sort_by: str
+    primary_edit: Edit
+    cached_edit: Edit
+    parse: Callable[[], Optional[Completion]]
+
+
 @dataclass(frozen=True)
 class LSPcomp:
     client: Optional[str]
     local_cache: bool
-    items: Iterator[Completion]
+    items: Iterator[Union[Completion, LazyComp]]
     length: int
@@ -1,5 +1,5 @@
 (function(...)
-  COQ.send_comp = function(col, items)
+  COQ.send_comp = function(col, items, update)
     vim.schedule(
       function()
         local legal_modes = {
@@ -14,8 +14,11 @@
           ["ctrl_x"] = true
         }
         local mode = vim.api.nvim_get_mode().mode
-        local comp_mode = vim.fn.complete_info({"mode"}).mode
-        if legal_modes[mode] and legal_cmodes[comp_mode] then
+        local info = vim.fn.complete_info({"mode", "selected"})
+        local comp_mode = info.mode
+        -- updates must not move the selection from under the user
+        local selecting = update and info.selected ~= -1
+        if legal_modes[mode] and legal_cmodes[comp_mode] and not selecting then
           -- when `#items ~= 0` there is something to show
           -- when `#items == 0` but `comp_mode == "eval"` there is something to close
           if #items ~= 0 or comp_mode == "eval" then
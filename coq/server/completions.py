@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable, MutableSequence, Tuple
-from uuid import UUID
 
 from pynvim import Nvim
 from std2.pickle.encoder import new_encoder
@@ -16,9 +15,18 @@ _LUA = (Path(__file__).resolve(strict=True).parent / "completion.lua").read_text
 atomic.exec_lua(_LUA, ())
 
 
+@dataclass(frozen=True)
+class UserData:
+    """
+    Namespaced, so that other plugins' `user_data` never decodes into a uid
+    """
+
+    coq: int
+
+
 @dataclass(frozen=True)
 class VimCompletion:
-    user_data: UUID
+    user_data: UserData
     abbr: str
     menu: str
     kind: str = ""
@@ -32,9 +40,20 @@ _ENCODER = new_encoder[VimCompletion](VimCompletion)
 
 
 def complete(
-    nvim: Nvim, stack: Stack, col: int, comps: Iterable[Tuple[Metric, VimCompletion]]
+    nvim: Nvim,
+    stack: Stack,
+    col: int,
+    comps: Iterable[Tuple[Metric, VimCompletion]],
+    update: bool = False,
 ) -> None:
-    stack.metrics.clear()
+    """
+    `update`s may be dropped by `send_comp` while an item is selected
+
+    Their metrics are merged, so the selected item can still be accepted
+    """
+
+    if not update:
+        stack.metrics.clear()
 
     acc: MutableSequence[Any] = []
     for metric, comp in comps:
@@ -42,4 +61,4 @@ def complete(
         encoded = _ENCODER(comp)
         acc.append(encoded)
 
-    nvim.api.exec_lua(f"{NAMESPACE}.send_comp(...)", (col + 1, acc))
+    nvim.api.exec_lua(f"{NAMESPACE}.send_comp(...)", (col + 1, acc, update))
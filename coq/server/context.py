@@ -10,17 +10,25 @@ from pynvim_pp.text_object import gen_split
 
 from ..shared.parse import lower
 from ..shared.settings import MatchOptions
+from ..shared.shadow import Shadows
 from ..shared.types import Context
 from .state import State
 
 
-def context(nvim: Nvim, options: MatchOptions, state: State, manual: bool) -> Context:
+def context(
+    nvim: Nvim, options: MatchOptions, shadows: Shadows, state: State, manual: bool
+) -> Context:
+    """
+    Lines are read from `shadows` when in sync, saving a round trip
+    """
+
     with Atomic() as (atomic, ns):
         ns.scr_col = atomic.call_function("screencol", ())
         ns.win_height = atomic.win_get_height(0)
         ns.buf = atomic.get_current_buf()
         ns.name = atomic.buf_get_name(0)
         ns.line_count = atomic.buf_line_count(0)
+        ns.tick = atomic.buf_get_changedtick(0)
         ns.filetype = atomic.buf_get_option(0, "filetype")
         ns.commentstring = atomic.buf_get_option(0, "commentstring")
         ns.fileformat = atomic.buf_get_option(0, "fileformat")
@@ -45,7 +53,10 @@ def context(nvim: Nvim, options: MatchOptions, state: State, manual: bool) -> Co
 
     lo = max(0, row - win_size)
     hi = min(buf_line_count, row + win_size + 1)
-    lines = buf_get_lines(nvim, buf=buf, lo=lo, hi=hi)
+    shadowed = shadows.lines(buf.number, tick=cast(int, ns.tick), lo=lo, hi=hi)
+    lines = (
+        buf_get_lines(nvim, buf=buf, lo=lo, hi=hi) if shadowed is None else shadowed
+    )
 
     r = row - lo
     line = lines[r]
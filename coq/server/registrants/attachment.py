@@ -37,7 +37,8 @@ def _buf_enter(nvim: Nvim, stack: Stack) -> None:
         buf_type: str = buf_get_option(nvim, buf=buf, key="buftype")
 
         if listed and buf_type != "terminal":
-            if nvim.api.buf_attach(buf, False, {}):
+            # The whole buffer is sent once, to seed `Shadows`
+            if nvim.api.buf_attach(buf, True, {}):
                 for worker in stack.workers:
                     if isinstance(worker, BufWorker):
                         filetype = buf_filetype(nvim, buf=buf)
@@ -99,6 +100,9 @@ def _lines_event(
 ) -> None:
     global _TASK
 
+    stack.supervisor.shadows.lines_event(
+        buf.number, tick=change_tick, lo=lo, hi=hi, lines=lines, pending=pending
+    )
     task = _TASK
 
     async def cont() -> None:
@@ -131,10 +135,21 @@ def _lines_event(
             ):
                 await comp_func(nvim, stack=stack, s=s, manual=False)
 
-    if change_tick is not None:
+    # `hi == -1` is the whole buffer on attach, not an edit
+    if change_tick is not None and hi != -1:
         _TASK = cast(Task, go(nvim, aw=cont()))
 
 
+def _changedtick_event(nvim: Nvim, stack: Stack, buf: Buffer, change_tick: int) -> None:
+    stack.supervisor.shadows.changedtick_event(buf.number, tick=change_tick)
+
+
+def _detach_event(nvim: Nvim, stack: Stack, buf: Buffer) -> None:
+    stack.supervisor.shadows.detach_event(buf.number)
+
+
 BUF_EVENTS = {
     "nvim_buf_lines_event": _lines_event,
+    "nvim_buf_changedtick_event": _changedtick_event,
+    "nvim_buf_detach_event": _detach_event,
 }
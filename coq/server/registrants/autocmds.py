@@ -44,7 +44,7 @@ def _new_cwd(nvim: Nvim, stack: Stack) -> None:
     async def cont() -> None:
         s = state(cwd=cwd)
         for worker in stack.workers:
-            if isinstance(worker, TagsWorker):
+            if isinstance(worker, (BufWorker, TagsWorker)):
                 await worker.swap(s.cwd)
 
     go(nvim, aw=cont())
@@ -122,6 +122,7 @@ def _when_idle(nvim: Nvim, stack: Stack) -> None:
 
         _insert_enter(nvim, stack=stack)
         stack.supervisor.notify_idle()
+        go(nvim, aw=stack.idb.flush())
 
     assert isinstance(nvim.loop, AbstractEventLoop)
     _HANDLE = nvim.loop.call_later(
@@ -1,7 +1,7 @@
 from asyncio import gather, sleep, wait
 from dataclasses import replace
-from typing import AbstractSet, Any, Literal, Mapping, Sequence, Union
-from uuid import UUID, uuid4
+from typing import AbstractSet, Any, Literal, Mapping, Optional, Sequence, Union
+from uuid import uuid4
 
 from pynvim import Nvim
 from pynvim.api.nvim import Nvim
@@ -25,12 +25,12 @@ from ...registry import NAMESPACE, autocmd, rpc
 from ...shared.runtime import Metric
 from ...shared.timeit import timeit
 from ...shared.types import Context, ExternLSP, ExternPath
-from ..completions import complete
+from ..completions import UserData, complete
 from ..context import context
 from ..edit import NS, edit
 from ..rt_types import Stack
 from ..state import State, state
-from ..trans import trans
+from ..trans import Ranking, present, rank
 
 
 def _should_cont(
@@ -64,6 +64,7 @@ async def comp_func(nvim: Nvim, stack: Stack, s: State, manual: bool) -> None:
             lambda: context(
                 nvim,
                 options=stack.settings.match,
+                shadows=stack.supervisor.shadows,
                 state=s,
                 manual=manual,
             ),
@@ -82,8 +83,34 @@ async def comp_func(nvim: Nvim, stack: Stack, s: State, manual: bool) -> None:
 
         if should:
             state(context=ctx)
+            ranking: Optional[Ranking] = None
+            shown = 0
+
+            async def show(metrics: Sequence[Metric]) -> None:
+                nonlocal ranking, shown
+                s = state()
+                if s.change_id == ctx.change_id:
+                    update = ranking is not None
+                    ranking = rank(stack, context=ctx, metrics=metrics, prev=ranking)
+                    shown += len(metrics)
+                    vim_comps = tuple(
+                        present(
+                            stack,
+                            pum_width=s.pum_width,
+                            context=ctx,
+                            ranking=ranking,
+                        )
+                    )
+                    await async_call(
+                        nvim,
+                        lambda: complete(
+                            nvim, stack=stack, col=col, comps=vim_comps, update=update
+                        ),
+                    )
+
+            progressive = stack.settings.display.pum.progressive
             metrics, _ = await gather(
-                stack.supervisor.collect(ctx),
+                stack.supervisor.collect(ctx, progress=show if progressive else None),
                 async_call(
                     nvim,
                     lambda: complete(nvim, stack=stack, col=col, comps=()),
@@ -91,20 +118,8 @@ async def comp_func(nvim: Nvim, stack: Stack, s: State, manual: bool) -> None:
                 if stack.settings.display.pum.fast_close
                 else sleep(0),
             )
-            s = state()
-            if s.change_id == ctx.change_id:
-                vim_comps = tuple(
-                    trans(
-                        stack,
-                        pum_width=s.pum_width,
-                        context=ctx,
-                        metrics=metrics,
-                    )
-                )
-                await async_call(
-                    nvim,
-                    lambda: complete(nvim, stack=stack, col=col, comps=vim_comps),
-                )
+            if not ranking or len(metrics) > shown:
+                await show(metrics[shown:])
         else:
             await async_call(
                 nvim, lambda: complete(nvim, stack=stack, col=col, comps=())
@@ -149,7 +164,7 @@ async def _resolve(nvim: Nvim, stack: Stack, metric: Metric) -> Metric:
                 )
 
 
-_UDECODER = new_decoder[UUID](UUID)
+_UDECODER = new_decoder[UserData](UserData)
 
 
 @rpc(blocking=True)
@@ -157,7 +172,7 @@ def _comp_done(nvim: Nvim, stack: Stack, event: Mapping[str, Any]) -> None:
     data = event.get("user_data")
     if data:
         try:
-            uid = _UDECODER(data)
+            uid = _UDECODER(data).coq
         except DecodeError:
             pass
         else:
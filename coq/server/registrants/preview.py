@@ -15,7 +15,7 @@ from typing import (
     Union,
     cast,
 )
-from uuid import UUID, uuid4
+from uuid import uuid4
 
 from pynvim import Nvim
 from pynvim.api import Buffer, Window
@@ -52,7 +52,16 @@ from ...registry import NAMESPACE, autocmd, rpc
 from ...shared.settings import GhostText, PreviewDisplay
 from ...shared.timeit import timeit
 from ...shared.trans import expand_tabs
-from ...shared.types import Completion, Context, Doc, Edit, ExternLSP, ExternPath
+from ...shared.types import (
+    Completion,
+    Context,
+    Doc,
+    Edit,
+    ExternLSP,
+    ExternPath,
+    new_uid,
+)
+from ..completions import UserData
 from ..rt_types import Stack
 from ..state import State, state
 
@@ -88,7 +97,7 @@ def _ls(nvim: Nvim) -> Iterator[Window]:
 @rpc(blocking=True)
 def _kill_win(nvim: Nvim, stack: Stack, reset: bool) -> None:
     if reset:
-        state(pum_location=None, preview_id=uuid4())
+        state(pum_location=None, preview_id=new_uid())
 
     buf = cur_buf(nvim)
     ns = create_ns(nvim, ns=_NS)
@@ -213,12 +222,12 @@ def _set_win(nvim: Nvim, display: PreviewDisplay, buf: Buffer, pos: _Pos) -> Non
 def _go_show(
     nvim: Nvim,
     stack: Stack,
-    preview_id: str,
+    preview_id: int,
     syntax: str,
     preview: Sequence[str],
     _pos: Mapping[str, int],
 ) -> None:
-    if preview_id == state().preview_id.hex:
+    if preview_id == state().preview_id:
         pos = _Pos(**_pos)
         buf = create_buf(
             nvim, listed=False, scratch=True, wipe=True, nofile=True, noswap=True
@@ -228,7 +237,7 @@ def _go_show(
 
 
 def _show_preview(
-    nvim: Nvim, stack: Stack, event: _Event, doc: Doc, s: State, preview_id: UUID
+    nvim: Nvim, stack: Stack, event: _Event, doc: Doc, s: State, preview_id: int
 ) -> None:
     new_doc = _preprocess(s.context, doc=doc)
     text = expand_tabs(s.context, text=new_doc.text)
@@ -245,7 +254,7 @@ def _show_preview(
         state(pum_location=pum_location)
         nvim.api.exec_lua(
             f"{NAMESPACE}.{_go_show.name}(...)",
-            (preview_id.hex, new_doc.syntax, lines, asdict(pos)),
+            (preview_id, new_doc.syntax, lines, asdict(pos)),
         )
 
 
@@ -341,7 +350,7 @@ def _virt_text(nvim: Nvim, ghost: GhostText, text: str) -> None:
 
 
 _DECODER = new_decoder[_Event](_Event)
-_UDECODER = new_decoder[UUID](UUID)
+_UDECODER = new_decoder[UserData](UserData)
 
 
 @rpc(blocking=True, schedule=True)
@@ -351,7 +360,7 @@ def _cmp_changed(nvim: Nvim, stack: Stack, event: Mapping[str, Any] = {}) -> Non
         try:
             ev = _DECODER(event)
             user_data = ev.completed_item.get("user_data", "")
-            uid = _UDECODER(user_data)
+            uid = _UDECODER(user_data).coq
         except DecodeError:
             pass
         else:
@@ -25,7 +25,13 @@ def _edit(prev: Edit) -> Edit:
 
 @rpc(blocking=True)
 def repeat(nvim: Nvim, stack: Stack) -> None:
-    ctx = context(nvim, options=stack.settings.match, state=state(), manual=True)
+    ctx = context(
+        nvim,
+        options=stack.settings.match,
+        shadows=stack.supervisor.shadows,
+        state=state(),
+        manual=True,
+    )
     s = state(context=ctx)
     metric = s.last_edit
     sanitized = _edit(metric.comp.primary_edit)
@@ -1,41 +1,119 @@
 from collections import Counter
 from dataclasses import dataclass
-from itertools import chain
-from typing import Mapping
+from typing import (
+    AbstractSet,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
 from pynvim_pp.lib import display_width
 
-from ..databases.insertions.database import IDB
+from ..databases.insertions.database import IDB, Timing
 from ..shared.context import cword_before
-from ..shared.fuzzy import MatchMetrics, metrics
+from ..shared.fuzzy import MatchMetrics, batch_metrics
 from ..shared.parse import coalesce, lower
-from ..shared.runtime import Metric, PReviewer
-from ..shared.settings import BaseClient, Icons, MatchOptions, Weights
+from ..shared.runtime import Metric, PReviewer, RawWeights
+from ..shared.settings import BaseClient, Icons, MatchOptions
 from ..shared.types import Completion, Context
 from .icons import iconify
 
 
+# Requests sampled for latencies, and the least evidence acted on
+_WINDOW = 999
+_MIN_SAMPLES = 9
+_MIN_INSERTED = 9
+# Sources below this share of insertions are rarely chosen
+_MIN_SHARE = 0.05
+# Headroom over the p95 of rarely chosen sources
+_SLACK = 1.5
+
+
 @dataclass(frozen=True)
 class ReviewCtx:
     batch: UUID
     context: Context
     proximity: Mapping[str, int]
-    inserted: Mapping[str, int]
+    inserted: Mapping[str, float]
 
     is_lower: bool
 
 
-def _metric(
+def _metrics(
     options: MatchOptions,
     ctx: ReviewCtx,
-    completion: Completion,
-) -> MatchMetrics:
-    match = lower(completion.sort_by) if ctx.is_lower else completion.sort_by
-    cword = cword_before(
-        options.unifying_chars, lower=ctx.is_lower, context=ctx.context, sort_by=match
-    )
-    return metrics(cword, match, look_ahead=options.look_ahead)
+    completions: Sequence[Completion],
+) -> Sequence[MatchMetrics]:
+    """
+    Completions sharing a `cword` are scored as one batch
+    """
+
+    groups: MutableMapping[str, MutableSequence[Tuple[int, str]]] = {}
+    for idx, completion in enumerate(completions):
+        match = lower(completion.sort_by) if ctx.is_lower else completion.sort_by
+        cword = cword_before(
+            options.unifying_chars,
+            lower=ctx.is_lower,
+            context=ctx.context,
+            sort_by=match,
+        )
+        groups.setdefault(cword, []).append((idx, match))
+
+    acc: MutableMapping[int, MatchMetrics] = {}
+    for cword, group in groups.items():
+        idxs, matches = zip(*group)
+        scored = batch_metrics(cword, matches, look_ahead=options.look_ahead)
+        acc.update(zip(idxs, scored))
+
+    return tuple(acc[idx] for idx in range(len(completions)))
+
+
+class Proximity:
+    """
+    Word counts over the window, updated by the lines entering and leaving it
+
+    Lines are diffed by content, so only new or edited lines are tokenized
+    """
+
+    def __init__(self, unifying_chars: AbstractSet[str]) -> None:
+        self._unifying_chars = unifying_chars
+        self._lines: Mapping[str, int] = {}
+        self._tokens: Mapping[str, Mapping[str, int]] = {}
+        self._words: MutableMapping[str, int] = {}
+
+    def _shift(self, tokens: Mapping[str, int], n: int) -> None:
+        for word, count in tokens.items():
+            if total := self._words.get(word, 0) + count * n:
+                self._words[word] = total
+            else:
+                del self._words[word]
+
+    def update(self, lines: Sequence[str]) -> Mapping[str, int]:
+        counts = Counter(lines)
+        tokens = {
+            line: self._tokens[line]
+            if line in self._tokens
+            else Counter(
+                coalesce(
+                    line, unifying_chars=self._unifying_chars, include_syms=True
+                )
+            )
+            for line in counts
+        }
+
+        for line, count in self._lines.items():
+            if (n := count - counts.get(line, 0)) > 0:
+                self._shift(self._tokens[line], n=-n)
+        for line, count in counts.items():
+            if (n := count - self._lines.get(line, 0)) > 0:
+                self._shift(tokens[line], n=n)
+
+        self._lines, self._tokens = counts, tokens
+        return {**self._words}
 
 
 def sigmoid(x: float) -> float:
@@ -46,13 +124,32 @@ def sigmoid(x: float) -> float:
     return x / (1 + abs(x)) / 2 + 1
 
 
+def budget(timeout: float, inserted: int, timing: Timing) -> float:
+    """
+    Seconds to wait on a source, `0` for not at all
+
+    Rarely chosen sources are waited on only as long as they are usually fast
+    """
+
+    if (
+        timing.samples < _MIN_SAMPLES
+        or inserted < _MIN_INSERTED
+        or timing.inserted / inserted >= _MIN_SHARE
+    ):
+        return timeout
+    elif timing.q95_duration > timeout:
+        return 0
+    else:
+        return min(timeout, timing.q95_duration * _SLACK)
+
+
 def _join(
     ctx: ReviewCtx,
     instance: UUID,
     completion: Completion,
     match_metrics: MatchMetrics,
 ) -> Metric:
-    weight = Weights(
+    weight = RawWeights(
         prefix_matches=match_metrics.prefix_matches,
         edit_distance=match_metrics.edit_distance,
         recency=ctx.inserted.get(completion.sort_by, 0),
@@ -77,21 +174,22 @@ def _join(
 class Reviewer(PReviewer[ReviewCtx]):
     def __init__(self, options: MatchOptions, icons: Icons, db: IDB) -> None:
         self._options, self._icons, self._db = options, icons, db
+        self._proximity = Proximity(options.unifying_chars)
 
     def register(self, assoc: BaseClient) -> None:
         self._db.new_source(assoc.short_name)
 
+    async def budgets(self, timeout: float) -> Mapping[str, float]:
+        timings = await self._db.timings(window=_WINDOW)
+        inserted = sum(timing.inserted for timing in timings)
+        return {
+            timing.source: budget(timeout, inserted=inserted, timing=timing)
+            for timing in timings
+        }
+
     async def begin(self, context: Context) -> ReviewCtx:
-        inserted = await self._db.insertion_order(n_rows=100)
-        words = chain.from_iterable(
-            coalesce(
-                line,
-                unifying_chars=self._options.unifying_chars,
-                include_syms=True,
-            )
-            for line in context.lines
-        )
-        proximity = Counter(words)
+        inserted = self._db.recency()
+        proximity = self._proximity.update(context.lines)
 
         ctx = ReviewCtx(
             batch=uuid4(),
@@ -100,34 +198,38 @@ class Reviewer(PReviewer[ReviewCtx]):
             inserted=inserted,
             is_lower=context.is_lower,
         )
-        await self._db.new_batch(ctx.batch.bytes)
+        self._db.new_batch(ctx.batch.bytes)
         return ctx
 
     async def s_begin(
         self, token: ReviewCtx, assoc: BaseClient, instance: UUID
     ) -> None:
-        await self._db.new_instance(
+        self._db.new_instance(
             instance.bytes, source=assoc.short_name, batch_id=token.batch.bytes
         )
 
-    def trans(self, token: ReviewCtx, instance: UUID, completion: Completion) -> Metric:
-        new_completion = iconify(self._icons, completion=completion)
-        match_metrics = _metric(
+    def trans(
+        self, token: ReviewCtx, instance: UUID, completions: Sequence[Completion]
+    ) -> Iterator[Metric]:
+        new_completions = tuple(
+            iconify(self._icons, completion=completion) for completion in completions
+        )
+        match_metrics = _metrics(
             self._options,
             ctx=token,
-            completion=new_completion,
-        )
-        metric = _join(
-            token,
-            instance=instance,
-            completion=new_completion,
-            match_metrics=match_metrics,
+            completions=new_completions,
         )
-        return metric
+        for completion, metrics in zip(new_completions, match_metrics):
+            yield _join(
+                token,
+                instance=instance,
+                completion=completion,
+                match_metrics=metrics,
+            )
 
     async def s_end(
         self, instance: UUID, interrupted: bool, elapsed: float, items: int
     ) -> None:
-        await self._db.new_stat(
+        self._db.new_stat(
             instance.bytes, interrupted=interrupted, duration=elapsed, items=items
         )
@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from typing import AbstractSet, MutableMapping
-from uuid import UUID
 
 from ..databases.insertions.database import IDB
 from ..shared.runtime import Metric, Supervisor, Worker
@@ -15,8 +14,8 @@ class ValidationError(Exception):
 @dataclass(frozen=True)
 class Stack:
     settings: Settings
-    lru: MutableMapping[UUID, Completion]
-    metrics: MutableMapping[UUID, Metric]
+    lru: MutableMapping[int, Completion]
+    metrics: MutableMapping[int, Metric]
     idb: IDB
     supervisor: Supervisor
     workers: AbstractSet[Worker]
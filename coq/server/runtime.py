@@ -20,6 +20,7 @@ from ..clients.third_party.worker import Worker as ThirdPartyWorker
 from ..clients.tmux.worker import Worker as TmuxWorker
 from ..clients.tree_sitter.worker import Worker as TreeWorker
 from ..consts import CONFIG_YML, SETTINGS_VAR, VARS
+from ..databases.bank.database import WBDB
 from ..databases.buffers.database import BDB
 from ..databases.insertions.database import IDB
 from ..databases.snippets.database import SDB
@@ -73,7 +74,12 @@ def _from_each_according_to_their_ability(
             unifying_chars=settings.match.unifying_chars,
             include_syms=settings.clients.buffers.match_syms,
         )
-        yield BuffersWorker(supervisor, options=clients.buffers, misc=bdb)
+        wbdb = (
+            WBDB(pool, vars_dir=vars_dir, cwd=cwd)
+            if clients.buffers.persistent or clients.buffers.index_project
+            else None
+        )
+        yield BuffersWorker(supervisor, options=clients.buffers, misc=(bdb, wbdb))
 
     if clients.paths.enabled:
         yield PathsWorker(supervisor, options=clients.paths, misc=None)
@@ -116,7 +122,7 @@ def stack(pool: Executor, nvim: Nvim) -> Stack:
     pum_width = nvim.options["pumwidth"]
     vars_dir = Path(nvim.funcs.stdpath("cache")) / "coq" if settings.xdg else VARS
     s = state(cwd=get_cwd(nvim), pum_width=pum_width)
-    idb = IDB(pool)
+    idb = IDB(pool, vars_dir=vars_dir if settings.limits.persistent_recency else None)
     reviewer = Reviewer(
         icons=settings.display.icons,
         options=settings.match,
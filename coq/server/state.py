@@ -9,9 +9,8 @@ from std2.types import Void, VoidType
 from std2.pathlib import POSIX_ROOT
 
 from ..shared.context import EMPTY_CONTEXT
-from ..shared.runtime import Metric
-from ..shared.settings import Weights
-from ..shared.types import Completion, Context, Edit, NvimPos
+from ..shared.runtime import Metric, RawWeights
+from ..shared.types import Completion, Context, Edit, NvimPos, new_uid
 
 
 @dataclass(frozen=True)
@@ -21,7 +20,7 @@ class State:
     screen: Tuple[int, int]
     change_id: UUID
     commit_id: UUID
-    preview_id: UUID
+    preview_id: int
     nono_bufs: AbstractSet[int]
     context: Context
     last_edit: Metric
@@ -38,14 +37,14 @@ _state = State(
     screen=(0, 0),
     change_id=uuid4(),
     commit_id=uuid4(),
-    preview_id=uuid4(),
+    preview_id=new_uid(),
     nono_bufs=set(),
     context=EMPTY_CONTEXT,
     last_edit=Metric(
         instance=uuid4(),
         label_width=0,
         kind_width=0,
-        weight=Weights(
+        weight=RawWeights(
             prefix_matches=0,
             edit_distance=0,
             recency=0,
@@ -74,7 +73,7 @@ def state(
     screen: Optional[Tuple[int, int]] = None,
     change_id: Optional[UUID] = None,
     commit_id: Optional[UUID] = None,
-    preview_id: Optional[UUID] = None,
+    preview_id: Optional[int] = None,
     nono_bufs: AbstractSet[int] = frozenset(),
     context: Optional[Context] = None,
     last_edit: Optional[Metric] = None,
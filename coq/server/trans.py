@@ -1,45 +1,62 @@
-from dataclasses import asdict
+from dataclasses import dataclass, replace
+from heapq import heapify, heappop, heappush
 from itertools import chain
 from locale import strxfrm
-from typing import Any, Callable, Iterable, Iterator, MutableSet, Sequence, Tuple
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from pynvim_pp.lib import display_width
 from std2 import clamp
 
-from ..shared.runtime import Metric
+from ..shared.runtime import Metric, RawWeights
 from ..shared.settings import PumDisplay, Weights
 from ..shared.types import Context, SnippetEdit
-from .completions import VimCompletion
+from .completions import UserData, VimCompletion
 from .rt_types import Stack
 from .state import state
 
 
-def _cum(adjustment: Weights, metrics: Iterable[Metric]) -> Weights:
-    zero = Weights(
-        prefix_matches=0,
-        edit_distance=0,
-        recency=0,
-        proximity=0,
+def _cum(adjustment: Weights, metrics: Sequence[Metric]) -> RawWeights:
+    """
+    Column sums over every metric, divided by the configured weights
+    """
+
+    if metrics:
+        cols = zip(*(metric.weight for metric in metrics))
+        sums = RawWeights(*map(sum, cols))
+    else:
+        sums = RawWeights(prefix_matches=0, edit_distance=0, recency=0, proximity=0)
+
+    adjust = (
+        adjustment.prefix_matches,
+        adjustment.edit_distance,
+        adjustment.recency,
+        adjustment.proximity,
     )
-    acc = asdict(zero)
-    for metric in metrics:
-        for key, val in asdict(metric.weight).items():
-            acc[key] += val
-    for key, val in asdict(adjustment).items():
-        if val:
-            acc[key] /= val
-        else:
-            acc[key] = 0
-    return Weights(**acc)
-
-
-def _sort_by(is_lower: bool, adjustment: Weights) -> Callable[[Metric], Any]:
-    adjust = asdict(adjustment)
-
-    def key_by(metric: Metric) -> Any:
-        tot = sum(
-            val / adjust[key] if adjust[key] else 0
-            for key, val in asdict(metric.weight).items()
+    return RawWeights(*(acc / val if val else 0 for acc, val in zip(sums, adjust)))
+
+
+def _score_by(adjustment: RawWeights) -> Callable[[Metric], Tuple[int, ...]]:
+    """
+    Cheap numeric part of the sort key
+    """
+
+    a_pm, a_ed, a_rc, a_px = adjustment
+
+    def score_by(metric: Metric) -> Tuple[int, ...]:
+        pm, ed, rc, px = metric.weight
+        tot = (
+            (pm / a_pm if a_pm else 0)
+            + (ed / a_ed if a_ed else 0)
+            + (rc / a_rc if a_rc else 0)
+            + (px / a_px if a_px else 0)
         )
         key = (
             -(metric.comp.always_on_top),
@@ -49,13 +66,19 @@ def _sort_by(is_lower: bool, adjustment: Weights) -> Callable[[Metric], Any]:
             -(metric.comp.kind != ""),
             -(metric.comp.doc is not None),
             -metric.comp.sort_by[:1].isalnum(),
-            strxfrm(
-                metric.comp.sort_by.swapcase() if is_lower else metric.comp.sort_by
-            ),
         )
         return key
 
-    return key_by
+    return score_by
+
+
+def _tie_by(is_lower: bool) -> Callable[[Metric], str]:
+    def tie_by(metric: Metric) -> str:
+        return strxfrm(
+            metric.comp.sort_by.swapcase() if is_lower else metric.comp.sort_by
+        )
+
+    return tie_by
 
 
 def _prune(
@@ -111,12 +134,71 @@ def _cmp_to_vcmp(
 
     menu = f"{sl}{metric.comp.source}{sr}"
 
-    vcmp = VimCompletion(abbr=abbr, menu=menu, user_data=metric.comp.uid)
+    user_data = UserData(coq=metric.comp.uid)
+    vcmp = VimCompletion(abbr=abbr, menu=menu, user_data=user_data)
     return vcmp
 
 
-def trans(
-    stack: Stack, pum_width: int, context: Context, metrics: Sequence[Metric]
+_Ranked = Tuple[Tuple[int, ...], int, Metric]
+
+
+@dataclass(frozen=True)
+class Ranking:
+    score_by: Callable[[Metric], Tuple[int, ...]]
+    tie_by: Callable[[Metric], str]
+    heap: Sequence[_Ranked]
+
+
+def rank(
+    stack: Stack,
+    context: Context,
+    metrics: Sequence[Metric],
+    prev: Optional[Ranking],
+) -> Ranking:
+    """
+    Later batches reuse the normalization of the first,
+    so only they are scored, and pushed onto the already built heap
+    """
+
+    if prev:
+        heap = [*prev.heap]
+        for idx, metric in enumerate(metrics, start=len(heap)):
+            heappush(heap, (prev.score_by(metric), idx, metric))
+        return replace(prev, heap=heap)
+    else:
+        w_adjust = _cum(stack.settings.weights, metrics=metrics)
+        score_by = _score_by(w_adjust)
+        heap = [(score_by(metric), idx, metric) for idx, metric in enumerate(metrics)]
+        heapify(heap)
+        return Ranking(
+            score_by=score_by,
+            tie_by=_tie_by(context.is_lower),
+            heap=heap,
+        )
+
+
+def _ranked(ranking: Ranking) -> Iterator[Metric]:
+    """
+    Same order as a full sort, but lazy
+
+    Heap selection on the numeric score, `strxfrm` only breaks ties among what is popped
+    """
+
+    heap = [*ranking.heap]
+    while heap:
+        score, idx, metric = heappop(heap)
+        tied = [(ranking.tie_by(metric), idx, metric)]
+        while heap and heap[0][0] == score:
+            _, idx, metric = heappop(heap)
+            tied.append((ranking.tie_by(metric), idx, metric))
+
+        tied.sort()
+        for _, _, metric in tied:
+            yield metric
+
+
+def present(
+    stack: Stack, pum_width: int, context: Context, ranking: Ranking
 ) -> Iterator[Tuple[Metric, VimCompletion]]:
     s = state()
     scr_width, _ = s.screen
@@ -129,10 +211,7 @@ def trans(
     ellipsis_width = display_width(display.pum.ellipsis, tabsize=context.tabstop)
     truncate = clamp(pum_width, scr_width - context.scr_col, display.pum.x_max_len)
 
-    w_adjust = _cum(stack.settings.weights, metrics=metrics)
-    sortby = _sort_by(context.is_lower, adjustment=w_adjust)
-    ranked = sorted(metrics, key=sortby)
-    pruned = tuple(_prune(stack, context=context, ranked=ranked))
+    pruned = tuple(_prune(stack, context=context, ranked=_ranked(ranking)))
     max_width = _max_width(pruned)
     for metric in pruned:
         yield metric, _cmp_to_vcmp(
@@ -144,3 +223,10 @@ def trans(
             max_width=max_width,
             metric=metric,
         )
+
+
+def trans(
+    stack: Stack, pum_width: int, context: Context, metrics: Sequence[Metric]
+) -> Iterator[Tuple[Metric, VimCompletion]]:
+    ranking = rank(stack, context=context, metrics=metrics, prev=None)
+    return present(stack, pum_width=pum_width, context=context, ranking=ranking)
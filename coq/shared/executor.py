@@ -1,23 +1,56 @@
 from asyncio import wrap_future
+from collections import deque
 from concurrent.futures import Executor, Future, InvalidStateError
 from contextlib import suppress
-from queue import SimpleQueue
-from typing import Any, Awaitable, Callable, TypeVar, cast
+from dataclasses import dataclass
+from enum import IntEnum, auto
+from itertools import count, islice
+from queue import PriorityQueue
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Iterable, Sequence, TypeVar, cast
 
 _T = TypeVar("_T")
 
+# Keep the wait times of this many recent jobs
+_WAITS = 999
+
+
+class Priority(IntEnum):
+    read = auto()
+    write = auto()
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    depth: int
+    waits: Sequence[float]
+
 
 class SingleThreadExecutor:
+    """
+    Jobs run one at a time, `Priority.read` ahead of any queued `Priority.write`
+
+    FIFO within the same priority
+    """
+
     def __init__(self, pool: Executor) -> None:
-        self._q: SimpleQueue = SimpleQueue()
+        self._q: PriorityQueue = PriorityQueue()
+        self._seq = count()
+        self._waits: Deque[float] = deque(maxlen=_WAITS)
         pool.submit(self._forever)
 
     def _forever(self) -> None:
         while True:
-            f = self._q.get()
+            _, _, queued, f = self._q.get()
+            self._waits.append(monotonic() - queued)
             f()
 
-    def _submit(self, f: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    def _put(self, priority: Priority, f: Callable[[], None]) -> None:
+        self._q.put((priority, next(self._seq), monotonic(), f))
+
+    def _submit(
+        self, priority: Priority, f: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
         fut: Future = Future()
 
         def cont() -> None:
@@ -30,12 +63,61 @@ class SingleThreadExecutor:
                 with suppress(InvalidStateError):
                     fut.set_result(ret)
 
-        self._q.put(cont)
+        self._put(priority, cont)
         return fut
 
-    def submit(self, f: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
-        fut = self._submit(f, *args, **kwargs)
+    def stats(self) -> QueueStats:
+        """
+        `waits` are seconds spent queued, oldest first
+        """
+
+        return QueueStats(depth=self._q.qsize(), waits=tuple(self._waits))
+
+    def submit(
+        self,
+        f: Callable[..., _T],
+        *args: Any,
+        priority: Priority = Priority.write,
+        **kwargs: Any,
+    ) -> _T:
+        fut = self._submit(priority, f, *args, **kwargs)
         return cast(_T, fut.result())
 
-    def asubmit(self, f: Callable[..., _T], *args: Any, **kwargs: Any) -> Awaitable[_T]:
-        return wrap_future(self._submit(f, *args, **kwargs))
+    def asubmit(
+        self,
+        f: Callable[..., _T],
+        *args: Any,
+        priority: Priority = Priority.write,
+        **kwargs: Any,
+    ) -> Awaitable[_T]:
+        return wrap_future(self._submit(priority, f, *args, **kwargs))
+
+    def _steps(self, priority: Priority, steps: Iterable[None]) -> Future:
+        fut: Future = Future()
+        it = iter(steps)
+
+        def cont() -> None:
+            try:
+                for _ in islice(it, 1):
+                    self._put(priority, cont)
+                    break
+                else:
+                    with suppress(InvalidStateError):
+                        fut.set_result(None)
+            except Exception as e:
+                with suppress(InvalidStateError):
+                    fut.set_exception(e)
+
+        self._put(priority, cont)
+        return fut
+
+    def asubmit_steps(
+        self, steps: Iterable[None], priority: Priority = Priority.write
+    ) -> Awaitable[None]:
+        """
+        One step per turn, requeued behind its peers in between
+
+        Steps must not hold a transaction open across a `yield`
+        """
+
+        return wrap_future(self._steps(priority, steps))
@@ -1,7 +1,15 @@
 from collections import Counter
 from dataclasses import dataclass
 from itertools import repeat
-from typing import Iterable, MutableMapping, MutableSequence, Tuple
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
 
 
 @dataclass(frozen=True)
@@ -58,11 +66,9 @@ def quick_ratio(lhs: str, rhs: str, look_ahead: int) -> float:
         return l_ratio + r_ratio * 0.5
 
 
-_ARRAY_CACHE: MutableMapping[Tuple[int, int], MutableSequence[int]] = {}
-_DA: MutableMapping[str, int] = {}
-
-
-def dl_distance(lhs: str, rhs: str) -> int:
+def _dl_distance(
+    d: MutableSequence[int], da: MutableMapping[str, int], lhs: str, rhs: str
+) -> int:
     """
     Modified from
     https://github.com/jamesturk/jellyfish/blob/main/LICENSE
@@ -70,51 +76,64 @@ def dl_distance(lhs: str, rhs: str) -> int:
     """
 
     len_l, len_r = len(lhs), len(rhs)
-    row_size = len_r + 2
-    max_d = len_l + len_r
-    _DA.clear()
-
-    if not (d := _ARRAY_CACHE.get((len_l, len_r))):
-        d = [*repeat(0, row_size * (len_l + 2))]
-
-    d[0] = max_d
-    for i in range(0, len_l + 1):
-        i1 = i + 1
-        d[row_size * i1] = max_d
-        d[row_size * i1 + 1] = i
-
-    for j in range(0, len_r + 1):
-        d[j + 1] = max_d
-        d[row_size + j + 1] = j
-
-    for i in range(1, len_l + 1):
-        db = 0
-        for j in range(1, len_r + 1):
-            i1 = _DA.get(rhs[j - 1], 0)
-            j1 = db
-
-            if lhs[i - 1] == rhs[j - 1]:
-                cost = 0
-                db = j
-            else:
-                cost = 1
-
-            d[row_size * (i + 1) + j + 1] = min(
-                d[row_size * i + j] + cost,
-                d[row_size * (i + 1) + j] + 1,
-                d[row_size * i + j + 1] + 1,
-                d[row_size * i1 + j1] + (i - i1 - 1) + 1 + (j - j1 - 1),
-            )
-        _DA[lhs[i - 1]] = i
-
-    return d[row_size * (len_l + 1) + len_r + 1]
+    if lhs == rhs:
+        return 0
+    elif not len_l:
+        return len_r
+    elif not len_r:
+        return len_l
+    else:
+        row_size = len_r + 2
+        max_d = len_l + len_r
+        da.clear()
+
+        for j in range(0, row_size):
+            d[j] = max_d
+        d[row_size] = max_d
+        for j in range(0, len_r + 1):
+            d[row_size + j + 1] = j
+
+        for i in range(1, len_l + 1):
+            cur = row_size * (i + 1)
+            prev = cur - row_size
+            d[cur] = max_d
+            d[cur + 1] = i
+
+            db = 0
+            l_char = lhs[i - 1]
+            for j in range(1, len_r + 1):
+                r_char = rhs[j - 1]
+                i1 = da.get(r_char, 0)
+                j1 = db
+
+                if l_char == r_char:
+                    cost = 0
+                    db = j
+                else:
+                    cost = 1
+
+                # Unrolled `min(...)`, hot loop
+                best = d[prev + j] + cost
+                if (ins := d[cur + j] + 1) < best:
+                    best = ins
+                if (rm := d[prev + j + 1] + 1) < best:
+                    best = rm
+                if (sw := d[row_size * i1 + j1] + (i - i1) + (j - j1) - 1) < best:
+                    best = sw
+                d[cur + j + 1] = best
+            da[l_char] = i
+
+        return d[row_size * (len_l + 1) + len_r + 1]
 
 
-def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
-    """
-    Front end bias
-    """
+def dl_distance(lhs: str, rhs: str) -> int:
+    d = [*repeat(0, (len(lhs) + 2) * (len(rhs) + 2))]
+    return _dl_distance(d, {}, lhs=lhs, rhs=rhs)
 
+
+def _metrics(
+    dist: Callable[[str, str], int], lhs: str, rhs: str, look_ahead: int
+) -> MatchMetrics:
     shorter = min(len(lhs), len(rhs))
     if not shorter:
         return MatchMetrics(prefix_matches=0, edit_distance=0)
@@ -124,6 +143,48 @@ def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
         more = cutoff - shorter
         l, r = lhs[p_matches:cutoff], rhs[p_matches:cutoff]
 
-        dist = dl_distance(l, r)
-        edit_dist = 1 - (dist - more) / shorter
+        d = dist(l, r)
+        edit_dist = 1 - (d - more) / shorter
         return MatchMetrics(prefix_matches=p_matches, edit_distance=edit_dist)
+
+
+def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
+    """
+    Front end bias
+    """
+
+    return _metrics(dl_distance, lhs=lhs, rhs=rhs, look_ahead=look_ahead)
+
+
+def batch_metrics(
+    lhs: str, rhs: Iterable[str], look_ahead: int
+) -> Sequence[MatchMetrics]:
+    """
+    `metrics` of one `lhs` against many `rhs`
+
+    Shares one DP buffer, memoizes on both `rhs` and the sliced `(l, r)` pairs
+    """
+
+    d: MutableSequence[int] = []
+    da: MutableMapping[str, int] = {}
+    dists: MutableMapping[Tuple[str, str], int] = {}
+    seen: MutableMapping[str, MatchMetrics] = {}
+
+    def dist(l: str, r: str) -> int:
+        key = (l, r)
+        if (distance := dists.get(key)) is None:
+            size = (len(l) + 2) * (len(r) + 2)
+            if len(d) < size:
+                d.extend(repeat(0, size - len(d)))
+            distance = dists[key] = _dl_distance(d, da, lhs=l, rhs=r)
+        return distance
+
+    def cont() -> Iterator[MatchMetrics]:
+        for match in rhs:
+            if (m := seen.get(match)) is None:
+                m = seen[match] = _metrics(
+                    dist, lhs=lhs, rhs=match, look_ahead=look_ahead
+                )
+            yield m
+
+    return tuple(cont())
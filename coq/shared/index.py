@@ -0,0 +1,121 @@
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Iterable, Iterator, List, MutableMapping, MutableSequence, Tuple
+
+from .fuzzy import quick_ratio
+from .parse import lower
+from .settings import MatchOptions
+from .sql import char_mask
+
+# Past this many new / dead keys, re-sorting beats `insort` / `del`
+_BULK = 64
+
+
+def _plausible(opts: MatchOptions, lword: str, cmask: int, lhs: str, mask: int) -> bool:
+    """
+    Bitmask bound from `sql.mask_params`, which only holds under its length guard
+
+    `lower` may change lengths, hence re-checked here
+    """
+
+    if len(lhs) + opts.look_ahead < len(lword):
+        return True
+    else:
+        missing = bin(cmask & ~mask).count("1")
+        return len(lword) - missing > opts.fuzzy_cutoff * min(len(lword), len(lhs))
+
+
+class PrefixIndex:
+    """
+    Reference counted, sorted `(lword, word)` index
+
+    Replaces full table scans + `X_SIMILARITY` with a bisect into the words sharing the `exact_matches` prefix
+    """
+
+    def __init__(self) -> None:
+        self._refs: MutableMapping[str, int] = {}
+        self._masks: MutableMapping[str, int] = {}
+        self._sorted: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def add(self, words: Iterable[str]) -> None:
+        new: MutableSequence[Tuple[str, str]] = []
+        for word in words:
+            if refs := self._refs.get(word):
+                self._refs[word] = refs + 1
+            else:
+                self._refs[word] = 1
+                lword = lower(word)
+                self._masks[word] = char_mask(lword)
+                new.append((lword, word))
+
+        if len(new) > _BULK:
+            self._sorted.extend(new)
+            self._sorted.sort()
+        else:
+            for key in new:
+                insort(self._sorted, key)
+
+    def remove(self, words: Iterable[str]) -> None:
+        dead: MutableSequence[Tuple[str, str]] = []
+        for word in words:
+            refs = self._refs.get(word, 0)
+            if refs > 1:
+                self._refs[word] = refs - 1
+            elif refs:
+                self._refs.pop(word)
+                self._masks.pop(word)
+                dead.append((lower(word), word))
+
+        if len(dead) > _BULK:
+            self._sorted = [key for key in self._sorted if key[1] in self._refs]
+        else:
+            for key in dead:
+                idx = bisect_left(self._sorted, key)
+                if idx < len(self._sorted) and self._sorted[idx] == key:
+                    del self._sorted[idx]
+
+    def _candidates(self, prefix: str, lword: str) -> Iterator[Tuple[str, str]]:
+        """
+        Words sharing `prefix`, beginning from where `lword` would be inserted
+
+        ie. words that `lword` is a prefix of come first
+        """
+
+        lo = bisect_left(self._sorted, (prefix,))
+        mid = bisect_left(self._sorted, (lword,), lo=lo)
+
+        for idx in range(mid, len(self._sorted)):
+            key = self._sorted[idx]
+            if key[0].startswith(prefix):
+                yield key
+            else:
+                break
+
+        for idx in range(lo, mid):
+            yield self._sorted[idx]
+
+    def search(self, opts: MatchOptions, word: str, limit: int) -> Iterator[str]:
+        """
+        Same predicate as the `X_SIMILARITY` queries, scoring at most `limit` candidates
+
+        Candidates are first rejected by the bitmask bound from `sql.mask_params`
+        """
+
+        if word:
+            lword = lower(word)
+            cmask = char_mask(lword)
+            prefix = lword[: opts.exact_matches]
+            for lhs, rhs in islice(self._candidates(prefix, lword=lword), limit):
+                if (
+                    len(rhs) + opts.look_ahead >= len(word)
+                    and rhs != word[: len(rhs)]
+                    and _plausible(
+                        opts, lword=lword, cmask=cmask, lhs=lhs, mask=self._masks[rhs]
+                    )
+                    and quick_ratio(lword, lhs, look_ahead=opts.look_ahead)
+                    > opts.fuzzy_cutoff
+                ):
+                    yield rhs
@@ -1,44 +1,43 @@
+from functools import lru_cache
 from random import choice
-from typing import AbstractSet, Iterator, MutableSequence, Sequence
-
-from pynvim_pp.text_object import is_word
+from re import Pattern, compile, escape
+from typing import AbstractSet, Iterator
 
 
 def lower(text: str) -> str:
     return text.casefold()
 
 
+@lru_cache(maxsize=None)
+def _tokenizer(unifying_chars: AbstractSet[str], include_syms: bool) -> Pattern:
+    """
+    Runs of `is_word` chars, and optionally runs of non space, non word chars
+
+    `[^\\W_]` is exactly `str.isalnum`, `\\s` is exactly `str.isspace`
+    """
+
+    others = escape("".join(sorted(unifying_chars - {"_"})))
+    if "_" in unifying_chars:
+        word, sym = f"[\\w{others}]", f"[^\\w\\s{others}]"
+    elif others:
+        word, sym = f"(?:[^\\W_]|[{others}])", f"(?:[^\\w\\s{others}]|_)"
+    else:
+        word, sym = "[^\\W_]", "[^\\w\\s]|_"
+
+    return compile(f"{word}+|(?:{sym})+" if include_syms else f"{word}+")
+
+
 def coalesce(
-    chars: Sequence[str], unifying_chars: AbstractSet[str], include_syms: bool
+    chars: str, unifying_chars: AbstractSet[str], include_syms: bool
 ) -> Iterator[str]:
-    backwards = choice((True, False))
-
-    words: MutableSequence[str] = []
-    syms: MutableSequence[str] = []
-
-    def w_it() -> Iterator[str]:
-        if words:
-            word = "".join(reversed(words) if backwards else words)
-            words.clear()
-            yield word
-
-    def s_it() -> Iterator[str]:
-        if syms:
-            sym = "".join(reversed(syms) if backwards else syms)
-            syms.clear()
-            yield sym
-
-    for char in reversed(chars) if backwards else chars:
-        if is_word(char, unifying_chars=unifying_chars):
-            words.append(char)
-            yield from s_it()
-        elif not char.isspace():
-            if include_syms:
-                syms.append(char)
-            yield from w_it()
-        else:
-            yield from w_it()
-            yield from s_it()
-
-    yield from w_it()
-    yield from s_it()
+    """
+    Tokens come out in a random direction, so `islice`s of long texts are fair
+    """
+
+    tokenizer = _tokenizer(frozenset(unifying_chars), include_syms=include_syms)
+    if choice((True, False)):
+        for match in tokenizer.finditer(chars[::-1]):
+            yield match.group()[::-1]
+    else:
+        for match in tokenizer.finditer(chars):
+            yield match.group()
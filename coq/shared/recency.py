@@ -0,0 +1,83 @@
+from heapq import nlargest
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, MutableMapping, Tuple
+
+# Rebase before weights grow past `2 ** _REBASE`
+_REBASE = 64
+# Decayed below this, a word is forgotten
+_MIN_SCORE = 2 ** -16
+
+
+class Recency:
+    """
+    Insertion counts, halved every `half_life` insertions
+
+    Weights are stored relative to the clock at the last rebase, so decay costs nothing until the next rebase
+
+    Holds at most `2 * size` words, pruned back to the `size` heaviest on rebase
+    """
+
+    def __init__(self, half_life: float, size: int) -> None:
+        self._half_life, self._size = half_life, size
+        self._clock = self._base = 0
+        self._weights: MutableMapping[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def _scale(self) -> float:
+        return 2 ** ((self._clock - self._base) / self._half_life)
+
+    def _rebase(self) -> None:
+        scale = self._scale()
+        scored = ((word, weight / scale) for word, weight in self._weights.items())
+        kept = ((word, score) for word, score in scored if score >= _MIN_SCORE)
+        self._weights = dict(nlargest(self._size, kept, key=itemgetter(1)))
+        self._base = self._clock
+
+    def weights(self) -> Mapping[str, float]:
+        """
+        Only comparable among themselves, a read only snapshot
+
+        Never changes afterwards, `insert` copies on write
+        """
+
+        return MappingProxyType(self._weights)
+
+    def insert(self, word: str) -> Tuple[float, int]:
+        """
+        `(score, clock)` of `word` after the insertion
+        """
+
+        self._clock += 1
+        if (
+            self._clock - self._base >= self._half_life * _REBASE
+            or len(self._weights) >= 2 * self._size
+        ):
+            self._rebase()
+
+        scale = self._scale()
+        weight = self._weights.get(word, 0) + scale
+        self._weights = {**self._weights, word: weight}
+        return weight / scale, self._clock
+
+    def load(self, rows: Iterable[Tuple[str, float, int]]) -> None:
+        """
+        `(word, score, clock)`, as returned by `insert`
+        """
+
+        acc = tuple(rows)
+        self._clock = self._base = max((clock for _, _, clock in acc), default=0)
+
+        def cont() -> Iterator[Tuple[str, float]]:
+            for word, score, clock in acc:
+                yield word, score * 2 ** ((clock - self._clock) / self._half_life)
+
+        self._weights = dict(cont())
+        self._rebase()
+
+    def dump(self) -> Iterator[Tuple[str, float, int]]:
+        scale = self._scale()
+        for word, weight in self._weights.items():
+            yield word, weight / scale, self._clock
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from asyncio import (
+    FIRST_COMPLETED,
     AbstractEventLoop,
     CancelledError,
     Condition,
@@ -10,15 +11,21 @@ from asyncio import (
     wait,
 )
 from concurrent.futures import Executor
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from time import monotonic
 from typing import (
     Any,
     AsyncIterator,
     Awaitable,
+    Callable,
     Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
     MutableSequence,
+    NamedTuple,
     Optional,
     Protocol,
     Sequence,
@@ -33,7 +40,11 @@ from pynvim_pp.logging import with_suppress
 from std2.aitertools import aenumerate
 from std2.asyncio import cancel
 
-from .settings import BaseClient, CompleteOptions, Limits, MatchOptions, Weights
+from .fuzzy import quick_ratio
+from .parse import lower
+from .settings import BaseClient, CompleteOptions, Limits, MatchOptions
+from .shadow import Shadows
+from .slots import slots
 from .timeit import TracingLocker, timeit
 from .types import Completion, Context
 
@@ -41,28 +52,196 @@ _T = TypeVar("_T")
 _T_co = TypeVar("_T_co", contravariant=True)
 _O_co = TypeVar("_O_co", contravariant=True, bound=BaseClient)
 
+# Completions are scored in batches of up to this many
+_TRANS_BATCH = 99
+# Past this many `widen`ed candidates, narrowing is not worth keeping
+_WIDEN_LIMIT = 999
+# Float slack, `widen` may only ever admit more
+_EPSILON = 1e-9
 
+
+class RawWeights(NamedTuple):
+    """
+    Per completion, un-normalized `Weights`, in the same field order
+    """
+
+    prefix_matches: float
+    edit_distance: float
+    recency: float
+    proximity: float
+
+
+@slots
 @dataclass(frozen=True)
 class Metric:
     instance: UUID
     comp: Completion
     weight_adjust: float
-    weight: Weights
+    weight: RawWeights
     label_width: int
     kind_width: int
 
 
+@dataclass(frozen=True)
+class Narrowing:
+    commit_id: UUID
+    buf_id: int
+    row: int
+    words_before: str
+    words: str
+    syms: str
+    # Every completion that can still `_match` a `words` / `syms` extension
+    completions: Sequence[Completion]
+
+
+def _match(opts: MatchOptions, cword: str, text: str) -> bool:
+    """
+    Same predicate as the `X_SIMILARITY` queries
+    """
+
+    lhs, rhs = lower(cword), lower(text)
+    return (
+        rhs.startswith(lhs[: opts.exact_matches])
+        and len(text) + opts.look_ahead >= len(cword)
+        and text != cword[: len(text)]
+        and quick_ratio(lhs, rhs, look_ahead=opts.look_ahead) > opts.fuzzy_cutoff
+    )
+
+
+def widen(opts: MatchOptions) -> MatchOptions:
+    """
+    `quick_ratio >= p / s`, so this cutoff admits every `_reachable` text
+
+    `p` is the length of the common prefix, `s` the shorter length
+    """
+
+    return replace(opts, fuzzy_cutoff=2 * opts.fuzzy_cutoff - 1 - _EPSILON)
+
+
+def _reachable(opts: MatchOptions, cword: str, text: str) -> bool:
+    """
+    Whether `text` can `_match` any extension of `cword`
+
+    `quick_ratio <= 0.5 + 0.5 * p / s`, where `p` stops growing past a mismatch
+    and `s` never shrinks, unless `cword` is a prefix of `text`
+
+    The rest of `_match` only gets stricter as `cword` grows
+    """
+
+    lhs, rhs = lower(cword), lower(text)
+    shorter = min(len(lhs), len(rhs))
+    return (
+        rhs.startswith(lhs[: opts.exact_matches])
+        and len(text) + opts.look_ahead >= len(cword)
+        and text != cword[: len(text)]
+        and (
+            not shorter
+            or rhs.startswith(lhs)
+            or _p_matches(lhs, rhs) / shorter > widen(opts).fuzzy_cutoff
+        )
+    )
+
+
+def _p_matches(lhs: str, rhs: str) -> int:
+    for idx, (l, r) in enumerate(zip(lhs, rhs)):
+        if l != r:
+            return idx
+    else:
+        return min(len(lhs), len(rhs))
+
+
+def narrowing(
+    opts: MatchOptions, context: Context, completions: Iterable[Completion]
+) -> Narrowing:
+    """
+    `completions` must hold every `_reachable` text
+
+    ie. the results of an untruncated `widen`ed query, or of a previous `narrowing`
+    """
+
+    row, _ = context.position
+    return Narrowing(
+        commit_id=context.commit_id,
+        buf_id=context.buf_id,
+        row=row,
+        words_before=context.words_before,
+        words=context.words,
+        syms=context.syms,
+        completions=tuple(
+            comp
+            for comp in completions
+            if any(
+                _reachable(opts, cword=cword, text=comp.sort_by)
+                for cword in (context.words, context.syms)
+                if cword
+            )
+        ),
+    )
+
+
+def narrow(
+    opts: MatchOptions, prev: Optional[Narrowing], context: Context
+) -> Optional[Narrowing]:
+    """
+    Candidates for `foob` are a subset of those reachable from `foo`
+    """
+
+    row, _ = context.position
+    if (
+        prev
+        and not context.manual
+        and prev.commit_id == context.commit_id
+        and prev.buf_id == context.buf_id
+        and prev.row == row
+        and prev.words_before
+        and len(context.words_before) > len(prev.words_before)
+        and context.words_before.startswith(prev.words_before)
+        and all(
+            not cword or (prev_cword and cword.startswith(prev_cword))
+            for prev_cword, cword in (
+                (prev.words, context.words),
+                (prev.syms, context.syms),
+            )
+        )
+    ):
+        return narrowing(opts, context=context, completions=prev.completions)
+    else:
+        return None
+
+
+def matches(opts: MatchOptions, narrowed: Narrowing) -> Sequence[Completion]:
+    return tuple(
+        comp
+        for comp in narrowed.completions
+        if any(
+            _match(opts, cword=cword, text=comp.sort_by)
+            for cword in (narrowed.words, narrowed.syms)
+            if cword
+        )
+    )
+
+
+async def _replay(completions: Sequence[Completion]) -> AsyncIterator[Completion]:
+    for completion in completions:
+        yield completion
+
+
 class PReviewer(Protocol[_T]):
     def register(self, assoc: BaseClient) -> None:
         ...
 
+    async def budgets(self, timeout: float) -> Mapping[str, float]:
+        ...
+
     async def begin(self, context: Context) -> _T:
         ...
 
     async def s_begin(self, token: _T, assoc: BaseClient, instance: UUID) -> None:
         ...
 
-    def trans(self, token: _T, instance: UUID, completion: Completion) -> Metric:
+    def trans(
+        self, token: _T, instance: UUID, completions: Sequence[Completion]
+    ) -> Iterator[Metric]:
         ...
 
     async def s_end(
@@ -86,9 +265,11 @@ class Supervisor:
         self.vars_dir = vars_dir
         self.match, self.comp, self.limits = match, comp, limits
         self.nvim, self._reviewer = nvim, reviewer
+        self.shadows = Shadows()
 
         self.idling = Condition()
         self._workers: WeakSet[Worker] = WeakSet()
+        self._budgets: Mapping[str, float] = {}
 
         self._lock = TracingLocker(name="Supervisor", force=True)
         self._work_task: Optional[Task] = None
@@ -102,6 +283,11 @@ class Supervisor:
             async with self.idling:
                 self.idling.notify_all()
 
+            if self.limits.completion_adaptive_timeout:
+                self._budgets = await self._reviewer.budgets(
+                    self.limits.completion_auto_timeout
+                )
+
         go(self.nvim, aw=cont())
 
     async def interrupt(self) -> None:
@@ -110,7 +296,18 @@ class Supervisor:
         if task:
             await cancel(task)
 
-    def collect(self, context: Context) -> Awaitable[Sequence[Metric]]:
+    def collect(
+        self,
+        context: Context,
+        progress: Optional[Callable[[Sequence[Metric]], Awaitable[None]]] = None,
+    ) -> Awaitable[Sequence[Metric]]:
+        """
+        `progress` receives new metrics as each source finishes, before the deadline
+
+        On keystrokes, sources are waited on as long as their budgets allow,
+        sources budgeted `0` run in the background, their results dropped
+        """
+
         loop: AbstractEventLoop = self.nvim.loop
         now = monotonic()
         timeout = (
@@ -118,6 +315,7 @@ class Supervisor:
             if context.manual
             else self.limits.completion_auto_timeout
         )
+        budgets: Mapping[str, float] = {} if context.manual else self._budgets
 
         async def cont(prev: Optional[Task]) -> Sequence[Metric]:
             with timeit("CANCEL -- ALL"):
@@ -129,12 +327,29 @@ class Supervisor:
                     acc: MutableSequence[Metric] = []
 
                     token = await self._reviewer.begin(context)
-                    tasks = tuple(
-                        worker.supervised(context, token=token, now=now, acc=acc)
-                        for worker in self._workers
-                    )
+                    t0 = monotonic()
+                    deadlines: MutableMapping[Task, float] = {}
+                    for worker in self._workers:
+                        budget = budgets.get(worker._options.short_name, timeout)
+                        if budget > 0:
+                            task = worker.supervised(
+                                context, token=token, now=now, acc=acc
+                            )
+                            deadlines[task] = t0 + budget
+                        else:
+                            worker.supervised(context, token=token, now=now, acc=[])
+
+                    sent, pending = 0, {*deadlines}
+                    while pending and (
+                        left := max(deadlines[task] for task in pending) - monotonic()
+                    ) > 0:
+                        _, pending = await wait(
+                            pending, timeout=left, return_when=FIRST_COMPLETED
+                        )
+                        if progress and pending and len(acc) > sent:
+                            batch, sent = acc[sent:], len(acc)
+                            await progress(batch)
 
-                    _, pending = await wait(tasks, timeout=timeout)
                     if not acc:
                         for fut in as_completed(pending):
                             await fut
@@ -151,6 +366,8 @@ class Supervisor:
 class Worker(Generic[_O_co, _T_co]):
     def __init__(self, supervisor: Supervisor, options: _O_co, misc: _T_co) -> None:
         self._work_task: Optional[Task] = None
+        self._widen_task: Optional[Task] = None
+        self._narrowing: Optional[Narrowing] = None
         self._work_lock = TracingLocker(name=options.short_name, force=True)
         self._supervisor, self._options, self._misc = supervisor, options, misc
         self._supervisor.register(self, assoc=options)
@@ -172,10 +389,31 @@ class Worker(Generic[_O_co, _T_co]):
         async def cont() -> None:
             instance, items = uuid4(), 0
             interrupted = False
+            pending: MutableSequence[Completion] = []
+
+            def flush() -> None:
+                acc.extend(
+                    self._supervisor._reviewer.trans(
+                        token, instance=instance, completions=pending
+                    )
+                )
+                pending.clear()
 
             with timeit(f"CANCEL WORKER -- {self._options.short_name}"):
                 if prev:
                     await cancel(prev)
+                # Only visible once `prev` is done
+                widening, self._widen_task = self._widen_task, None
+                if widening:
+                    await cancel(widening)
+
+            match = self._supervisor.match
+            narrowed = (
+                narrow(match, prev=self._narrowing, context=context)
+                if isinstance(self, NarrowingWorker)
+                else None
+            )
+            self._narrowing = None
 
             with with_suppress(), timeit(f"WORKER -- {self._options.short_name}"):
                 await self._supervisor._reviewer.s_begin(
@@ -183,16 +421,31 @@ class Worker(Generic[_O_co, _T_co]):
                 )
                 try:
                     async for items, completion in aenumerate(
-                        self.work(context), start=1
+                        (
+                            self.work(context)
+                            if narrowed is None
+                            else _replay(matches(match, narrowed=narrowed))
+                        ),
+                        start=1,
                     ):
-                        metric = self._supervisor._reviewer.trans(
-                            token, instance=instance, completion=completion
-                        )
-                        acc.append(metric)
+                        pending.append(completion)
+                        if len(pending) >= _TRANS_BATCH:
+                            flush()
                 except CancelledError:
                     interrupted = True
                     raise
+                else:
+                    if narrowed:
+                        self._narrowing = narrowed
+                    elif (
+                        isinstance(self, NarrowingWorker)
+                        and not context.manual
+                        and items < match.max_results
+                    ):
+                        # Only worth it while the population is sparse
+                        self._widen_task = loop.create_task(self._widen(context))
                 finally:
+                    flush()
                     elapsed = monotonic() - now
                     await self._supervisor._reviewer.s_end(
                         instance,
@@ -203,3 +456,35 @@ class Worker(Generic[_O_co, _T_co]):
 
         self._work_task = task = loop.create_task(cont())
         return task
+
+
+class NarrowingWorker(Worker[_O_co, _T_co]):
+    """
+    Sources of plain `Edit`s, matched on `sort_by` by the `X_SIMILARITY` predicate
+    """
+
+    @abstractmethod
+    def widened(
+        self, context: Context, match: MatchOptions
+    ) -> AsyncIterator[Completion]:
+        """
+        `work()` matched by `match`, and never truncated
+        """
+
+    async def _widen(self, context: Context) -> None:
+        """
+        Collect what further keystrokes in the same word can narrow down to
+        """
+
+        match = self._supervisor.match
+        completions: MutableSequence[Completion] = []
+        with with_suppress(), timeit(f"WIDEN -- {self._options.short_name}"):
+            # Drained, not broken out of, so `_work_lock` is released right away
+            async for completion in self.widened(context, match=widen(match)):
+                if len(completions) <= _WIDEN_LIMIT:
+                    completions.append(completion)
+
+            if len(completions) <= _WIDEN_LIMIT:
+                self._narrowing = narrowing(
+                    match, context=context, completions=completions
+                )
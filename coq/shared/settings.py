@@ -12,6 +12,8 @@ class Limits:
     idle_timeout: float
     completion_auto_timeout: float
     completion_manual_timeout: float
+    completion_adaptive_timeout: bool
+    persistent_recency: bool
     download_retries: int
     download_timeout: float
 
@@ -26,6 +28,7 @@ class GhostText:
 @dataclass(frozen=True)
 class PumDisplay:
     fast_close: bool
+    progressive: bool
 
     y_ratio: float
     y_max_len: int
@@ -153,6 +156,8 @@ class PathsClient(BaseClient, _AlwaysTop):
 @dataclass(frozen=True)
 class BuffersClient(_WordbankClient, _AlwaysTop):
     same_filetype: bool
+    persistent: bool
+    index_project: bool
     parent_scope: str
 
 
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import MutableMapping, MutableSequence, Optional, Sequence
+
+
+@dataclass
+class _Shadow:
+    tick: Optional[int]
+    lines: MutableSequence[str]
+
+
+class Shadows:
+    """
+    Buffer contents, mirrored from `nvim_buf_lines_event`s
+
+    Lines are only trusted while their `changedtick` matches Neovim's
+    """
+
+    def __init__(self) -> None:
+        self._bufs: MutableMapping[int, _Shadow] = {}
+
+    def lines_event(
+        self,
+        buf_id: int,
+        tick: Optional[int],
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+        pending: bool,
+    ) -> None:
+        """
+        `hi == -1` is the whole buffer, sent on attach
+        """
+
+        # Ticks are unknown mid way through a multipart event
+        tick = None if pending else tick
+        if hi == -1:
+            self._bufs[buf_id] = _Shadow(tick=tick, lines=[*lines])
+        elif shadow := self._bufs.get(buf_id):
+            shadow.lines[lo:hi] = lines
+            shadow.tick = tick
+
+    def changedtick_event(self, buf_id: int, tick: int) -> None:
+        if shadow := self._bufs.get(buf_id):
+            shadow.tick = tick
+
+    def detach_event(self, buf_id: int) -> None:
+        self._bufs.pop(buf_id, None)
+
+    def line_count(self, buf_id: int) -> Optional[int]:
+        """
+        Not validated, may trail Neovim by the events still in flight
+        """
+
+        if shadow := self._bufs.get(buf_id):
+            return len(shadow.lines)
+        else:
+            return None
+
+    def lines(
+        self, buf_id: int, tick: int, lo: int, hi: int
+    ) -> Optional[Sequence[str]]:
+        shadow = self._bufs.get(buf_id)
+        if shadow and shadow.tick is not None and shadow.tick == tick:
+            return shadow.lines[lo:hi]
+        else:
+            return None
@@ -0,0 +1,41 @@
+from dataclasses import fields
+from typing import Any, Sequence, Type, TypeVar, cast
+
+_T = TypeVar("_T")
+
+
+def _getstate(self: Any) -> Sequence[Any]:
+    return [getattr(self, field.name) for field in fields(self)]
+
+
+def _setstate(self: Any, state: Sequence[Any]) -> None:
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+def slots(cls: Type[_T]) -> Type[_T]:
+    """
+    `@dataclass(slots=True)`, which is `python >= 3.10` only
+
+    Goes above `@dataclass`, only the fields declared on `cls` itself are slotted
+
+    Two slotted bases that both add fields cannot be inherited from together
+    """
+
+    own = tuple(
+        name
+        for name in cls.__dict__.get("__annotations__", {})
+        if name in getattr(cls, "__dataclass_fields__", {})
+    )
+    body = {
+        key: val
+        for key, val in cls.__dict__.items()
+        if key not in {*own, "__dict__", "__weakref__"}
+    }
+    # Frozen instances cannot be restored through `setattr`, ie. by `copy`
+    body.update(__slots__=own, __getstate__=_getstate, __setstate__=_setstate)
+    # Keeps any custom metaclass of `cls`
+    metaclass: Type[type] = type(cls)
+    new = cast(Type[_T], metaclass(cls.__name__, cls.__bases__, body))
+    new.__qualname__ = cls.__qualname__
+    return new
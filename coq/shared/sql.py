@@ -1,11 +1,13 @@
+from contextlib import contextmanager
 from functools import lru_cache
 from json import dumps
 from os.path import normcase
 from pathlib import Path
-from sqlite3.dbapi2 import Connection
+from sqlite3.dbapi2 import Connection, Cursor
 from typing import (
     Any,
     Iterator,
+    Mapping,
     MutableSequence,
     MutableSet,
     Optional,
@@ -15,12 +17,19 @@ from typing import (
 )
 
 from std2.pathlib import AnyPath
-from std2.sqlite3 import add_functions, escape
+from std2.sqlite3 import add_functions, escape, with_transaction
 
 from .fuzzy import quick_ratio
 
 BIGGEST_INT = 2 ** 63 - 1
 
+# SQLite VM instructions between checks of `QueryGuard`
+_PROGRESS_OPS = 999
+
+# Character classes probed per cword by the `mask` prefilter, and a bit never set
+_PROBES = 8
+_NIL_BIT = 63
+
 
 class _Loader(Protocol):
     def __call__(self, *paths: AnyPath) -> str:
@@ -42,6 +51,90 @@ def like_esc(like: str) -> str:
     return f"{escaped}%"
 
 
+def _char_bit(char: str) -> int:
+    """
+    `a-z` and `0-9` get a bit each, everything else shares the remaining 27
+
+    ASCII case insensitive, same as `sqlite3`'s `LOWER`
+    """
+
+    code = ord(char)
+    if 65 <= code <= 90:
+        return code - 65
+    elif 97 <= code <= 122:
+        return code - 97
+    elif 48 <= code <= 57:
+        return code - 22
+    else:
+        return 36 + code % 27
+
+
+def char_mask(text: str) -> int:
+    mask = 0
+    for char in text:
+        mask |= 1 << _char_bit(char)
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _bits(cword: str) -> Tuple[int, ...]:
+    bits = {_char_bit(char): None for char in cword}
+    return tuple(bits)[:_PROBES]
+
+
+def mask_params(name: str, cword: str) -> Mapping[str, int]:
+    """
+    Rows failing the bitmask prefilter cannot pass `X_SIMILARITY` either
+
+    Given `len(word) + look_ahead >= len(cword)`, where `missing` counts `cword`'s character classes absent from `word`:
+
+    `X_SIMILARITY(cword, word) <= (len(cword) - missing) / min(len(cword), len(word))`
+
+    Only the first `_PROBES` classes are probed, which can only under count `missing`
+    """
+
+    bits = _bits(cword)
+    probes = {
+        f"{name}_{idx}": bits[idx] if idx < len(bits) else _NIL_BIT
+        for idx in range(_PROBES)
+    }
+    return {f"{name}_len": len(cword), f"{name}_n": len(bits), **probes}
+
+
+class QueryGuard:
+    """
+    Reads stop themselves once a newer read begins, or once they are cancelled
+
+    Checked by a progress handler on the database thread
+
+    Nothing is interrupted across threads, and writes never are
+    """
+
+    def __init__(self) -> None:
+        self._latest: Optional[object] = None
+
+    def begin(self) -> object:
+        self._latest = ticket = object()
+        return ticket
+
+    def cancel(self, ticket: object) -> None:
+        if self._latest is ticket:
+            self._latest = None
+
+    @contextmanager
+    def transaction(self, conn: Connection, ticket: object) -> Iterator[Cursor]:
+        """
+        Raises `OperationalError` once `ticket` is superseded
+        """
+
+        conn.set_progress_handler(lambda: self._latest is not ticket, _PROGRESS_OPS)
+        try:
+            with with_transaction(conn.cursor()) as cursor:
+                yield cursor
+        finally:
+            conn.set_progress_handler(None, _PROGRESS_OPS)
+
+
 class _Quantiles:
     def __init__(self) -> None:
         self._qs: MutableSet[float] = set()
@@ -75,6 +168,7 @@ def init_db(conn: Connection) -> None:
     add_functions(conn)
     conn.create_function("X_SIMILARITY", narg=3, func=quick_ratio, deterministic=True)
     conn.create_function("X_NORM_CASE", narg=1, func=normcase, deterministic=True)
+    conn.create_function("X_CHAR_MASK", narg=1, func=char_mask, deterministic=True)
     conn.create_aggregate(
         "X_QUANTILES", n_arg=-1, aggregate_class=cast(Any, _Quantiles)
     )
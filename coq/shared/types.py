@@ -1,12 +1,19 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from itertools import count
 from pathlib import Path, PurePath
 from typing import Any, Literal, Mapping, Optional, Sequence, Tuple, Union
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from .slots import slots
 
 UTF8: Literal["UTF-8"] = "UTF-8"
 UTF16: Literal["UTF-16-LE"] = "UTF-16-LE"
 
+# Each call is a fresh id, never `0`, which is falsy
+# `replace()` and memoized or replayed completions keep theirs on purpose
+_UIDS = count(1)
+
 # In nvim, the col is a ut8 byte offset
 NvimPos = Tuple[int, int]
 # Depends on `OffsetEncoding`
@@ -18,6 +25,14 @@ BYTE_TRANS = {
 }
 
 
+def new_uid() -> int:
+    """
+    Cheaper than `uuid4()`, for the thousands of completions made per keystroke
+    """
+
+    return next(_UIDS)
+
+
 @dataclass(frozen=True)
 class Context:
     """
@@ -75,11 +90,13 @@ class Context:
     is_lower: bool
 
 
+@slots
 @dataclass(frozen=True)
 class Edit:
     new_text: str
 
 
+@slots
 @dataclass(frozen=True)
 class ContextualEdit(Edit):
     """
@@ -91,6 +108,7 @@ class ContextualEdit(Edit):
     old_suffix: str = ""
 
 
+@slots
 @dataclass(frozen=True)
 class BaseRangeEdit(Edit):
     """
@@ -102,6 +120,7 @@ class BaseRangeEdit(Edit):
     encoding: Literal["UTF-8", "UTF-16-LE"]
 
 
+@slots
 @dataclass(frozen=True)
 class RangeEdit(BaseRangeEdit):
     fallback: str
@@ -112,6 +131,7 @@ class SnippetGrammar(Enum):
     snu = auto()
 
 
+# Not slotted, `SnippetRangeEdit` would inherit two conflicting slot layouts
 @dataclass(frozen=True)
 class SnippetEdit(Edit):
     grammar: SnippetGrammar
@@ -130,6 +150,7 @@ class Mark:
     text: str
 
 
+@slots
 @dataclass(frozen=True)
 class Doc:
     text: str
@@ -154,6 +175,7 @@ class ExternPath:
     path: Path
 
 
+@slots
 @dataclass(frozen=True)
 class Completion:
     source: str
@@ -165,7 +187,7 @@ class Completion:
     adjust_indent: bool
     icon_match: Optional[str]
 
-    uid: UUID = field(default_factory=uuid4)
+    uid: int = field(default_factory=new_uid)
     secondary_edits: Sequence[RangeEdit] = ()
     preselect: bool = False
     kind: str = ""
@@ -0,0 +1,126 @@
+from random import Random
+from sqlite3 import Connection
+from string import ascii_lowercase
+from time import perf_counter
+from typing import Iterator, MutableSequence, Sequence
+from unittest import IsolatedAsyncioTestCase, skipUnless
+
+from std2.itertools import chunk
+
+from ...coq.databases.buffers.database import BDB
+from ...coq.shared.executor import SingleThreadExecutor
+from ...coq.shared.settings import MatchOptions
+from ...coq.shared.sql import init_db, like_esc
+from .lib import BENCH, DaemonPool, quantiles, report
+
+_SIZES = (1_000, 10_000, 100_000)
+_QUERIES = 99
+
+_OPTS = MatchOptions(
+    unifying_chars={"_", "-"},
+    max_results=33,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+# `select/words.sql` before the prefix index, ie. `X_SIMILARITY` per `LIKE` match
+_LEGACY = """
+SELECT
+  word
+FROM words
+WHERE
+  lword LIKE :like_word ESCAPE '!'
+  AND
+  LENGTH(word) + :look_ahead >= LENGTH(:word)
+  AND
+  word <> SUBSTR(:word, 1, LENGTH(word))
+  AND
+  X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+LIMIT :limit
+"""
+
+
+def _words(rand: Random, n: int) -> Sequence[str]:
+    def cont() -> Iterator[str]:
+        for _ in range(n):
+            yield "".join(rand.choices(ascii_lowercase[:9], k=rand.randint(3, 12)))
+
+    return tuple(cont())
+
+
+async def _legacy(words: Sequence[str], cwords: Sequence[str]) -> Sequence[float]:
+    ex = SingleThreadExecutor(DaemonPool())
+
+    def init() -> Connection:
+        conn = Connection(":memory:", isolation_level=None)
+        init_db(conn)
+        conn.execute("CREATE TABLE words (word TEXT NOT NULL, lword TEXT NOT NULL)")
+        conn.executemany(
+            "INSERT INTO words (word, lword) VALUES (:word, LOWER(:word))",
+            ({"word": word} for word in {*words}),
+        )
+        return conn
+
+    conn = ex.submit(init)
+
+    def cont(cword: str) -> None:
+        conn.execute(
+            _LEGACY,
+            {
+                "cut_off": _OPTS.fuzzy_cutoff,
+                "look_ahead": _OPTS.look_ahead,
+                "limit": _OPTS.max_results,
+                "word": cword,
+                "like_word": like_esc(cword[: _OPTS.exact_matches]),
+            },
+        ).fetchall()
+
+    samples: MutableSequence[float] = []
+    for cword in cwords:
+        t1 = perf_counter()
+        await ex.asubmit(cont, cword)
+        samples.append(perf_counter() - t1)
+
+    return samples
+
+
+class WordBank(IsolatedAsyncioTestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    async def test_1(self) -> None:
+        rand = Random(0)
+        results = {}
+
+        for size in _SIZES:
+            words = _words(rand, n=size)
+            sampled = rand.sample(words, k=_QUERIES)
+            # Hits terminate early on `LIMIT`, typos have to exhaust the prefix
+            queries = {
+                "hit": tuple(word[:4] for word in sampled),
+                "typo": tuple(word[:2] + "z" + word[3:6] for word in sampled),
+            }
+
+            bdb = BDB(
+                DaemonPool(),
+                tokenization_limit=size,
+                unifying_chars=_OPTS.unifying_chars,
+                include_syms=False,
+            )
+            lines = tuple(" ".join(line) for line in chunk(words, n=9))
+            await bdb.set_lines(0, filetype="", filename="", lo=0, hi=0, lines=lines)
+
+            for kind, cwords in queries.items():
+                samples: MutableSequence[float] = []
+                for cword in cwords:
+                    t1 = perf_counter()
+                    await bdb.words(
+                        _OPTS, filetype=None, word=cword, sym="", limitless=0
+                    )
+                    samples.append(perf_counter() - t1)
+
+                results[f"{kind}_{size}"] = {
+                    "index": quantiles(samples),
+                    "legacy": quantiles(await _legacy(words, cwords=cwords)),
+                }
+
+        report("buffers_words", results)
@@ -0,0 +1,287 @@
+from asyncio import AbstractEventLoop, get_running_loop, sleep
+from dataclasses import dataclass, replace
+from itertools import chain
+from random import Random
+from string import ascii_lowercase
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    TypeVar,
+    cast,
+)
+from unittest import IsolatedAsyncioTestCase, skipUnless
+from uuid import uuid4
+
+from pynvim import Nvim
+from std2.pickle.decoder import new_decoder
+from yaml import safe_load
+
+from ...coq.consts import CONFIG_YML, TMP_DIR
+from ...coq.databases.insertions.database import IDB
+from ...coq.server.reviewer import Reviewer
+from ...coq.server.rt_types import Stack
+from ...coq.server.state import state
+from ...coq.server.trans import trans
+from ...coq.shared.context import EMPTY_CONTEXT
+from ...coq.shared.runtime import Metric, Supervisor
+from ...coq.shared.runtime import Worker as BaseWorker
+from ...coq.shared.settings import BaseClient, Settings
+from ...coq.shared.types import Completion, Context, Edit
+from .lib import BENCH, DaemonPool, quantiles, report
+
+_T = TypeVar("_T")
+
+_ROUNDS = 33
+_PUM_WIDTH = 9
+_SCREEN = (200, 50)
+_TOP = 9
+
+
+@dataclass(frozen=True)
+class _Spec:
+    """
+    Delay before the first item, uniform jitter added to it, and items yielded
+    """
+
+    delay: float
+    jitter: float
+    items: int
+
+
+_SCENARIOS: Mapping[str, Sequence[_Spec]] = {
+    "fast": (
+        _Spec(delay=0, jitter=0, items=33),
+        _Spec(delay=0, jitter=0, items=99),
+    ),
+    "mixed": (
+        _Spec(delay=0, jitter=0, items=99),
+        _Spec(delay=0.01, jitter=0.01, items=999),
+        _Spec(delay=0.06, jitter=0.06, items=999),
+    ),
+    "heavy": (
+        _Spec(delay=0, jitter=0, items=9999),
+        _Spec(delay=0.02, jitter=0.01, items=2999),
+    ),
+}
+
+
+class _Nvim:
+    """
+    `Supervisor` only needs the event loop from `Nvim`
+    """
+
+    def __init__(self, loop: AbstractEventLoop) -> None:
+        self.loop = loop
+
+
+class _Worker(BaseWorker[BaseClient, _Spec]):
+    def __init__(
+        self,
+        supervisor: Supervisor,
+        options: BaseClient,
+        misc: _Spec,
+        completions: Sequence[Completion],
+    ) -> None:
+        super().__init__(supervisor, options=options, misc=misc)
+        self._rand, self.completions = Random(options.short_name), completions
+
+    async def work(self, context: Context) -> AsyncIterator[Completion]:
+        await sleep(self._misc.delay + self._rand.uniform(0, self._misc.jitter))
+        for completion in self.completions:
+            yield completion
+
+
+def _completions(
+    rand: Random, short_name: str, words: Sequence[str], n: int
+) -> Sequence[Completion]:
+    def cont() -> Iterator[Completion]:
+        for word in rand.sample(words, k=min(n, len(words))):
+            yield Completion(
+                source=short_name,
+                always_on_top=False,
+                weight_adjust=0,
+                label=word,
+                sort_by=word,
+                primary_edit=Edit(new_text=word),
+                adjust_indent=False,
+                icon_match="Text",
+            )
+
+    return tuple(cont())
+
+
+def _settings() -> Settings:
+    yml = safe_load(CONFIG_YML.read_text("UTF-8"))
+    return new_decoder[Settings](Settings)(yml)
+
+
+def _context(cword: str) -> Context:
+    return replace(
+        EMPTY_CONTEXT,
+        manual=False,
+        line=cword,
+        line_before=cword,
+        words=cword,
+        words_before=cword,
+        l_words_before=cword,
+        is_lower=cword.islower(),
+    )
+
+
+def _words(rand: Random, n: int) -> Sequence[str]:
+    prefixes = ("get", "set", "is", "to", "")
+    return tuple(
+        {
+            rand.choice(prefixes)
+            + "".join(rand.choices(ascii_lowercase[:9], k=rand.randint(3, 12)))
+            for _ in range(n)
+        }
+    )
+
+
+async def _timed(
+    samples: MutableSequence[float], thunk: Callable[[], Awaitable[_T]]
+) -> _T:
+    t1 = perf_counter()
+    ret = await thunk()
+    samples.append(perf_counter() - t1)
+    return ret
+
+
+async def _traced(thunk: Callable[[], Awaitable[_T]]) -> Mapping[str, int]:
+    start()
+    try:
+        await thunk()
+        current, peak = get_traced_memory()
+    finally:
+        stop()
+    return {"current": current, "peak": peak}
+
+
+class Collect(IsolatedAsyncioTestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    async def test_1(self) -> None:
+        rand = Random(0)
+        settings = _settings()
+        words = _words(rand, n=9999)
+        state(screen=_SCREEN, pum_width=_PUM_WIDTH)
+        results = {}
+
+        for name, specs in _SCENARIOS.items():
+            pool = DaemonPool()
+            idb = IDB(pool, vars_dir=None)
+            reviewer = Reviewer(
+                options=settings.match, icons=settings.display.icons, db=idb
+            )
+            supervisor = Supervisor(
+                pool=pool,
+                nvim=cast(Nvim, _Nvim(get_running_loop())),
+                vars_dir=TMP_DIR,
+                match=settings.match,
+                comp=settings.completion,
+                limits=settings.limits,
+                reviewer=reviewer,
+            )
+            workers = tuple(
+                _Worker(
+                    supervisor,
+                    options=BaseClient(
+                        enabled=True, short_name=short_name, weight_adjust=0
+                    ),
+                    misc=spec,
+                    completions=_completions(
+                        rand, short_name=short_name, words=words, n=spec.items
+                    ),
+                )
+                for short_name, spec in (
+                    (f"W{idx}", spec) for idx, spec in enumerate(specs)
+                )
+            )
+            # Unlike `collect`, independent of timing, hence comparable between runs
+            completions = tuple(
+                chain.from_iterable(worker.completions for worker in workers)
+            )
+            stack = Stack(
+                settings=settings,
+                lru={},
+                metrics={},
+                idb=idb,
+                supervisor=supervisor,
+                workers={*workers},
+            )
+
+            stages: MutableMapping[str, MutableSequence[float]] = {
+                "collect": [],
+                "first": [],
+                "review": [],
+                "rank": [],
+            }
+            reviewed: Sequence[Metric] = ()
+            ranked: Sequence[str] = ()
+
+            for cword in (rand.choice(words)[:3] for _ in range(_ROUNDS)):
+                context = _context(cword)
+
+                async def collect() -> Sequence[Metric]:
+                    return await supervisor.collect(context)
+
+                async def first() -> float:
+                    # Time to the first menu, in progressive mode
+                    t1 = perf_counter()
+                    shown: MutableSequence[float] = []
+
+                    async def progress(_: Sequence[Metric]) -> None:
+                        shown.append(perf_counter() - t1)
+
+                    await supervisor.collect(context, progress=progress)
+                    shown.append(perf_counter() - t1)
+                    return shown[0]
+
+                async def review() -> Sequence[Metric]:
+                    token = await reviewer.begin(context)
+                    metrics = reviewer.trans(
+                        token, instance=uuid4(), completions=completions
+                    )
+                    return tuple(metrics)
+
+                async def rank() -> Sequence[str]:
+                    return tuple(
+                        metric.comp.label
+                        for metric, _ in trans(
+                            stack,
+                            pum_width=_PUM_WIDTH,
+                            context=context,
+                            metrics=reviewed,
+                        )
+                    )
+
+                await _timed(stages["collect"], thunk=collect)
+                stages["first"].append(await first())
+                reviewed = await _timed(stages["review"], thunk=review)
+                ranked = await _timed(stages["rank"], thunk=rank)
+
+            allocs = {
+                "collect": await _traced(collect),
+                "review": await _traced(review),
+                "rank": await _traced(rank),
+            }
+
+            results[name] = {
+                "items": len(completions),
+                "latency": {
+                    stage: quantiles(samples) for stage, samples in stages.items()
+                },
+                "allocations": allocs,
+                # Ranking regressions show up as a changed order
+                "top": ranked[:_TOP],
+            }
+
+        report("collect", results)
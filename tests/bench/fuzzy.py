@@ -0,0 +1,48 @@
+from random import Random
+from string import ascii_lowercase
+from time import perf_counter
+from typing import MutableSequence
+from unittest import TestCase, skipUnless
+
+from ...coq.shared.fuzzy import batch_metrics, metrics
+from .lib import BENCH, quantiles, report
+
+_SIZES = (99, 999, 9999)
+_ROUNDS = 33
+_LOOK_AHEAD = 2
+
+
+class BatchMetrics(TestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    def test_1(self) -> None:
+        rand = Random(0)
+        results = {}
+
+        for size in _SIZES:
+            # Realistic popups: most candidates share a handful of prefixes
+            prefixes = ("get", "set", "is", "to", "")
+            matches = tuple(
+                rand.choice(prefixes)
+                + "".join(rand.choices(ascii_lowercase[:9], k=rand.randint(3, 12)))
+                for _ in range(size)
+            )
+            cwords = tuple(rand.choice(matches)[:4] for _ in range(_ROUNDS))
+
+            single: MutableSequence[float] = []
+            batch: MutableSequence[float] = []
+            for cword in cwords:
+                t1 = perf_counter()
+                for match in matches:
+                    metrics(cword, match, look_ahead=_LOOK_AHEAD)
+                t2 = perf_counter()
+                batch_metrics(cword, matches, look_ahead=_LOOK_AHEAD)
+                t3 = perf_counter()
+                single.append(t2 - t1)
+                batch.append(t3 - t2)
+
+            results[str(size)] = {
+                "single": quantiles(single),
+                "batch": quantiles(batch),
+            }
+
+        report("fuzzy_metrics", results)
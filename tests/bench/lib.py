@@ -0,0 +1,50 @@
+from concurrent.futures import Executor, Future
+from json import dumps
+from os import environ
+from threading import Thread
+from typing import Any, Callable, Mapping, Sequence
+
+from ...coq.consts import TMP_DIR
+
+BENCH = "COQ_BENCH" in environ
+
+_BENCH_DIR = TMP_DIR / "bench"
+
+
+class DaemonPool(Executor):
+    """
+    `SingleThreadExecutor` never returns, daemon threads let the runner exit
+    """
+
+    # Typeshed's signature needs `ParamSpec`, which is `python >= 3.10` only
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        fut: Future = Future()
+
+        def cont() -> None:
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
+
+        Thread(target=cont, daemon=True).start()
+        return fut
+
+
+def quantiles(samples: Sequence[float]) -> Mapping[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    else:
+        return {
+            f"p{round(q * 100)}": ordered[round((len(ordered) - 1) * q)]
+            for q in (0.5, 0.95, 0.99)
+        }
+
+
+def report(name: str, results: Any) -> None:
+    _BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    json = dumps(results, check_circular=False, ensure_ascii=False, indent=2)
+    (_BENCH_DIR / name).with_suffix(".json").write_text(json)
+    print(json)
@@ -0,0 +1,99 @@
+from random import choice, seed
+from string import ascii_lowercase
+from time import perf_counter
+from typing import Any, Callable, Iterator, MutableSequence, Sequence
+from unittest import TestCase, skipUnless
+
+from ...coq.lsp.parse import parse, parse_item
+from ...coq.lsp.types import LazyComp
+from ...coq.shared.fuzzy import multi_set_ratio
+from ...coq.shared.types import ExternLSP
+from .lib import BENCH, quantiles, report
+
+_ROUNDS = 33
+# Roughly what a busy LSP server returns per keystroke
+_ITEMS = 3_000
+_CWORD = "ab"
+_CUTOFF = 0.6
+
+
+def _item(label: str) -> Any:
+    start = {"line": 0, "character": 0}
+    return {
+        "label": label,
+        "kind": 3,
+        "detail": f"fn {label}() -> None",
+        "documentation": {"kind": "markdown", "value": f"`{label}`\n" * 9},
+        "insertText": f"{label}(${{1}})",
+        "insertTextFormat": 2,
+        "additionalTextEdits": [
+            {"range": {"start": start, "end": start}, "newText": f"use {label};\n"}
+        ],
+        "data": {"label": label},
+    }
+
+
+def _resp() -> Sequence[Any]:
+    def word() -> str:
+        return "".join(choice(ascii_lowercase) for _ in range(9))
+
+    return [_item(word()) for _ in range(_ITEMS)]
+
+
+def _use(sort_by: str) -> bool:
+    return multi_set_ratio(_CWORD, sort_by, look_ahead=0) >= _CUTOFF
+
+
+def _legacy(resp: Sequence[Any]) -> Iterator[Any]:
+    """
+    Before lazy items, ie. every item decoded before filtering
+    """
+
+    for item in resp:
+        comp = parse_item(
+            ExternLSP,
+            always_on_top=None,
+            client=None,
+            short_name="",
+            weight_adjust=0,
+            item=item,
+        )
+        if comp and _use(comp.sort_by):
+            yield comp
+
+
+def _lazy(resp: Sequence[Any]) -> Iterator[Any]:
+    lsp_comps = parse(
+        ExternLSP,
+        always_on_top=None,
+        client=None,
+        short_name="",
+        weight_adjust=0,
+        resp=list(resp),
+    )
+    for item in lsp_comps.items:
+        assert isinstance(item, LazyComp)
+        if _use(item.sort_by) and (comp := item.parse()):
+            yield comp
+
+
+def _samples(f: Callable[[Sequence[Any]], Iterator[Any]]) -> Sequence[float]:
+    seed(0)
+    samples: MutableSequence[float] = []
+    for _ in range(_ROUNDS):
+        resp = _resp()
+        t1 = perf_counter()
+        kept = sum(1 for _ in f(resp))
+        samples.append(perf_counter() - t1)
+        assert kept < _ITEMS
+    return samples
+
+
+class Lsp(TestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    def test_1(self) -> None:
+        results = {
+            "lazy": quantiles(_samples(_lazy)),
+            "legacy": quantiles(_samples(_legacy)),
+        }
+        report("lsp parse", results)
@@ -0,0 +1,90 @@
+from pathlib import Path
+from random import choice
+from time import perf_counter
+from typing import AbstractSet, Iterator, MutableSequence
+from unittest import TestCase, skipUnless
+
+from pynvim_pp.text_object import is_word
+
+from ...coq.shared.parse import coalesce
+from .lib import BENCH, quantiles, report
+
+_ROUNDS = 9
+_UNIFYING_CHARS = {"_", "-"}
+
+
+def _legacy(
+    chars: str, unifying_chars: AbstractSet[str], include_syms: bool
+) -> Iterator[str]:
+    """
+    `coalesce` before the compiled tokenizer, one char at a time
+    """
+
+    backwards = choice((True, False))
+
+    words: MutableSequence[str] = []
+    syms: MutableSequence[str] = []
+
+    def w_it() -> Iterator[str]:
+        if words:
+            word = "".join(reversed(words) if backwards else words)
+            words.clear()
+            yield word
+
+    def s_it() -> Iterator[str]:
+        if syms:
+            sym = "".join(reversed(syms) if backwards else syms)
+            syms.clear()
+            yield sym
+
+    for char in reversed(chars) if backwards else chars:
+        if is_word(char, unifying_chars=unifying_chars):
+            words.append(char)
+            yield from s_it()
+        elif not char.isspace():
+            if include_syms:
+                syms.append(char)
+            yield from w_it()
+        else:
+            yield from w_it()
+            yield from s_it()
+
+    yield from w_it()
+    yield from s_it()
+
+
+class Coalesce(TestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    def test_1(self) -> None:
+        # This repo's own sources, ie. a large file of real code
+        root = Path(__file__).resolve().parent.parent.parent / "coq"
+        text = "\n".join(
+            path.read_text("UTF-8") for path in sorted(root.rglob("*.py"))
+        )
+        results = {}
+
+        for include_syms in (True, False):
+            legacy: MutableSequence[float] = []
+            compiled: MutableSequence[float] = []
+            for _ in range(_ROUNDS):
+                t1 = perf_counter()
+                for _ in _legacy(
+                    text, unifying_chars=_UNIFYING_CHARS, include_syms=include_syms
+                ):
+                    pass
+                t2 = perf_counter()
+                for _ in coalesce(
+                    text, unifying_chars=_UNIFYING_CHARS, include_syms=include_syms
+                ):
+                    pass
+                t3 = perf_counter()
+                legacy.append(t2 - t1)
+                compiled.append(t3 - t2)
+
+            results[f"include_syms={include_syms}"] = {
+                "chars": len(text),
+                "legacy": quantiles(legacy),
+                "compiled": quantiles(compiled),
+            }
+
+        report("coalesce", results)
@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+from itertools import count
+from tracemalloc import get_traced_memory, start, stop, take_snapshot
+from typing import Any, Callable, Literal, Mapping, Optional, Sequence
+from unittest import TestCase, skipUnless
+from uuid import uuid4
+
+from ...coq.shared.runtime import Metric, RawWeights
+from ...coq.shared.types import Completion, Doc, RangeEdit
+from .lib import BENCH, report
+
+# A large LSP response
+_ITEMS = 10_000
+_UIDS = count(1)
+
+
+@dataclass(frozen=True)
+class _Edit:
+    new_text: str
+
+
+@dataclass(frozen=True)
+class _RangeEdit(_Edit):
+    begin: Any
+    end: Any
+    encoding: Literal["UTF-8", "UTF-16-LE"]
+    fallback: str
+
+
+@dataclass(frozen=True)
+class _Doc:
+    text: str
+    syntax: str
+
+
+@dataclass(frozen=True)
+class _Completion:
+    """
+    `Completion`, before `__slots__`
+    """
+
+    source: str
+    always_on_top: bool
+    weight_adjust: float
+    label: str
+    sort_by: str
+    primary_edit: _Edit
+    adjust_indent: bool
+    icon_match: Optional[str]
+
+    uid: int = field(default_factory=_UIDS.__next__)
+    secondary_edits: Sequence[_RangeEdit] = ()
+    preselect: bool = False
+    kind: str = ""
+    doc: Optional[_Doc] = None
+    extern: Any = None
+
+
+@dataclass(frozen=True)
+class _Metric:
+    instance: Any
+    comp: _Completion
+    weight_adjust: float
+    weight: RawWeights
+    label_width: int
+    kind_width: int
+
+
+def _response(
+    metric: Callable[..., Any],
+    comp: Callable[..., Any],
+    edit: Callable[..., Any],
+    doc: Callable[..., Any],
+) -> Sequence[Any]:
+    instance, weight = uuid4(), RawWeights(0, 0, 0, 0)
+
+    def cont(idx: int) -> Any:
+        text = f"item_{idx}"
+        c = comp(
+            source="LSP",
+            always_on_top=False,
+            weight_adjust=0,
+            label=text,
+            sort_by=text,
+            primary_edit=edit(
+                new_text=text,
+                begin=(0, 0),
+                end=(0, 4),
+                encoding="UTF-16-LE",
+                fallback=text,
+            ),
+            adjust_indent=False,
+            icon_match="Function",
+            doc=doc(text=text, syntax="markdown"),
+        )
+        return metric(
+            instance=instance,
+            comp=c,
+            weight_adjust=0,
+            weight=weight,
+            label_width=len(text),
+            kind_width=0,
+        )
+
+    return [cont(idx) for idx in range(_ITEMS)]
+
+
+def _measure(f: Callable[[], Sequence[Any]]) -> Mapping[str, int]:
+    start()
+    try:
+        kept = f()
+        current, peak = get_traced_memory()
+        blocks = sum(stat.count for stat in take_snapshot().statistics("filename"))
+        assert len(kept) == _ITEMS
+        return {"current": current, "peak": peak, "blocks": blocks}
+    finally:
+        stop()
+
+
+class Slots(TestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    def test_1(self) -> None:
+        results = {
+            "slots": _measure(
+                lambda: _response(Metric, comp=Completion, edit=RangeEdit, doc=Doc)
+            ),
+            "legacy": _measure(
+                lambda: _response(_Metric, comp=_Completion, edit=_RangeEdit, doc=_Doc)
+            ),
+        }
+        report("slots", results)
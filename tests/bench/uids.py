@@ -0,0 +1,39 @@
+from time import perf_counter
+from typing import Callable, MutableSequence, Sequence
+from unittest import TestCase, skipUnless
+from uuid import uuid4
+
+from ...coq.shared.types import new_uid
+from .lib import BENCH, quantiles, report
+
+_ROUNDS = 99
+# Roughly what a busy LSP server returns per keystroke
+_ITEMS = 3_000
+
+
+def _legacy() -> str:
+    """
+    Before integer ids, ie. `uuid4()` encoded for `user_data`
+    """
+
+    return str(uuid4())
+
+
+def _samples(f: Callable[[], object]) -> Sequence[float]:
+    samples: MutableSequence[float] = []
+    for _ in range(_ROUNDS):
+        t1 = perf_counter()
+        metrics = {f(): None for _ in range(_ITEMS)}
+        samples.append(perf_counter() - t1)
+        assert len(metrics) == _ITEMS
+    return samples
+
+
+class Uids(TestCase):
+    @skipUnless(BENCH, "COQ_BENCH")
+    def test_1(self) -> None:
+        results = {
+            "int": quantiles(_samples(new_uid)),
+            "legacy": quantiles(_samples(_legacy)),
+        }
+        report("uids", results)
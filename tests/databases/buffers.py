@@ -0,0 +1,40 @@
+from random import Random
+from typing import MutableSequence
+from unittest import TestCase
+
+from ...coq.databases.buffers.database import _enqueue, _Update
+
+
+def _update(lo: int, hi: int, lines: MutableSequence[str]) -> _Update:
+    return _Update(buf_id=1, filetype="", filename="", lo=lo, hi=hi, lines=lines)
+
+
+class Enqueue(TestCase):
+    def test_1(self) -> None:
+        rand = Random(0)
+        for _ in range(99):
+            buf = [str(idx) for idx in range(9)]
+            expected = [*buf]
+            queue: MutableSequence[_Update] = []
+            for _ in range(rand.randint(1, 9)):
+                lo = rand.randint(0, len(expected))
+                hi = rand.randint(lo, min(len(expected), lo + 3))
+                lines = [str(rand.random()) for _ in range(rand.randint(0, 3))]
+                expected[lo:hi] = lines
+                _enqueue(queue, update=_update(lo, hi=hi, lines=lines))
+
+            for update in queue:
+                buf[update.lo : update.hi] = update.lines
+            self.assertEqual(buf, expected)
+
+    def test_2(self) -> None:
+        queue: MutableSequence[_Update] = []
+        for text in ("a", "ab", "abc"):
+            _enqueue(queue, update=_update(3, hi=4, lines=[text]))
+        self.assertEqual(queue, [_update(3, hi=4, lines=["abc"])])
+
+    def test_3(self) -> None:
+        queue: MutableSequence[_Update] = []
+        _enqueue(queue, update=_update(0, hi=1, lines=["a"]))
+        _enqueue(queue, update=_update(5, hi=6, lines=["b"]))
+        self.assertEqual(len(queue), 2)
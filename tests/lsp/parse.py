@@ -0,0 +1,76 @@
+from typing import Any, Iterator, Optional
+from unittest import TestCase
+
+from ...coq.lsp.parse import parse
+from ...coq.lsp.types import LazyComp
+from ...coq.shared.repeat import sanitize
+from ...coq.shared.types import Completion, ExternLSP, SnippetEdit
+
+_RANGE = {
+    "range": {
+        "start": {"line": 0, "character": 0},
+        "end": {"line": 0, "character": 2},
+    }
+}
+
+
+def _items() -> Iterator[Any]:
+    yield {"label": "abc"}
+    yield {"label": "abc", "filterText": "xyz"}
+    yield {"label": "abc", "insertText": "abcd"}
+    yield {"label": "abc", "textEdit": {"newText": "abcde", **_RANGE}}
+    yield {"label": "abc", "insertText": "a${1}", "insertTextFormat": 2}
+    yield {
+        "label": "abc",
+        "insertText": "a",
+        "insertTextFormat": 2,
+        "textEdit": {"newText": "a${1}", **_RANGE},
+    }
+    yield {
+        "label": "abc",
+        "insertTextFormat": 2,
+        "textEdit": {"newText": "a${1}", **_RANGE},
+    }
+
+
+def _parse(resp: Any) -> Iterator[Any]:
+    lsp_comps = parse(
+        ExternLSP,
+        always_on_top=None,
+        client=None,
+        short_name="",
+        weight_adjust=0,
+        resp=resp,
+    )
+    return lsp_comps.items
+
+
+def _decode(lazy: Any) -> Optional[Completion]:
+    assert isinstance(lazy, LazyComp)
+    return lazy.parse()
+
+
+class Lazy(TestCase):
+    def test_1(self) -> None:
+        for item in _items():
+            lazy = next(_parse([item]))
+            comp = _decode(lazy)
+            assert comp
+            self.assertEqual(lazy.sort_by, comp.sort_by)
+            for stand_in, edit in (
+                (lazy.primary_edit, comp.primary_edit),
+                (lazy.cached_edit, sanitize(comp.primary_edit)),
+            ):
+                self.assertEqual(
+                    isinstance(stand_in, SnippetEdit), isinstance(edit, SnippetEdit)
+                )
+                if not isinstance(edit, SnippetEdit):
+                    self.assertEqual(stand_in.new_text, edit.new_text)
+
+    def test_2(self) -> None:
+        lazy = next(_parse([{"label": "abc"}]))
+        self.assertIs(_decode(lazy), _decode(lazy))
+
+    def test_3(self) -> None:
+        items = tuple(_parse([{"label": 1}, {"label": "abc"}, {}]))
+        self.assertEqual(len(items), 1)
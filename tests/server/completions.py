@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+from typing import Any, Sequence, Tuple, cast
+from unittest import TestCase
+from uuid import uuid4
+
+from ...coq.server.completions import UserData, VimCompletion, complete
+from ...coq.server.rt_types import Stack
+from ...coq.shared.runtime import Metric, RawWeights
+from ...coq.shared.types import Completion, Edit
+
+
+def _metric(text: str) -> Tuple[Metric, VimCompletion]:
+    comp = Completion(
+        source="",
+        always_on_top=False,
+        weight_adjust=0,
+        label=text,
+        sort_by=text,
+        primary_edit=Edit(new_text=text),
+        adjust_indent=False,
+        icon_match=None,
+    )
+    metric = Metric(
+        instance=uuid4(),
+        comp=comp,
+        weight_adjust=0,
+        weight=RawWeights(prefix_matches=0, edit_distance=0, recency=0, proximity=0),
+        label_width=len(text),
+        kind_width=0,
+    )
+    vim_comp = VimCompletion(user_data=UserData(coq=comp.uid), abbr=text, menu="")
+    return metric, vim_comp
+
+
+class _Nvim:
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.api = SimpleNamespace(exec_lua=lambda _, args: self.sent.append(args))
+
+
+def _complete(
+    stack: Stack, comps: Sequence[Tuple[Metric, VimCompletion]], update: bool
+) -> None:
+    complete(cast(Any, _Nvim()), stack=stack, col=0, comps=comps, update=update)
+
+
+class Complete(TestCase):
+    def test_1(self) -> None:
+        stack = cast(Stack, SimpleNamespace(metrics={}))
+        (m1, c1), (m2, c2) = _metric("a"), _metric("b")
+
+        _complete(stack, comps=((m1, c1),), update=False)
+        # `send_comp` drops this update if `c1` is selected, it stays acceptable
+        _complete(stack, comps=((m2, c2),), update=True)
+        self.assertIs(stack.metrics.get(c1.user_data.coq), m1)
+        self.assertIs(stack.metrics.get(c2.user_data.coq), m2)
+
+        _complete(stack, comps=((m2, c2),), update=False)
+        self.assertNotIn(c1.user_data.coq, stack.metrics)
@@ -1,7 +1,22 @@
-from random import uniform
+from collections import Counter
+from random import Random, uniform
 from unittest import TestCase
 
-from ...coq.server.reviewer import sigmoid
+from ...coq.databases.insertions.database import Timing
+from ...coq.server.reviewer import Proximity, budget, sigmoid
+from ...coq.shared.parse import coalesce
+
+_TIMEOUT = 0.088
+
+
+def _timing(samples: int, q95_duration: float, inserted: int) -> Timing:
+    return Timing(
+        source="",
+        samples=samples,
+        q95_duration=q95_duration,
+        instances=samples,
+        inserted=inserted,
+    )
 
 
 class Sigmoid(TestCase):
@@ -13,3 +28,49 @@ class Sigmoid(TestCase):
         for _ in range(0, 10000):
             y = sigmoid(uniform(-10, 10))
             self.assertTrue(y >= 0.5 and y <= 1.5)
+
+
+class ProximityUpdate(TestCase):
+    def test_1(self) -> None:
+        rand = Random(0)
+        proximity = Proximity({"_"})
+        lines = ["".join(rand.choices("ab_ .", k=9)) for _ in range(33)]
+        for _ in range(99):
+            idx = rand.randrange(len(lines))
+            lines[idx] = "".join(rand.choices("ab_ .", k=9))
+            if rand.random() < 0.3:
+                lines = lines[1:] + lines[:1]
+            expected = Counter(
+                word
+                for line in lines
+                for word in coalesce(line, unifying_chars={"_"}, include_syms=True)
+            )
+            self.assertEqual(proximity.update(lines), expected)
+
+    def test_2(self) -> None:
+        proximity = Proximity(set())
+        proximity.update(("a b", "a"))
+        self.assertEqual(proximity.update(("c",)), {"c": 1})
+
+
+class Budget(TestCase):
+    def test_1(self) -> None:
+        timing = _timing(samples=1, q95_duration=1, inserted=0)
+        self.assertEqual(budget(_TIMEOUT, inserted=99, timing=timing), _TIMEOUT)
+
+    def test_2(self) -> None:
+        timing = _timing(samples=99, q95_duration=1, inserted=0)
+        self.assertEqual(budget(_TIMEOUT, inserted=0, timing=timing), _TIMEOUT)
+
+    def test_3(self) -> None:
+        timing = _timing(samples=99, q95_duration=1, inserted=33)
+        self.assertEqual(budget(_TIMEOUT, inserted=99, timing=timing), _TIMEOUT)
+
+    def test_4(self) -> None:
+        timing = _timing(samples=99, q95_duration=1, inserted=1)
+        self.assertEqual(budget(_TIMEOUT, inserted=99, timing=timing), 0)
+
+    def test_5(self) -> None:
+        timing = _timing(samples=99, q95_duration=0.01, inserted=1)
+        y = budget(_TIMEOUT, inserted=99, timing=timing)
+        self.assertTrue(y > 0.01 and y < _TIMEOUT)
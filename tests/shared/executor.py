@@ -0,0 +1,53 @@
+from threading import Event
+from typing import Iterator, MutableSequence
+from unittest import TestCase
+
+from ...coq.shared.executor import Priority, SingleThreadExecutor
+from ..bench.lib import DaemonPool
+
+
+class Scheduling(TestCase):
+    def test_1(self) -> None:
+        ex, started, gate = SingleThreadExecutor(DaemonPool()), Event(), Event()
+        ran: MutableSequence[str] = []
+
+        def block() -> None:
+            started.set()
+            gate.wait()
+
+        ex._submit(Priority.write, block)
+        started.wait()
+        ex._submit(Priority.write, ran.append, "w1")
+        ex._submit(Priority.write, ran.append, "w2")
+        ex._submit(Priority.read, ran.append, "r1")
+        self.assertEqual(ex.stats().depth, 3)
+        ex._submit(Priority.read, ran.append, "r2")
+        gate.set()
+        ex.submit(ran.append, "w3")
+        self.assertEqual(ran, ["r1", "r2", "w1", "w2", "w3"])
+        self.assertEqual(len(ex.stats().waits), 6)
+
+    def test_2(self) -> None:
+        ex = SingleThreadExecutor(DaemonPool())
+        ran: MutableSequence[str] = []
+
+        def steps() -> Iterator[None]:
+            for idx in range(3):
+                ran.append(f"s{idx}")
+                if not idx:
+                    ex._submit(Priority.read, ran.append, "r")
+                yield
+
+        ex._steps(Priority.write, steps()).result()
+        self.assertEqual(ran, ["s0", "r", "s1", "s2"])
+
+    def test_3(self) -> None:
+        ex = SingleThreadExecutor(DaemonPool())
+
+        def steps() -> Iterator[None]:
+            yield
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            ex._steps(Priority.write, steps()).result()
+        self.assertEqual(ex.submit(lambda: 1), 1)
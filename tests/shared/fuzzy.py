@@ -1,6 +1,13 @@
+from random import Random
 from unittest import TestCase
 
-from ...coq.shared.fuzzy import dl_distance, metrics, multi_set_ratio, quick_ratio
+from ...coq.shared.fuzzy import (
+    batch_metrics,
+    dl_distance,
+    metrics,
+    multi_set_ratio,
+    quick_ratio,
+)
 
 _LOOK_AHEAD = 2
 
@@ -167,3 +174,27 @@ class Metrics(TestCase):
         m = metrics(cword, match, look_ahead=_LOOK_AHEAD)
         self.assertEqual(m.prefix_matches, 0)
         self.assertAlmostEqual(m.edit_distance, 0)
+
+
+class BatchMetrics(TestCase):
+    def test_1(self) -> None:
+        cword = "sup"
+        matches = ("supervisor", "per", "", "supervisor", "sup")
+        ms = batch_metrics(cword, matches, look_ahead=_LOOK_AHEAD)
+        self.assertEqual(
+            ms, tuple(metrics(cword, m, look_ahead=_LOOK_AHEAD) for m in matches)
+        )
+
+    def test_2(self) -> None:
+        rand = Random(0)
+        for _ in range(0, 999):
+            cword = "".join(rand.choices("abcd", k=rand.randint(0, 6)))
+            matches = tuple(
+                "".join(rand.choices("abcd", k=rand.randint(0, 9)))
+                for _ in range(0, 9)
+            )
+            look_ahead = rand.randint(0, 3)
+            ms = batch_metrics(cword, matches, look_ahead=look_ahead)
+            self.assertEqual(
+                ms, tuple(metrics(cword, m, look_ahead=look_ahead) for m in matches)
+            )
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from ...coq.shared.index import PrefixIndex
+from ...coq.shared.settings import MatchOptions
+
+_OPTS = MatchOptions(
+    unifying_chars=set(),
+    max_results=33,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+
+class Index(TestCase):
+    def test_1(self) -> None:
+        index = PrefixIndex()
+        index.add(("abc", "abd", "xyz", "abc"))
+        self.assertEqual(len(index), 3)
+
+        index.remove(("abc",))
+        self.assertEqual(len(index), 3)
+
+        index.remove(("abc", "xyz"))
+        self.assertEqual(len(index), 1)
+
+    def test_2(self) -> None:
+        index = PrefixIndex()
+        index.add(("abcdef", "abzzzz", "xbcdef", "Abcdef"))
+        matches = {*index.search(_OPTS, word="abcd", limit=9)}
+        self.assertEqual(matches, {"abcdef", "Abcdef"})
+
+    def test_3(self) -> None:
+        index = PrefixIndex()
+        index.add(("ab", "abc"))
+        matches = tuple(index.search(_OPTS, word="abc", limit=9))
+        self.assertEqual(matches, ())
+
+    def test_4(self) -> None:
+        index = PrefixIndex()
+        index.add(("aaaa", "abcd", "abce", "abcf"))
+        matches = tuple(index.search(_OPTS, word="abc", limit=2))
+        self.assertEqual(matches, ("abcd", "abce"))
+
+    def test_5(self) -> None:
+        words = tuple(f"ab{i}" for i in range(999))
+        index = PrefixIndex()
+        index.add(words)
+        index.add(words)
+        index.remove(words)
+        self.assertEqual(len(index), len(words))
+        index.remove(words)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(tuple(index.search(_OPTS, word="ab1", limit=9)), ())
@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from ...coq.shared.parse import coalesce
+
+
+class Coalesce(TestCase):
+    def test_1(self) -> None:
+        text = "ab_c d-e (f)"
+        words = sorted(coalesce(text, unifying_chars={"_"}, include_syms=False))
+        self.assertEqual(words, ["ab_c", "d", "e", "f"])
+
+    def test_2(self) -> None:
+        text = "ab_c d-e (f)"
+        words = sorted(coalesce(text, unifying_chars={"-"}, include_syms=True))
+        self.assertEqual(words, ["(", ")", "_", "ab", "c", "d-e", "f"])
+
+    def test_3(self) -> None:
+        words = sorted(coalesce("ß½٣ x]y", unifying_chars={"]"}, include_syms=True))
+        self.assertEqual(words, ["x]y", "ß½٣"])
+
+    def test_4(self) -> None:
+        words = sorted(coalesce("a.,b \t..", unifying_chars=set(), include_syms=True))
+        self.assertEqual(words, [".,", "..", "a", "b"])
@@ -0,0 +1,57 @@
+from typing import MutableMapping, cast
+from unittest import TestCase
+
+from ...coq.shared.recency import Recency
+
+
+class Decay(TestCase):
+    def test_1(self) -> None:
+        recency = Recency(half_life=1, size=9)
+        recency.insert("a")
+        recency.insert("b")
+        weights = recency.weights()
+        self.assertAlmostEqual(weights["b"] / weights["a"], 2)
+
+    def test_2(self) -> None:
+        recency = Recency(half_life=9, size=9)
+        for word in ("a", "a", "a", "b"):
+            recency.insert(word)
+        weights = recency.weights()
+        self.assertGreater(weights["a"], weights["b"])
+
+    def test_3(self) -> None:
+        recency = Recency(half_life=99, size=9)
+        for idx in range(999):
+            recency.insert(str(idx))
+        self.assertLessEqual(len(recency), 2 * 9)
+        self.assertIn("998", recency.weights())
+
+    def test_4(self) -> None:
+        recency = Recency(half_life=1, size=9)
+        for _ in range(999):
+            recency.insert("a")
+        score, _ = recency.insert("a")
+        self.assertAlmostEqual(score, 2)
+
+    def test_5(self) -> None:
+        lhs = Recency(half_life=3, size=9)
+        for word in ("a", "b", "a", "c"):
+            lhs.insert(word)
+        rhs = Recency(half_life=3, size=9)
+        rhs.load(lhs.dump())
+        l_weights, r_weights = lhs.weights(), rhs.weights()
+        for word in ("a", "b"):
+            self.assertAlmostEqual(
+                l_weights[word] / l_weights["c"], r_weights[word] / r_weights["c"]
+            )
+
+    def test_6(self) -> None:
+        recency = Recency(half_life=1, size=9)
+        recency.insert("a")
+        weights = recency.weights()
+        recency.insert("a")
+        recency.insert("b")
+        self.assertEqual(weights.keys(), {"a"})
+        self.assertNotEqual(recency.weights()["a"], weights["a"])
+        with self.assertRaises(TypeError):
+            cast(MutableMapping[str, float], weights)["a"] = 0
@@ -0,0 +1,120 @@
+from dataclasses import replace
+from random import Random
+from typing import AbstractSet, Optional, Sequence
+from unittest import TestCase
+from uuid import uuid4
+
+from ...coq.shared.context import EMPTY_CONTEXT
+from ...coq.shared.runtime import (
+    Narrowing,
+    _match,
+    matches,
+    narrow,
+    narrowing,
+    widen,
+)
+from ...coq.shared.settings import MatchOptions
+from ...coq.shared.types import Completion, Context, Edit
+
+_OPTS = MatchOptions(
+    unifying_chars=set(),
+    max_results=33,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+
+def _comps(*words: str) -> Sequence[Completion]:
+    return tuple(
+        Completion(
+            source="",
+            always_on_top=False,
+            weight_adjust=0,
+            label=word,
+            sort_by=word,
+            primary_edit=Edit(new_text=word),
+            adjust_indent=False,
+            icon_match=None,
+        )
+        for word in words
+    )
+
+
+def _context(words_before: str) -> Context:
+    return replace(
+        EMPTY_CONTEXT,
+        manual=False,
+        words=words_before,
+        words_before=words_before,
+        syms="",
+    )
+
+
+def _widened(context: Context, population: Sequence[str]) -> Narrowing:
+    """
+    What an untruncated `widen`ed query would return
+    """
+
+    comps = tuple(
+        comp
+        for comp in _comps(*population)
+        if _match(widen(_OPTS), cword=context.words, text=comp.sort_by)
+    )
+    return narrowing(_OPTS, context=context, completions=comps)
+
+
+def _matching(narrowed: Optional[Narrowing]) -> AbstractSet[str]:
+    assert narrowed
+    return {comp.sort_by for comp in matches(_OPTS, narrowed=narrowed)}
+
+
+class Narrow(TestCase):
+    def test_1(self) -> None:
+        population = ("foobar", "foobaz", "fozzzz", "xyz")
+        prev = _widened(_context("foo"), population=population)
+        narrowed = narrow(_OPTS, prev=prev, context=_context("foob"))
+        self.assertEqual(_matching(narrowed), {"foobar", "foobaz"})
+
+    def test_2(self) -> None:
+        prev = _widened(_context("foo"), population=("foobar",))
+        for context in (
+            _context("fo"),
+            _context("bar"),
+            replace(_context("foob"), manual=True),
+            replace(_context("foob"), commit_id=uuid4()),
+            replace(_context("foob"), buf_id=-1),
+            replace(_context("foob"), position=(9, 0)),
+            replace(_context("foob"), syms="foob"),
+        ):
+            self.assertIsNone(narrow(_OPTS, prev=prev, context=context))
+
+    def test_3(self) -> None:
+        # Below the cutoff for `ddddd`, above it for `dddddc`
+        self.assertFalse(_match(_OPTS, cword="ddddd", text="dddac"))
+        self.assertTrue(_match(_OPTS, cword="dddddc", text="dddac"))
+
+        prev = _widened(_context("ddddd"), population=("dddac",))
+        narrowed = narrow(_OPTS, prev=prev, context=_context("dddddc"))
+        self.assertEqual(_matching(narrowed), {"dddac"})
+
+    def test_4(self) -> None:
+        rand = Random(0)
+        for _ in range(999):
+            population = {
+                "".join(rand.choices("abcd", k=rand.randint(1, 9))) for _ in range(33)
+            }
+            word = "".join(rand.choices("abcd", k=rand.randint(1, 5)))
+            prev = _widened(_context(word), population=tuple(population))
+            for _ in range(rand.randint(1, 5)):
+                word += rand.choice("abcd")
+                context = _context(word)
+                narrowed = narrow(_OPTS, prev=prev, context=context)
+                expected = {
+                    text
+                    for text in population
+                    if _match(_OPTS, cword=context.words, text=text)
+                }
+                self.assertEqual(_matching(narrowed), expected)
+                assert narrowed
+                prev = narrowed
@@ -0,0 +1,41 @@
+from random import Random
+from unittest import TestCase
+
+from ...coq.shared.shadow import Shadows
+
+
+class Shadow(TestCase):
+    def test_1(self) -> None:
+        rand = Random(0)
+        shadows = Shadows()
+        buf = [str(idx) for idx in range(99)]
+        shadows.lines_event(1, tick=1, lo=0, hi=-1, lines=buf, pending=False)
+        for tick in range(2, 999):
+            lo = rand.randint(0, len(buf))
+            hi = rand.randint(lo, min(len(buf), lo + 3))
+            lines = [str(rand.random()) for _ in range(rand.randint(0, 3))]
+            buf[lo:hi] = lines
+            shadows.lines_event(1, tick=tick, lo=lo, hi=hi, lines=lines, pending=False)
+            self.assertEqual(shadows.line_count(1), len(buf))
+
+        self.assertEqual(shadows.lines(1, tick=998, lo=0, hi=len(buf)), buf)
+
+    def test_2(self) -> None:
+        shadows = Shadows()
+        shadows.lines_event(1, tick=1, lo=0, hi=-1, lines=("a",), pending=False)
+        self.assertIsNone(shadows.lines(1, tick=2, lo=0, hi=1))
+        shadows.changedtick_event(1, tick=2)
+        self.assertEqual(shadows.lines(1, tick=2, lo=0, hi=1), ["a"])
+
+    def test_3(self) -> None:
+        shadows = Shadows()
+        shadows.lines_event(1, tick=1, lo=0, hi=1, lines=("a",), pending=False)
+        self.assertIsNone(shadows.line_count(1))
+        shadows.lines_event(1, tick=2, lo=0, hi=-1, lines=("a",), pending=False)
+        shadows.detach_event(1)
+        self.assertIsNone(shadows.lines(1, tick=2, lo=0, hi=1))
+
+    def test_4(self) -> None:
+        shadows = Shadows()
+        shadows.lines_event(1, tick=1, lo=0, hi=-1, lines=("a",), pending=True)
+        self.assertIsNone(shadows.lines(1, tick=1, lo=0, hi=1))
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from copy import copy, deepcopy
+from dataclasses import FrozenInstanceError, dataclass, replace
+from unittest import TestCase
+
+from ...coq.shared.slots import slots
+from ...coq.shared.types import Completion, ContextualEdit, Edit
+
+
+class Slots(TestCase):
+    def test_1(self) -> None:
+        edit = ContextualEdit(new_text="ab", old_prefix="a", new_prefix="ab")
+        self.assertFalse(hasattr(edit, "__dict__"))
+        self.assertEqual(edit.old_suffix, "")
+        self.assertEqual(copy(edit), edit)
+        self.assertEqual(replace(edit, old_suffix="c").old_suffix, "c")
+        with self.assertRaises(FrozenInstanceError):
+            setattr(edit, "new_text", "")
+
+    def test_2(self) -> None:
+        comp = Completion(
+            source="",
+            always_on_top=False,
+            weight_adjust=0,
+            label="",
+            sort_by="",
+            primary_edit=Edit(new_text=""),
+            adjust_indent=False,
+            icon_match=None,
+        )
+        self.assertFalse(hasattr(comp, "__dict__"))
+        self.assertEqual(deepcopy(comp), comp)
+        self.assertEqual(replace(comp, kind="a").uid, comp.uid)
+
+    def test_3(self) -> None:
+        @slots
+        @dataclass(frozen=True)
+        class _Abstract(ABC):
+            a: int
+
+            @abstractmethod
+            def b(self) -> None:
+                ...
+
+        self.assertIsInstance(_Abstract, type(ABC))
+        with self.assertRaises(TypeError):
+            _Abstract(a=1)  # type: ignore[abstract]
@@ -0,0 +1,43 @@
+from sqlite3 import Connection, OperationalError
+from threading import Timer
+from unittest import TestCase
+
+from ...coq.shared.sql import QueryGuard
+
+_FOREVER = """
+WITH RECURSIVE nums(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM nums)
+SELECT MAX(n) FROM nums
+"""
+
+
+class Guard(TestCase):
+    def test_1(self) -> None:
+        conn, guard = Connection(":memory:", isolation_level=None), QueryGuard()
+        ticket = guard.begin()
+        with guard.transaction(conn, ticket=ticket) as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+
+    def test_2(self) -> None:
+        conn, guard = Connection(":memory:", isolation_level=None), QueryGuard()
+        ticket = guard.begin()
+        timer = Timer(0.01, guard.begin)
+        timer.start()
+        with self.assertRaises(OperationalError):
+            with guard.transaction(conn, ticket=ticket) as cursor:
+                cursor.execute(_FOREVER)
+        timer.join()
+
+    def test_3(self) -> None:
+        conn, guard = Connection(":memory:", isolation_level=None), QueryGuard()
+        prev, ticket = guard.begin(), guard.begin()
+        guard.cancel(prev)
+        with guard.transaction(conn, ticket=ticket) as cursor:
+            cursor.execute("SELECT 1")
+
+        timer = Timer(0.01, guard.cancel, args=(ticket,))
+        timer.start()
+        with self.assertRaises(OperationalError):
+            with guard.transaction(conn, ticket=ticket) as cursor:
+                cursor.execute(_FOREVER)
+        timer.join()